@@ -0,0 +1,85 @@
+# Izvoz mape zagusenja za vise iteracija: stari nacin (nov vizualizer, cela matrica + legenda i
+# savefig(bbox_inches='tight') za svaku iteraciju) i BackgroundCache (pozadina se renderuje jednom,
+# po iteraciji se crta samo sloj zagusenja). Iteracije se citaju iz `--route-dir`.
+#
+#   python benchmarks/bench_background_cache.py [--route-dir b9] [--iterations 10]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.image
+import matplotlib.pyplot as plt
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.background import BackgroundCache
+from fpga_project.fpga_wires import FPGAWires
+from fpga_project.parser_route import find_iteration_files, parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+
+def export_full(rrg, routes, out):
+    for iteration, route in routes:
+        visualizer = FPGAWires()
+        visualizer.visualize_matrix(rrg)
+        visualizer.visualize_wire_congestion(rrg, route, iteration)
+        visualizer.save(os.path.join(out, f"full_{iteration:03d}.png"))
+        plt.close("all")
+
+
+def export_cached(rrg, routes, out):
+    visualizer = FPGAWires()
+    visualizer.visualize_matrix(rrg)
+    background = BackgroundCache(visualizer)
+    for iteration, route in routes:
+        visualizer.visualize_wire_congestion(rrg, route, iteration)
+        background.save(os.path.join(out, f"cached_{iteration:03d}.png"))
+    plt.close("all")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rrg", default=os.path.join(ROOT, "b9", "rrg.xml"))
+    parser.add_argument("--route-dir", default=os.path.join(ROOT, "b9"))
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    rrg = RRGCache().load_or_parse(args.rrg)
+    files = find_iteration_files(args.route_dir)
+    routes = [(number, parse_route_packed(files[number]).to_route())
+              for number in sorted(files)[:args.iterations]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        export_full(rrg, routes, tmp)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        export_cached(rrg, routes, tmp)
+        cached = time.perf_counter() - start
+
+        # velicina kesirane slike je fiksna po arhitekturi (tight okvir pozadine sa naslovom matrice), pa se
+        # slike porede poravnate po donjoj ivici; sloj se crta iznad cele pozadine, pa razlike ostaju tamo
+        # gde se sloj i pozadina preklapaju
+        differing = []
+        for number, _ in routes:
+            old = matplotlib.image.imread(os.path.join(tmp, f"full_{number:03d}.png"))
+            new = matplotlib.image.imread(os.path.join(tmp, f"cached_{number:03d}.png"))
+            rows = min(len(old), len(new))
+            differing.append(np.mean(np.abs(old[-rows:] - new[-rows:]).max(axis=2) > 1 / 255))
+
+    print(f"{len(routes)} iteracija")
+    print(f"cela slika:       {full:.2f} s ({full / len(routes):.3f} s po iteraciji)")
+    print(f"kesirana pozadina: {cached:.2f} s ({cached / len(routes):.3f} s po iteraciji)")
+    print(f"ubrzanje: {full / cached:.1f}x")
+    print(f"razliciti pikseli: najvise {max(differing) * 100:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Preklapanje terminal bounding box-ova po segmentima kanala: stara provera svakog segmenta sa svakim
+# bbox-om i segment_bbox_overlap (2D difference array + prefiksne sume). Sinteticka matrica
+# `--size` x `--size` sa po jednom CHANX/CHANY zicom po polju i `--nets` signala sa slucajnim terminalima.
+#
+#   python benchmarks/bench_bbox_overlap.py [--size 100] [--nets 5000]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.fpga_metrics import FPGAMetrics
+from fpga_project.models import ArrayRRG, PackedRoute
+
+TYPE_NAMES = ["SOURCE", "SINK", "CHANX", "CHANY"]
+
+
+# SOURCE i SINK u svakom CLB polju i po jedna CHANX/CHANY zica na svakoj poziciji kanala
+def synthetic_rrg(size):
+    xs, ys = np.meshgrid(np.arange(size + 2), np.arange(size + 2), indexing="ij")
+    xs, ys = xs.ravel(), ys.ravel()
+    clb = (xs >= 1) & (xs <= size) & (ys >= 1) & (ys <= size)
+    chanx = (xs >= 1) & (xs <= size) & (ys <= size)
+    chany = (ys >= 1) & (ys <= size) & (xs <= size)
+
+    types = np.concatenate([np.full(clb.sum(), 0), np.full(clb.sum(), 1),
+                            np.full(chanx.sum(), 2), np.full(chany.sum(), 3)]).astype(np.uint8)
+    xlow = np.concatenate([xs[clb], xs[clb], xs[chanx], xs[chany]]).astype(np.int32)
+    ylow = np.concatenate([ys[clb], ys[clb], ys[chanx], ys[chany]]).astype(np.int32)
+    n = len(types)
+    zeros = np.zeros(n, dtype=np.int32)
+    empty = np.empty(0, dtype=np.int32)
+    rrg = ArrayRRG.from_arrays(np.arange(n, dtype=np.int64), types, TYPE_NAMES, zeros, xlow, xlow, ylow, ylow,
+                               np.zeros(n, dtype=np.uint8), [None], empty, empty, np.empty(0, dtype=np.int16),
+                               grid={(x, y): 0 for x, y in ((0, 0), (size + 1, size + 1))})
+    return rrg, int(clb.sum())
+
+
+# signali sa jednim SOURCE i 1..8 SINK cvorova u okolini izvora
+def random_route(num_clb, size, num_nets, rng):
+    sizes = rng.integers(2, 10, num_nets)
+    offsets = np.zeros(num_nets + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    centers = np.repeat(rng.integers(0, num_clb, num_nets), sizes)
+    spread = rng.integers(-size * 3, size * 3 + 1, offsets[-1])
+    node_ids = np.clip(centers + spread, 0, num_clb - 1)
+    is_source = np.zeros(offsets[-1], dtype=bool)
+    is_source[offsets[:-1]] = True
+    node_ids = np.where(is_source, node_ids, node_ids + num_clb).astype(np.int32)
+    parent = np.where(is_source, -1, 0).astype(np.int32)
+    minus_one = np.full(offsets[-1], -1, dtype=np.int16)
+    return PackedRoute(np.arange(num_nets, dtype=np.int32), [str(k) for k in range(num_nets)], offsets,
+                       node_ids, parent, minus_one, minus_one)
+
+
+def overlap_loop(segment_x, segment_y, boxes, padding=0.4):
+    result = []
+    for x, y in zip(segment_x, segment_y):
+        count = 0
+        for min_x, max_x, min_y, max_y in boxes:
+            if (min_x - padding <= x <= max_x + padding) and (min_y - padding <= y <= max_y + padding):
+                count += 1
+        result.append(count)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--nets", type=int, default=5000)
+    args = parser.parse_args()
+
+    rrg, num_clb = synthetic_rrg(args.size)
+    route = random_route(num_clb, args.size, args.nets, np.random.default_rng(1))
+    metrics = FPGAMetrics()
+    metrics.map_rrg_to_grid(rrg)
+    segment_x, segment_y = metrics.segment_coords(rrg)[:2]
+    print(f"{args.size}x{args.size}, {len(segment_x)} segmenata, {args.nets} signala")
+
+    start = time.perf_counter()
+    overlap = metrics.segment_bbox_overlap(rrg, route)
+    prefix_time = time.perf_counter() - start
+
+    _, min_x, max_x, min_y, max_y = metrics.terminal_bounding_boxes(rrg, route)
+    boxes = list(zip(min_x.tolist(), max_x.tolist(), min_y.tolist(), max_y.tolist()))
+    start = time.perf_counter()
+    expected = overlap_loop(segment_x.tolist(), segment_y.tolist(), boxes)
+    loop_time = time.perf_counter() - start
+
+    print(f"  segment x bbox petlja  {loop_time:8.3f} s")
+    print(f"  prefiksne sume         {prefix_time:8.3f} s  (isti rezultat: {expected == overlap.tolist()})")
+
+
+if __name__ == "__main__":
+    main()
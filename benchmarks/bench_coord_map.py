@@ -0,0 +1,108 @@
+# Vreme mapiranja RR cvorova na vizuelne koordinate: stara petlja po cvorovima (calculate_node_position
+# + fallback, rezultat dict) i NumPy map_rrg_to_grid. Graf je b9 ponovljen `scale` puta.
+#
+#   python benchmarks/bench_coord_map.py [--scale 600]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.fpga_layout import FPGALayout
+from fpga_project.models import ArrayRRG
+from fpga_project.rrg_cache import RRGCache
+
+
+# map_rrg_to_grid kakav je bio pre vektorizacije, samo za poredjenje
+def map_rrg_to_grid_loop(layout, rrg, num_rows=6, num_cols=6):
+    coord_map = {}
+    layout.num_rows = num_rows
+    layout.num_cols = num_cols
+
+    start_clb_x = layout.io_size + layout.io_clb_gap
+    start_clb_y = layout.io_size + layout.io_clb_gap
+    cell_w = layout.clb_size + layout.clb_channel_gap
+    cell_h = layout.clb_size + layout.clb_channel_gap
+    channel_x_inner_offset = (layout.clb_channel_gap / 2) - (layout.channel_width / 2)
+    channel_y_inner_offset = (layout.clb_channel_gap / 2) - (layout.channel_width / 2)
+
+    for node in rrg.nodes.values():
+        try:
+            vx, vy = layout.calculate_node_position(node, start_clb_x, start_clb_y)
+        except Exception:
+            vx = vy = None
+
+        if vx is not None and vy is not None:
+            coord_map[node.id] = (vx, vy)
+            continue
+
+        if node.type not in ['CHANX', 'CHANY']:
+            visual_x = start_clb_x + (node.xlow - 1) * cell_w + layout.clb_size / 2
+            visual_y = start_clb_y + (node.ylow - 1) * cell_h + layout.clb_size / 2
+        elif node.type == 'CHANX':
+            if node.ylow == 0 or node.ylow == layout.num_rows:
+                coord = layout.calculate_io_clb_channel_position(node, start_clb_x, start_clb_y)
+                if coord is not None:
+                    coord_map[node.id] = coord
+                continue
+            x_base = start_clb_x + (node.xlow - 1) * cell_w
+            y_channel = start_clb_y + (node.ylow - 1) * cell_h + layout.clb_size + channel_y_inner_offset
+            visual_x = x_base + layout.clb_size / 2
+            visual_y = y_channel + node.ptc * layout.channel_spacing
+        else:
+            if node.xlow == 0 or node.xlow == layout.num_cols:
+                coord = layout.calculate_io_clb_channel_position(node, start_clb_x, start_clb_y)
+                if coord is not None:
+                    coord_map[node.id] = coord
+                continue
+            x_channel = start_clb_x + (node.xlow - 1) * cell_w + layout.clb_size + channel_x_inner_offset
+            y_base = start_clb_y + (node.ylow - 1) * cell_h
+            visual_x = x_channel + node.ptc * layout.channel_spacing
+            visual_y = y_base + layout.clb_size / 2
+
+        coord_map[node.id] = (visual_x, visual_y)
+    return coord_map
+
+
+# b9 ponovljen `scale` puta sa pomerenim id-jevima (grane nisu potrebne za mapiranje)
+def tiled_rrg(scale):
+    base = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    ids = (np.arange(scale, dtype=np.int64)[:, None] * len(base.ids) + base.ids).ravel()
+
+    def tile(column):
+        return np.tile(np.asarray(column), scale)
+
+    empty = np.empty(0, dtype=np.int32)
+    return ArrayRRG.from_arrays(ids, tile(base.types), base.type_names, tile(base.ptc),
+                                tile(base.xlow), tile(base.xhigh), tile(base.ylow), tile(base.yhigh),
+                                tile(base.sides), base.side_names, empty, empty, np.empty(0, dtype=np.int16))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=600)
+    args = parser.parse_args()
+
+    rrg = tiled_rrg(args.scale)
+    print(f"{len(rrg.ids)} cvorova")
+
+    layout = FPGALayout()
+    start = time.perf_counter()
+    expected = map_rrg_to_grid_loop(layout, rrg)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    layout.map_rrg_to_grid(rrg)
+    numpy_time = time.perf_counter() - start
+
+    same = expected == dict(layout.coord_map)
+    print(f"  petlja po cvorovima  {loop_time:7.3f} s")
+    print(f"  NumPy                {numpy_time:7.3f} s  (isti rezultat: {same})")
+
+
+if __name__ == "__main__":
+    main()
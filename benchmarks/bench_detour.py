@@ -0,0 +1,86 @@
+# Najmanji broj grana SOURCE -> SINK za sve konekcije rute: Dijkstra po konekciji (RRGSearch.shortest_path_length
+# sa cenom 1 po cvoru) i detour_table (jedan BFS po SOURCE-u do svih njegovih SINK-ova, serijski i u procesima
+# sa CSR-om u deljenoj memoriji). Graf i ruta su b9 ponovljen `--scale` puta (nepovezane kopije sa pomerenim
+# id-jevima), 920 kopija je ~100k konekcija. Dijkstra po konekciji se meri na prvih `--baseline` konekcija.
+#
+#   python benchmarks/bench_detour.py [--scale 920] [--workers 1,2,4] [--baseline 5000]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.detour import detour_table
+from fpga_project.models import ArrayRRG, PackedRoute
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.router import RRGSearch
+from fpga_project.rrg_cache import RRGCache
+
+
+# b9 graf ponovljen `scale` puta, grane svake kopije ostaju unutar nje
+def tiled_graph(base, scale):
+    n = len(base.ids)
+    shift = np.arange(scale, dtype=np.int64)[:, None] * n
+
+    def tile(column):
+        return np.tile(np.asarray(column), scale)
+
+    def shifted(column):
+        return (shift + np.asarray(column, dtype=np.int64)).ravel()
+
+    return ArrayRRG.from_arrays(shifted(base.ids), tile(base.types), base.type_names, tile(base.ptc),
+                                tile(base.xlow), tile(base.xhigh), tile(base.ylow), tile(base.yhigh),
+                                tile(base.sides), base.side_names, shifted(base.edge_src), shifted(base.edge_sink),
+                                tile(base.edge_switch), switches=base.switches, capacity=tile(base.capacity))
+
+
+# ruta ponovljena po kopijama grafa: signali kopije t koriste cvorove kopije t
+def tiled_route(route, scale, n):
+    sizes = np.tile(np.diff(route.offsets), scale)
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    shift = np.repeat(np.arange(scale, dtype=np.int64) * n, len(route.node_ids))
+    return PackedRoute(np.arange(len(sizes), dtype=np.int32), route.net_names * scale, offsets,
+                       np.tile(route.node_ids, scale) + shift, np.tile(route.parent, scale),
+                       np.tile(route.switch, scale), np.tile(route.net_pin_index, scale))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=920)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--baseline", type=int, default=5000)
+    args = parser.parse_args()
+
+    base = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    rrg = tiled_graph(base, args.scale)
+    route = tiled_route(parse_route_packed(os.path.join(ROOT, "b9", "b9.route")), args.scale, len(base.ids))
+    print(f"{len(rrg.ids)} cvorova, {len(rrg.edge_src)} grana, {len(route.net_numbers)} signala")
+
+    tables = {}
+    for workers in [int(part) for part in args.workers.split(",")]:
+        start = time.perf_counter()
+        tables[workers] = detour_table(rrg, route, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"detour_table, {workers} proces(a): {elapsed:.2f} s za {len(tables[workers])} konekcija")
+    reference = next(iter(tables.values()))
+    print(f"isti rezultat: {all(np.array_equal(t.min_hops, reference.min_hops) for t in tables.values())}")
+
+    count = min(args.baseline, len(reference))
+    search = RRGSearch(rrg, node_cost=np.ones(len(rrg.ids)))
+    start = time.perf_counter()
+    lengths = [search.shortest_path_length(int(src), int(sink))
+               for src, sink in zip(reference.source_ids[:count], reference.sink_ids[:count])]
+    elapsed = time.perf_counter() - start
+    print(f"Dijkstra po konekciji: {elapsed:.2f} s za {count} konekcija "
+          f"(~{elapsed * len(reference) / count:.1f} s za sve)")
+    print(f"isti rezultat: {np.array_equal(np.array(lengths, dtype=np.int64), reference.min_hops[:count])}")
+    print(f"prosecan obilazak: {np.nanmean(reference.detour):.3f}")
+
+
+if __name__ == "__main__":
+    main()
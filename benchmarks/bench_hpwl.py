@@ -0,0 +1,79 @@
+# HPWL za sve signale: stara petlja po cvorovima (coord_map + min/max nad listama) i
+# calculate_hpwl nad PackedRoute (reduceat). Ruta je b9.route ponovljena dok ne bude `--nets` signala.
+#
+#   python benchmarks/bench_hpwl.py [--nets 100000]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.fpga_metrics import FPGAMetrics
+from fpga_project.models import PackedRoute
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+
+# hpwl_all_signals kakav je bio pre vektorizacije (bez fallback-a, svi cvorovi su u coord_map)
+def hpwl_loop(coord_map, route):
+    hpwl_results = {}
+    for net_id, net in route.nets.items():
+        x_coords, y_coords = [], []
+        for node_id in net.node_ids:
+            if node_id in coord_map:
+                x, y = coord_map[node_id]
+                x_coords.append(x)
+                y_coords.append(y)
+        if x_coords and y_coords:
+            hpwl_results[net_id] = (max(x_coords) - min(x_coords)) + (max(y_coords) - min(y_coords))
+        else:
+            hpwl_results[net_id] = 0
+    return hpwl_results
+
+
+def tiled_route(route, num_nets):
+    repeats = -(-num_nets // len(route.net_numbers))
+    sizes = np.tile(np.diff(route.offsets), repeats)[:num_nets]
+    offsets = np.zeros(num_nets + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+
+    def tile(column):
+        return np.tile(column, repeats)[:offsets[-1]]
+
+    return PackedRoute(np.arange(num_nets, dtype=np.int32), (route.net_names * repeats)[:num_nets], offsets,
+                       tile(route.node_ids), tile(route.parent), tile(route.switch), tile(route.net_pin_index))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nets", type=int, default=100000)
+    args = parser.parse_args()
+
+    rrg = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    route = tiled_route(parse_route_packed(os.path.join(ROOT, "b9", "b9.route")), args.nets)
+    print(f"{len(route.net_numbers)} signala, {len(route.node_ids)} cvorova")
+
+    metrics = FPGAMetrics()
+    metrics.map_rrg_to_grid(rrg)
+    coord_map = dict(metrics.coord_map)
+    objects = route.to_route()
+
+    start = time.perf_counter()
+    expected = hpwl_loop(coord_map, objects)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    net_numbers, hpwl, hpwl_grid = metrics.calculate_hpwl(rrg, route)
+    numpy_time = time.perf_counter() - start
+
+    same = expected == dict(zip(net_numbers.tolist(), hpwl.tolist()))
+    print(f"  petlja po cvorovima  {loop_time:7.3f} s")
+    print(f"  reduceat             {numpy_time:7.3f} s  (isti rezultat: {same})")
+
+
+if __name__ == "__main__":
+    main()
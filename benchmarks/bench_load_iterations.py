@@ -0,0 +1,67 @@
+# Ucitavanje svih iteracija rutiranja (load_all_iterations, isto sto radi parse_all.py sa -i all) u zavisnosti
+# od broja procesa. b9 iteracije su male, pa se svaka ponavlja `--scale` puta (kopije signala sa novim rednim
+# brojevima) u privremenom direktorijumu; 1 proces je stari nacin, fajl po fajl u glavnom procesu.
+#
+#   python benchmarks/bench_load_iterations.py [--scale 100] [--workers 1,2,4]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.parser_route import find_iteration_files, load_all_iterations
+
+
+# ista ruta sa signalima ponovljenim `scale` puta; kopija t dobija redne brojeve pomerene za t * broj signala
+def tiled_route_text(route_file, scale):
+    with open(route_file, "r") as f:
+        text = f.read()
+    header, body = text.split("Routing:", 1)
+    blocks = ["\n\nNet " + block for block in body.split("\n\nNet ")[1:]]
+    tiled = []
+    for t in range(scale):
+        for k, block in enumerate(blocks):
+            number, rest = block[len("\n\nNet "):].split(" ", 1)
+            tiled.append(f"\n\nNet {int(number) + t * len(blocks)} {rest}")
+    return header + "Routing:" + "".join(tiled).rstrip("\n") + "\n"
+
+
+def same_routes(a, b):
+    return a.keys() == b.keys() and all(np.array_equal(a[k].node_ids, b[k].node_ids) and
+                                        np.array_equal(a[k].parent, b[k].parent) for k in a)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--workers", default="1,2,4")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        num_lines = 0
+        for route_file in find_iteration_files(os.path.join(ROOT, "b9")).values():
+            text = tiled_route_text(route_file, args.scale)
+            num_lines += text.count("\n")
+            with open(os.path.join(directory, os.path.basename(route_file)), "w") as f:
+                f.write(text)
+        print(f"{len(os.listdir(directory))} fajlova, {num_lines} linija, {os.cpu_count()} jezgara")
+
+        results = {}
+        times = {}
+        for workers in [int(part) for part in args.workers.split(",")]:
+            start = time.perf_counter()
+            results[workers] = load_all_iterations(directory, max_workers=workers)
+            times[workers] = time.perf_counter() - start
+            speedup = next(iter(times.values())) / times[workers]
+            print(f"load_all_iterations, {workers} proces(a): {times[workers]:.2f} s ({speedup:.2f}x)")
+        reference = next(iter(results.values()))
+        print(f"isti rezultat: {all(same_routes(reference, routes) for routes in results.values())}")
+
+
+if __name__ == "__main__":
+    main()
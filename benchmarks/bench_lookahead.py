@@ -0,0 +1,61 @@
+# Najkraci putevi na b9/rrg.xml: obicna Dijkstra i A* sa lookahead mapom (tip cvora, dx, dy) -> cena do
+# SINK-a. Meri se broj obidjenih cvorova (skinutih sa heap-a) za shortest_path_length nad svim konekcijama
+# iz b9.route (SOURCE -> SINK) i za ceo PathFinder. Mapa od svih SINK-ova ne precenjuje, pa su duzine iste.
+#
+#   python benchmarks/bench_lookahead.py [--samples 20]
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.router import PathFinderRouter, RouterLookahead, RRGSearch, net_terminals, wire_costs
+from fpga_project.rrg_cache import RRGCache
+
+
+def measure(search, pairs):
+    start = time.perf_counter()
+    lengths = [search.shortest_path_length(src, sink) for src, sink in pairs]
+    return time.perf_counter() - start, search.expanded, lengths
+
+
+def route(rrg, terminals, **kwargs):
+    router = PathFinderRouter(rrg, **kwargs)
+    results = [stats for _, _, stats in router.iterate(terminals)]
+    return len(results), sum(stats["expanded"] for stats in results), sum(stats["time"] for stats in results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=20, help="broj SINK-ova za uzorkovanu mapu")
+    args = parser.parse_args()
+
+    rrg = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    terminals = net_terminals(parse_route_packed(os.path.join(ROOT, "b9", "b9.route")), rrg)
+    pairs = [(source, sink) for _, _, source, sinks in terminals for sink, _ in sinks]
+    costs = wire_costs(rrg)
+
+    dijkstra = measure(RRGSearch(rrg), pairs)
+    print(f"{len(pairs)} konekcija, cena = broj zica")
+    print(f"{'Dijkstra:':20s} {dijkstra[1]:6d} obidjenih, {dijkstra[0]:.3f} s")
+    for samples in (None, args.samples):
+        start = time.perf_counter()
+        lookahead = RouterLookahead(rrg, costs, samples=samples)
+        build = time.perf_counter() - start
+        astar = measure(RRGSearch(rrg, lookahead=lookahead), pairs)
+        label = "svi SINK-ovi" if samples is None else f"{lookahead.samples} SINK-ova"
+        print(f"{'A* (' + label + '):':20s} {astar[1]:6d} obidjenih, {astar[0]:.3f} s "
+              f"(mapa {build:.3f} s), {dijkstra[1] / astar[1]:.1f}x manje")
+        print(f"  iste duzine: {astar[2] == dijkstra[2]}")
+
+    print("PathFinder:")
+    for label, kwargs in (("Dijkstra", {"lookahead": False}), ("A*", {})):
+        iterations, expanded, seconds = route(rrg, terminals, **kwargs)
+        print(f"  {label:9s} {iterations} iteracija, {expanded} obidjenih, {seconds:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
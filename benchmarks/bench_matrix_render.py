@@ -0,0 +1,124 @@
+# Crtanje matrice FPGA: stari nacin (Rectangle + Line2D artist za svaki blok i svaku zicu, Text za svaki blok)
+# i FPGAMatrix.draw_fpga_grid sa jednom PatchCollection za blokove i jednom LineCollection za zice; natpisi
+# blokova se crtaju samo dok staju izmedju blokova (block_labels_fit). Meri se pravljenje artista i cuvanje
+# slike (Agg, png) za svaku matricu iz `--sizes` sa `--channels` zica. Stari nacin se meri sa natpisima;
+# ako ih novi izostavi, slike se porede sa starim crtezom bez natpisa. Slike se porede na dpi=300 kao u
+# FPGAMatrix.save; na nizem dpi ivice blokova mogu da se zaokruze na susedni piksel.
+#
+#   python benchmarks/bench_matrix_render.py [--sizes 30,40] [--channels 40] [--dpi 300]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.patches as patches
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.lines import Line2D
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.fpga_matrix import FPGAMatrix
+
+
+# stara implementacija, prepisana radi poredjenja; labels=False samo za poredjenje slika
+class OldMatrix(FPGAMatrix):
+    def __init__(self, labels=True):
+        super().__init__()
+        self.labels = labels
+
+    def draw_fpga_grid(self, num_rows=None, num_cols=None):
+        num_rows = self.num_rows if num_rows is None else num_rows
+        num_cols = self.num_cols if num_cols is None else num_cols
+        self.ax.clear()
+        total_width = num_cols * (self.clb_size + self.clb_channel_gap) + self.io_clb_gap * 2
+        total_height = num_rows * (self.clb_size + self.clb_channel_gap) + self.io_clb_gap * 2
+        self.ax.set_xlim(-1, total_width)
+        self.ax.set_ylim(-1, total_height)
+        self.ax.set_aspect('equal')
+        self.ax.set_title('Matrični prikaz FPGA arhitekture', fontsize=16)
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+
+        start_clb_x = self.io_size + self.io_clb_gap
+        start_clb_y = self.io_size + self.io_clb_gap
+        for row in range(num_rows):
+            for col in range(num_cols):
+                x_clb = start_clb_x + col * (self.clb_size + self.clb_channel_gap)
+                y_clb = start_clb_y + row * (self.clb_size + self.clb_channel_gap)
+                self.old_block(x_clb, y_clb, 'CLB')
+                if col < num_cols - 1:
+                    channel_x = x_clb + self.clb_size + (self.clb_channel_gap / 2) - (self.channel_width / 2)
+                    self.old_channels(channel_x, y_clb, self.clb_size, is_horizontal=False)
+                if row < num_rows - 1:
+                    channel_y = y_clb + self.clb_size + (self.clb_channel_gap / 2) - (self.channel_width / 2)
+                    self.old_channels(x_clb, channel_y, self.clb_size, is_horizontal=True)
+
+        for x, y, kind in self.io_blocks(num_rows, num_cols, start_clb_x, start_clb_y):
+            self.old_block(x, y, kind)
+        for segments in self.io_clb_channels(num_rows, num_cols, start_clb_x, start_clb_y):
+            for (x0, y0), (x1, y1) in segments:
+                self.ax.add_line(Line2D([x0, x1], [y0, y1], color='gray', linewidth=1, alpha=0.7))
+
+    def old_block(self, x, y, kind):
+        self.ax.add_patch(patches.Rectangle((x, y), self.clb_size, self.clb_size, color=self.colors[kind]))
+        if self.labels:
+            self.ax.text(x + self.clb_size / 2, y + self.clb_size / 2, kind,
+                         ha='center', va='center', color='black', fontweight='bold')
+
+    def old_channels(self, x, y, length, is_horizontal):
+        for i in range(self.num_channels):
+            offset = i * self.channel_spacing
+            if is_horizontal:
+                line = Line2D([x, x + length], [y + offset, y + offset], color='gray', linewidth=1, alpha=0.7)
+            else:
+                line = Line2D([x + offset, x + offset], [y, y + length], color='gray', linewidth=1, alpha=0.7)
+            self.ax.add_line(line)
+
+
+def run(matrix, size, args, filename):
+    matrix.num_channels = args.channels
+    matrix.channel_spacing = matrix.channel_width / args.channels
+    start = time.perf_counter()
+    matrix.draw_fpga_grid(size, size)
+    drawn = time.perf_counter()
+    matrix.fig.savefig(filename, dpi=args.dpi)
+    saved = time.perf_counter()
+    artists = len(matrix.ax.get_children())
+    texts = len(matrix.ax.texts)
+    plt.close("all")
+    return drawn - start, saved - drawn, matplotlib.image.imread(filename), artists, texts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="30,40")
+    parser.add_argument("--channels", type=int, default=40)
+    parser.add_argument("--dpi", type=int, default=300)
+    args = parser.parse_args()
+
+    for size in [int(part) for part in args.sizes.split(",")]:
+        with tempfile.TemporaryDirectory() as tmp:
+            old_draw, old_save, old_image, old_artists, old_texts = run(OldMatrix(), size, args,
+                                                                        os.path.join(tmp, "old.png"))
+            new_draw, new_save, new_image, new_artists, new_texts = run(FPGAMatrix(), size, args,
+                                                                        os.path.join(tmp, "new.png"))
+            if new_texts == 0:
+                old_image = run(OldMatrix(labels=False), size, args, os.path.join(tmp, "plain.png"))[2]
+
+        print(f"matrica {size}x{size}, {args.channels} zica po kanalu")
+        print(f"  stari:  {old_artists} artista ({old_texts} natpisa), crtanje {old_draw:.3f} s, "
+              f"cuvanje {old_save:.3f} s")
+        print(f"  novi:   {new_artists} artista ({new_texts} natpisa), crtanje {new_draw:.3f} s, "
+              f"cuvanje {new_save:.3f} s")
+        print(f"  ukupno ubrzanje: {(old_draw + old_save) / (new_draw + new_save):.1f}x")
+        label = "isti rezultat" if new_texts else "isti rezultat (bez natpisa)"
+        print(f"  {label}: {bool(np.array_equal(old_image, new_image))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Film konvergencije zagusenja: stari nacin (za svaku iteraciju nov vizualizer, cela matrica i savefig
+# u PNG) i ConvergenceMovie (jedna figura, zamrznuta pozadina, po frejmu set_array + tekstovi).
+# Vreme frejma ne ukljucuje pripremu (racunanje zauzetosti i crtanje matrice), ona se meri posebno.
+#
+#   python benchmarks/bench_movie.py [--route-dir b9] [--iterations 10] [--view congestion] [--no-labels]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.animation
+import matplotlib.pyplot as plt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.fpga_wires import FPGAWires
+from fpga_project.movie import MOVIE_VIEWS, ConvergenceMovie
+from fpga_project.parser_route import find_iteration_files, parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+
+def export_frames(rrg, routes, view, out):
+    for iteration, route in routes:
+        visualizer = FPGAWires()
+        visualizer.visualize_matrix(rrg)
+        if view == "congestion":
+            visualizer.visualize_wire_congestion(rrg, route, iteration)
+        else:
+            visualizer.visualize_segment_wire_usage(rrg, route, iteration)
+        # isti dpi kao film, da bi se poredilo samo crtanje
+        plt.savefig(os.path.join(out, f"frame_{iteration:03d}.png"), dpi=100, bbox_inches='tight')
+        plt.close("all")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rrg", default=os.path.join(ROOT, "b9", "rrg.xml"))
+    parser.add_argument("--route-dir", default=os.path.join(ROOT, "b9"))
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--view", choices=MOVIE_VIEWS, default="congestion")
+    parser.add_argument("--no-labels", action="store_true")
+    args = parser.parse_args()
+
+    rrg = RRGCache().load_or_parse(args.rrg)
+    files = find_iteration_files(args.route_dir)
+    routes = [(number, parse_route_packed(files[number]).to_route())
+              for number in sorted(files)[:args.iterations]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        export_frames(rrg, routes, args.view, tmp)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        movie = ConvergenceMovie()
+        movie.prepare(rrg, routes, args.view)
+        movie.prepare_figure(labels=not args.no_labels)
+        setup = time.perf_counter() - start
+
+        writer = matplotlib.animation.PillowWriter(fps=5)
+        start = time.perf_counter()
+        with writer.saving(movie.fig, os.path.join(tmp, "movie.gif"), movie.fig.dpi):
+            for index in range(len(movie.frames)):
+                movie.draw_frame(index)
+                writer.grab_frame()
+        frames = time.perf_counter() - start
+        plt.close("all")
+
+    print(f"{len(routes)} iteracija, prikaz {args.view}")
+    print(f"slika po iteraciji: {full:.2f} s ({full / len(routes):.3f} s po frejmu)")
+    print(f"film: priprema {setup:.2f} s, frejmovi {frames:.2f} s ({frames / len(routes):.3f} s po frejmu)")
+    print(f"ubrzanje po frejmu: {full / frames:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Zauzetost zica: stari dict-of-sets po zici (visualize_wire_congestion) i WireOccupancy (bincount
+# nad jedinstvenim parovima signal/zica + CSR zica -> signali). Ruta je b9.route ponovljena do `--nets`.
+#
+#   python benchmarks/bench_occupancy.py [--nets 100000]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_hpwl import tiled_route
+from fpga_project.occupancy import WireOccupancy
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+
+# brojanje kakvo je bilo u visualize_wire_congestion, samo za poredjenje
+def occupancy_dict(rrg, route):
+    wires = {node.id: node for node in rrg.nodes.values() if node.type in ['CHANX', 'CHANY']}
+    wire_load = {wire_id: 0 for wire_id in wires.keys()}
+    wire_signals = {wire_id: set() for wire_id in wires.keys()}
+    for net_id, net in route.nets.items():
+        wire_ids = set(node_id for node_id in net.node_ids if rrg.nodes[node_id].type in ['CHANX', 'CHANY'])
+        for wire_id in wire_ids:
+            if net_id not in wire_signals[wire_id]:
+                wire_signals[wire_id].add(net_id)
+                wire_load[wire_id] += 1
+    return wire_load, wire_signals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nets", type=int, default=100000)
+    args = parser.parse_args()
+
+    rrg = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    route = tiled_route(parse_route_packed(os.path.join(ROOT, "b9", "b9.route")), args.nets)
+    objects = route.to_route()
+    print(f"{len(route.net_numbers)} signala, {len(route.node_ids)} cvorova")
+
+    start = time.perf_counter()
+    wire_load, _ = occupancy_dict(rrg, objects)
+    dict_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    occupancy = WireOccupancy(rrg, route)
+    bincount_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    occupancy.build_wire_nets()
+    csr_time = time.perf_counter() - start
+
+    wires = np.fromiter(wire_load.keys(), dtype=np.int64)
+    same = np.array_equal(occupancy.occupancy[wires], np.fromiter(wire_load.values(), dtype=np.int64))
+    print(f"  dict-of-sets     {dict_time:7.3f} s")
+    print(f"  bincount         {bincount_time:7.3f} s  (isti rezultat: {same})")
+    print(f"  + CSR signala    {csr_time:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
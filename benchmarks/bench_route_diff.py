@@ -0,0 +1,74 @@
+# Metrike kroz sve iteracije rutiranja: racunanje od nule za svaku iteraciju (WireOccupancy, HPWL i
+# odstupanje, TimingReport) i walk_iterations + TimingReport sa prethodnim izvestajem, gde se posle prve rute
+# racunaju samo promenjeni signali. Sve b9 iteracije su ponovljene `--scale` puta (kopije signala).
+#
+#   python benchmarks/bench_route_diff.py [--scale 100]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_detour import tiled_route
+from fpga_project.fpga_metrics import FPGAMetrics
+from fpga_project.occupancy import WireOccupancy
+from fpga_project.parser_route import load_all_iterations
+from fpga_project.route_diff import walk_iterations
+from fpga_project.rrg_cache import RRGCache
+from fpga_project.timing import TimingReport
+
+
+def full_recompute(rrg, routes, analyzer):
+    results = []
+    for number, route in routes.items():
+        occupancy = WireOccupancy(rrg, route).occupancy
+        deviation = analyzer.compute_deviation_metrics(rrg, route)
+        results.append((occupancy, deviation, TimingReport(rrg, route).delay))
+    return results
+
+
+def incremental(rrg, routes, analyzer):
+    results = []
+    previous = None
+    for number, diff, metrics in walk_iterations(rrg, routes, analyzer.coord_map):
+        # isti diff vazi i za kasnjenja, pa se rute ne porede dva puta
+        report = TimingReport(rrg, metrics.route, previous, diff if previous is not None else None)
+        results.append((metrics.wire_load.copy(), metrics.deviation_metrics(), report.delay))
+        previous = report
+    return results, metrics.recomputed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args()
+
+    rrg = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    routes = {number: tiled_route(route, args.scale, 0)
+              for number, route in load_all_iterations(os.path.join(ROOT, "b9")).items()}
+    analyzer = FPGAMetrics()
+    analyzer.map_rrg_to_grid(rrg)
+    total = sum(len(route) for route in routes.values())
+    print(f"{len(routes)} iteracija, {total} signala ukupno")
+
+    start = time.perf_counter()
+    old = full_recompute(rrg, routes, analyzer)
+    old_time = time.perf_counter() - start
+    print(f"od nule:          {old_time:.2f} s, {total} signala racunato")
+
+    start = time.perf_counter()
+    new, recomputed = incremental(rrg, routes, analyzer)
+    new_time = time.perf_counter() - start
+    print(f"walk_iterations:  {new_time:.2f} s, {recomputed} signala racunato ({old_time / new_time:.1f}x)")
+
+    same = all(np.array_equal(a[0], b[0]) and a[1] == b[1] and np.array_equal(a[2], b[2])
+               for a, b in zip(old, new))
+    print(f"isti rezultat: {same}")
+
+
+if __name__ == "__main__":
+    main()
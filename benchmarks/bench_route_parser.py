@@ -0,0 +1,78 @@
+# Propusnost RouteParser-a (linija/s) nad svim b9/iteration_*.route fajlovima,
+# u poredjenju sa ranijim parserom zasnovanim na re.match po liniji.
+#
+#   python benchmarks/bench_route_parser.py [--repeat 5]
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.models import Node
+from fpga_project.parser_route import RouteParser
+
+
+# raniji parser (regex po liniji), samo za poredjenje
+def parse_with_regex(route_file):
+    nets = {}
+    current_net = None
+    with open(route_file, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("Net"):
+                match = re.match(r"Net\s+(\d+)\s+\((.+)\)", line)
+                if match:
+                    current_net = int(match.group(1))
+                    nets[current_net] = []
+                continue
+            if line.startswith("Node") and current_net is not None:
+                match = re.match(r"Node:\s*(\d+)\s+(\w+)\s+\((\d+),(\d+),\d+\)\s+.*?(\d+)", line)
+                if match:
+                    x = int(match.group(3))
+                    y = int(match.group(4))
+                    nets[current_net].append(
+                        Node(int(match.group(1)), match.group(2), int(match.group(5)), x, x, y, y))
+    return nets
+
+
+def parse_with_tokens(route_file):
+    parser = RouteParser()
+    parser.parse(route_file)
+    return parser.get_route()
+
+
+def throughput(parse, files, num_lines, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for route_file in files:
+            parse(route_file)
+        best = min(best, time.perf_counter() - start)
+    return best, num_lines / best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(ROOT, "b9", "iteration_*.route")))
+    num_lines = 0
+    for route_file in files:
+        with open(route_file, "r") as f:
+            num_lines += sum(1 for _ in f)
+    print(f"{len(files)} fajlova, {num_lines} linija")
+
+    for label, parse in (("re.match", parse_with_regex), ("split   ", parse_with_tokens)):
+        elapsed, lines_per_sec = throughput(parse, files, num_lines, args.repeat)
+        print(f"  {label}  {elapsed * 1000:8.1f} ms  {lines_per_sec:12,.0f} linija/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# PathFinder na b9: pretraga sa dict-ovima cena/prethodnika koji se prave za svaku konekciju i
+# PathFinderRouter (nizovi za ceo graf alocirani jednom, vracaju se samo dotaknuti cvorovi).
+# Obe pretrage obilaze iste cvorove istim redom, pa su rute iste.
+#
+#   python benchmarks/bench_router.py [--repeat 3]
+import argparse
+import heapq
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.models import PackedRoute
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.router import PathFinderRouter, net_terminals
+from fpga_project.rrg_cache import RRGCache
+
+
+# ista pretraga, ali sa dict-ovima koji se alociraju za svaku konekciju, samo za poredjenje
+class DictRouter(PathFinderRouter):
+    def search(self, tree, target):
+        path_cost = {i: 0.0 for i in tree}
+        prev = {i: (-1, -1) for i in tree}
+        heap = [(0.0, i) for i in tree]
+        found = False
+        while heap:
+            cost, i = heapq.heappop(heap)
+            if cost > path_cost[i]:
+                continue
+            self.expanded += 1
+            if i == target:
+                found = True
+                break
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                j = self.indices[k]
+                if self.is_sink[j] and j != target:
+                    continue
+                new_cost = cost + self.node_cost[j]
+                if new_cost < path_cost.get(j, math.inf):
+                    path_cost[j] = new_cost
+                    prev[j] = (i, self.edge_switch[k])
+                    heapq.heappush(heap, (new_cost, j))
+        if not found:
+            return None
+        path = []
+        i = target
+        while prev[i][0] >= 0:
+            path.append((i, prev[i][1]))
+            i = prev[i][0]
+        path.append((i, -1))
+        return path[::-1]
+
+
+# obe varijante bez lookahead-a (obicna Dijkstra), da se poredi samo rad sa nizovima
+def run(cls, rrg, terminals):
+    router = cls(rrg, lookahead=False)
+    start = time.perf_counter()
+    results = [(stats, route) for _, route, stats in router.iterate(terminals)]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rrg = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    terminals = net_terminals(parse_route_packed(os.path.join(ROOT, "b9", "b9.route")), rrg)
+
+    old = min((run(DictRouter, rrg, terminals) for _ in range(args.repeat)), key=lambda result: result[0])
+    new = min((run(PathFinderRouter, rrg, terminals) for _ in range(args.repeat)), key=lambda result: result[0])
+
+    same = len(old[1]) == len(new[1]) and all(
+        np.array_equal(PackedRoute.from_route(a[1]).node_ids, PackedRoute.from_route(b[1]).node_ids)
+        for a, b in zip(old[1], new[1]))
+    print(f"{len(terminals)} signala, {len(new[1])} iteracija do legalnog rutiranja")
+    for iteration, (stats, _) in enumerate(new[1], start=1):
+        print(f"  iteracija {iteration}: {stats['time'] * 1000:.1f} ms, preopterecenih: {stats['overused']}")
+    print(f"dict po pretrazi: {old[0]:.3f} s")
+    print(f"nizovi:           {new[0]:.3f} s")
+    print(f"ubrzanje: {old[0] / new[0]:.2f}x")
+    print(f"isti rezultat: {same}")
+
+
+if __name__ == "__main__":
+    main()
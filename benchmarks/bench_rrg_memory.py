@@ -0,0 +1,87 @@
+# Memorija po RR cvoru za tri nacina cuvanja: Node sa __dict__ (stari model),
+# Node sa __slots__ (RRG) i kolonski NumPy nizovi (ArrayRRG).
+#
+#   python benchmarks/bench_rrg_memory.py [--scale 100]
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fpga_project.models import ArrayRRG, Node, RRG
+from fpga_project.parser_rrg import RRGParser
+
+
+# Node kakav je bio pre __slots__, samo za poredjenje
+class DictNode:
+    def __init__(self, node_id, node_type, ptc, xhigh, xlow, yhigh, ylow, side=None):
+        self.id = node_id
+        self.type = node_type
+        self.ptc = ptc
+        self.xhigh = xhigh
+        self.xlow = xlow
+        self.yhigh = yhigh
+        self.ylow = ylow
+        self.side = side
+
+
+def node_fields(scale):
+    parser = RRGParser(compact=False)
+    parser.parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    nodes = list(parser.get_rrg().nodes.values())
+    num_nodes = len(nodes)
+    return [(n.id + k * num_nodes, n.type, n.ptc, n.xhigh, n.xlow, n.yhigh, n.ylow, n.side)
+            for k in range(scale) for n in nodes]
+
+
+def measure(build, fields):
+    gc.collect()
+    tracemalloc.start()
+    store = build(fields)
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return used / len(fields)
+
+
+def build_dict_nodes(fields):
+    rrg = RRG()
+    for f in fields:
+        rrg.nodes[f[0]] = DictNode(*f)
+    return rrg
+
+
+def build_slot_nodes(fields):
+    rrg = RRG()
+    for f in fields:
+        rrg.add_node(Node(*f))
+    return rrg
+
+
+def build_array_nodes(fields):
+    rrg = ArrayRRG()
+    for f in fields:
+        rrg.add_node(Node(*f))
+    rrg.build_adjacency()
+    return rrg
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args()
+
+    fields = node_fields(args.scale)
+    print(f"{len(fields)} cvorova")
+    for label, build in (("Node + __dict__ ", build_dict_nodes),
+                         ("Node + __slots__", build_slot_nodes),
+                         ("ArrayRRG        ", build_array_nodes)):
+        print(f"  {label}  {measure(build, fields):7.1f} B/cvor")
+
+
+if __name__ == "__main__":
+    main()
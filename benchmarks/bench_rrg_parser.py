@@ -0,0 +1,87 @@
+# Poredjenje ET.parse i iterparse nacina ucitavanja rrg.xml (vreme i maksimalni RSS).
+# Svako merenje se radi u posebnom procesu da se peak RSS ne bi mesao izmedju nacina.
+#
+#   python benchmarks/bench_rrg_parser.py [--scale 100]
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RRG_FILE = os.path.join(ROOT, "b9", "rrg.xml")
+
+CHILD = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from fpga_project.parser_rrg import RRGParser
+parser = RRGParser()
+start = time.perf_counter()
+parser.parse({file!r}, streaming={streaming})
+elapsed = time.perf_counter() - start
+rrg = parser.get_rrg()
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, peak_kb, len(rrg.nodes), len(rrg.edges))
+"""
+
+
+# pravi rr_graph koji je `scale` puta veci tako sto ponavlja cvorove i grane sa pomerenim id-jevima
+def make_synthetic_rrg(src_file, dst_file, scale):
+    with open(src_file, "r") as f:
+        text = f.read()
+
+    head, rest = text.split("<rr_nodes>", 1)
+    nodes, rest = rest.split("</rr_nodes>", 1)
+    edges_part, tail = rest.split("</rr_edges>", 1)
+    between, edges = edges_part.split("<rr_edges>", 1)
+
+    num_nodes = len(re.findall(r"<node ", nodes))
+    node_id = re.compile(r'(<node [^>]*\bid=")(\d+)')
+    edge_ids = re.compile(r'(sink_node|src_node)="(\d+)"')
+
+    with open(dst_file, "w") as out:
+        out.write(head + "<rr_nodes>")
+        for k in range(scale):
+            offset = k * num_nodes
+            out.write(node_id.sub(lambda m: m.group(1) + str(int(m.group(2)) + offset), nodes))
+        out.write("</rr_nodes>" + between + "<rr_edges>")
+        for k in range(scale):
+            offset = k * num_nodes
+            out.write(edge_ids.sub(lambda m: f'{m.group(1)}="{int(m.group(2)) + offset}"', edges))
+        out.write("</rr_edges>" + tail)
+
+
+def measure(rrg_file, streaming):
+    code = CHILD.format(root=ROOT, file=rrg_file, streaming=streaming)
+    output = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True).stdout
+    elapsed, peak_kb, num_nodes, num_edges = output.split()
+    return float(elapsed), int(peak_kb) / 1024, int(num_nodes), int(num_edges)
+
+
+def report(label, rrg_file):
+    size_mb = os.path.getsize(rrg_file) / 2 ** 20
+    print(f"{label}: {size_mb:.1f} MB")
+    for streaming in (False, True):
+        elapsed, peak_mb, num_nodes, num_edges = measure(rrg_file, streaming)
+        mode = "iterparse" if streaming else "ET.parse "
+        print(f"  {mode}  {elapsed:7.2f} s  peak RSS {peak_mb:8.1f} MB  "
+              f"({num_nodes} cvorova, {num_edges} grana)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args()
+
+    report("b9/rrg.xml", RRG_FILE)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = os.path.join(tmp, "rrg_synthetic.xml")
+        make_synthetic_rrg(RRG_FILE, synthetic, args.scale)
+        report(f"sinteticki rrg x{args.scale}", synthetic)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Kasnjenje (zbir Tdel prekidaca) do svih SINK-ova rute: stari nacin, Python petlja po Net objektima (roditelj je
+# uvek pre deteta, pa je dovoljan jedan prolaz po cvorovima signala), i arrival_times nad PackedRoute (jedan
+# NumPy prolaz po nivoima dubine za sve signale odjednom). Ruta je b9.route ponovljena `--scale` puta,
+# 920 kopija je ~100k konekcija.
+#
+#   python benchmarks/bench_timing.py [--scale 920]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_detour import tiled_route
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+from fpga_project.timing import PS, TimingReport, arrival_times
+
+
+# kasnjenja SINK-ova po signalima, redom kao u ruti
+def old_sink_delays(rrg, route):
+    delays = []
+    for net in route.nets.values():
+        arrival = [0.0] * len(net)
+        for i in range(1, len(net)):
+            switch = rrg.switches.get(net.switch[i])
+            arrival[i] = arrival[net.parent[i]] + (switch.tdel if switch else 0.0)
+            if net.net_pin_index[i] >= 0:
+                delays.append(arrival[i])
+    return delays
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=920)
+    args = parser.parse_args()
+
+    rrg = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    packed = tiled_route(parse_route_packed(os.path.join(ROOT, "b9", "b9.route")), args.scale, 0)
+    route = packed.to_route()
+
+    start = time.perf_counter()
+    old = old_sink_delays(rrg, route)
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = arrival_times(rrg, packed)[packed.net_pin_index >= 0]
+    new_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = TimingReport(rrg, packed)
+    report_time = time.perf_counter() - start
+
+    print(f"{len(packed.net_numbers)} signala, {len(new)} konekcija, {len(packed.node_ids)} cvorova rute")
+    print(f"Python petlja po signalima: {old_time:.3f} s")
+    print(f"arrival_times:              {new_time:.3f} s ({old_time / new_time:.1f}x)")
+    print(f"TimingReport:               {report_time:.3f} s, kriticno {report.critical_delay() * PS:.2f} ps")
+    print(f"isti rezultat: {np.array_equal(np.array(old), new)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import matplotlib.image
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.text import Text
+
+
+# figura dobija velicinu tight okvira (+ pad_inches), a osa se pomera tako da ostane na istom mestu u odnosu
+# na okvir; legenda van ose tako ulazi u sliku kao kod savefig(bbox_inches='tight'), ali je velicina fiksna
+def fit_to_tight_bbox(fig, ax, pad_inches=0.1):
+    fig.canvas.draw()
+    tight = fig.get_tightbbox(fig.canvas.get_renderer()).padded(pad_inches)
+    width, height = fig.get_size_inches()
+    position = ax.get_position()
+
+    fig.set_size_inches(tight.width, tight.height)
+    ax.set_position([(position.x0 * width - tight.x0) / tight.width,
+                     (position.y0 * height - tight.y0) / tight.height,
+                     position.width * width / tight.width,
+                     position.height * height / tight.height])
+
+
+# artist koji u Agg renderer vraca sacuvanu bitmapu (restore_region); crta se pre svih ostalih artista
+class RasterBackground(Artist):
+    def __init__(self, region):
+        super().__init__()
+        self.region = region
+        self.set_zorder(-1)
+
+    def draw(self, renderer):
+        if self.get_visible():
+            renderer.restore_region(self.region)
+
+
+# staticni sloj (sve sto je trenutno na osi i legenda) se renderuje jednom i vraca u svako crtanje figure
+# kao RasterBackground, a njegovi artisti se sakriju. Figura se i dalje cuva obicnim savefig-om (npr. iz
+# MovieWriter-a), ali se po frejmu crta samo ono sto je dodato posle. Figura posle ovoga ne sme da menja
+# velicinu ni dpi
+def freeze_background(fig, ax):
+    ax.title.set_visible(False)
+    fig.canvas.draw()
+    region = fig.canvas.copy_from_bbox(fig.bbox)
+    ax.title.set_visible(True)
+    for artist in ax.get_children():
+        # naslov ostaje ziv; prazni tekstovi (levi/desni naslov) se ne crtaju, a sakriveni bi pomerili naslov
+        if artist is ax.title or (isinstance(artist, Text) and not artist.get_text()):
+            continue
+        artist.set_visible(False)
+    fig.add_artist(RasterBackground(region))
+
+
+# pozadina vizualizera (matrica i legenda) renderovana jednom u Agg bitmapu. Za svaku sliku se bitmapa
+# vrati (restore_region) i crtaju se samo artisti dodati posle nje, pa cena slike zavisi samo od rute/metrike.
+# Figura se jednom prilagodi tight okviru pozadine (fit_to_tight_bbox), tako da su sve slike iste velicine
+class BackgroundCache:
+    def __init__(self, visualizer, dpi=300):
+        self.visualizer = visualizer
+        self.fig = visualizer.fig
+        self.ax = visualizer.ax
+        self.dpi = dpi
+
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.fig.set_dpi(dpi)
+        fit_to_tight_bbox(self.fig, self.ax)
+
+        # naslov se menja po slici (npr. broj iteracije), pa se crta u sloju iznad pozadine
+        self.title = (self.ax.get_title(), self.ax.title.get_fontsize())
+        self.ax.title.set_visible(False)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax.title.set_visible(True)
+        self.base_artists = set(self.ax.get_children())
+
+    # artisti dodati posle pozadine, redom kojim bi ih crtao Axes.draw
+    def overlay(self):
+        artists = [artist for artist in self.ax.get_children() if artist not in self.base_artists]
+        return sorted(artists, key=lambda artist: artist.get_zorder())
+
+    # RGBA slika: pozadina + trenutni sloj + naslov
+    def render(self) -> np.ndarray:
+        self.canvas.restore_region(self.background)
+        for artist in self.overlay():
+            self.ax.draw_artist(artist)
+        self.ax.draw_artist(self.ax.title)
+        return np.asarray(self.canvas.buffer_rgba())
+
+    # uklanja sloj da bi isti vizualizer mogao da crta sledecu sliku
+    def clear(self):
+        for artist in self.overlay():
+            artist.remove()
+        self.ax.set_title(self.title[0], fontsize=self.title[1])
+
+    def save(self, filename: str, format='png'):
+        matplotlib.image.imsave(filename, self.render(), format=format, dpi=self.dpi)
+        self.clear()
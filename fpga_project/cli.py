@@ -0,0 +1,377 @@
+import argparse
+import os
+import sys
+
+from .parser_route import (find_iteration_files, load_all_iterations, parse_route_packed, route_header,
+                           write_route)
+from .rrg_cache import RRGCache
+
+# komande koje ne crtaju (metrike, rutiranje); za njih se matplotlib uopste ne ucitava
+METRIC_COMMANDS = ("hpwl", "deviation", "pathfinder", "detour", "timing")
+
+# formati koje Agg bitmapa kesirane pozadine moze direktno da upise (vektorski idu kroz savefig)
+RASTER_FORMATS = ("png", "jpg", "jpeg", "tif", "tiff", "webp")
+
+
+# "0,3,5-9" -> [0, 3, 5, 6, 7, 8, 9]; "all" -> sve iteracije koje postoje u direktorijumu
+def parse_number_list(text: str, available=None):
+    if text == "all":
+        return list(available or [])
+    numbers = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            numbers.extend(range(int(start), int(end) + 1))
+        else:
+            numbers.append(int(part))
+    return numbers
+
+
+class BatchRunner:
+    def __init__(self, args):
+        self.args = args
+        # set_defaults na podkomandi bi promenio i deljenu -i akciju ostalih komandi, pa se default bira ovde
+        if args.iterations is None:
+            args.iterations = "all" if args.command == "movie" else "0"
+        os.makedirs(args.out, exist_ok=True)
+        # RRG se ucitava jednom (iz kesa) za sve iteracije i signale
+        self.rrg = RRGCache().load_or_parse(args.rrg)
+        try:
+            self.route_files = find_iteration_files(args.route_dir)
+        except ValueError as e:
+            print(f"Greška: {e}")
+            self.route_files = {}
+        # {klasa vizualizera: BackgroundCache}; matrica i legenda se renderuju jednom po komandi
+        self.backgrounds = {}
+        self.cache_background = args.format in RASTER_FORMATS and not args.no_background_cache
+
+    # packed=True vraca PackedRoute (dovoljan za metrike), inace Route za crtanje. Vise iteracija
+    # (npr. -i all) se parsira odjednom u procesima (load_all_iterations), jedna direktno
+    def iterations(self, packed=False):
+        numbers = []
+        for number in parse_number_list(self.args.iterations, self.route_files.keys()):
+            if number not in self.route_files:
+                print(f"Ruta za iteraciju {number} ne postoji u {self.args.route_dir}")
+                continue
+            numbers.append(number)
+
+        if len(numbers) > 1:
+            routes = load_all_iterations(self.args.route_dir, numbers=numbers)
+        else:
+            routes = {number: parse_route_packed(self.route_files[number]) for number in numbers}
+        for number in numbers:
+            route = routes[number]
+            yield number, route if packed else route.to_route()
+
+    # iteracije redom kroz walk_iterations: (broj, ruta, RouteDiff, IncrementalRouteMetrics), gde se zauzetost,
+    # HPWL i odstupanje posle prve rute racunaju samo za signale promenjene u odnosu na prethodnu iteraciju
+    def walk(self, coord_map):
+        from .route_diff import walk_iterations
+        for number, diff, metrics in walk_iterations(self.rrg, self.iterations(packed=True), coord_map):
+            yield number, metrics.route, diff, metrics
+
+    def output_path(self, name: str, iteration=None, net_id=None, extension=None) -> str:
+        if iteration is not None:
+            name += f"_iter{iteration:03d}"
+        if net_id is not None:
+            name += f"_net{net_id}"
+        return os.path.join(self.args.out, f"{name}.{extension or self.args.format}")
+
+    def save(self, visualizer, filename: str) -> None:
+        import matplotlib.pyplot as plt
+        background = self.backgrounds.get(type(visualizer))
+        if background is not None and background.visualizer is visualizer:
+            # crta se samo sloj iznad kesirane pozadine, a vizualizer ostaje za sledecu sliku
+            background.save(filename, format=self.args.format)
+        else:
+            visualizer.save(filename, format=self.args.format)
+            plt.close("all")
+        print(f"Slika je sačuvana kao {filename}")
+
+    def visualizer(self, cls):
+        if cls in self.backgrounds:
+            return self.backgrounds[cls].visualizer
+        visualizer = cls()
+        visualizer.visualize_matrix(self.rrg)
+        if self.cache_background:
+            from .background import BackgroundCache
+            self.backgrounds[cls] = BackgroundCache(visualizer)
+        return visualizer
+
+    def net_ids(self, route):
+        if self.args.nets == "all":
+            return list(route.nets.keys())
+        return parse_number_list(self.args.nets)
+
+    # 1 - Matrix
+    def matrix(self):
+        from .fpga_matrix import FPGAMatrix
+        self.save(self.visualizer(FPGAMatrix), self.output_path("matrix"))
+
+    # 2 - Routing jednog signala
+    def route(self):
+        from .fpga_routing import FPGARouting
+        for iteration, route_data in self.iterations():
+            for net_id in self.net_ids(route_data):
+                visualizer = self.visualizer(FPGARouting)
+                visualizer.visualize_routing_on_grid(self.rrg, route_data.nets[net_id].path(), net_id)
+                self.save(visualizer, self.output_path("route", iteration, net_id))
+
+    # 3 - Routing by branching
+    def branching(self):
+        from .fpga_routing import FPGARouting
+        for iteration, route_data in self.iterations():
+            visualizer = self.visualizer(FPGARouting)
+            visualizer.visualize_routing_by_branching(self.rrg, route_data, self.args.factor)
+            self.save(visualizer, self.output_path(f"branching{self.args.factor}", iteration))
+
+    # 4 - Wire congestion
+    def congestion(self):
+        from .fpga_wires import FPGAWires
+        for iteration, route_data in self.iterations():
+            visualizer = self.visualizer(FPGAWires)
+            visualizer.visualize_wire_congestion(self.rrg, route_data, iteration)
+            self.save(visualizer, self.output_path("congestion", iteration))
+
+    # 5 - Segment wire usage
+    def segment_usage(self):
+        from .fpga_wires import FPGAWires
+        for iteration, route_data in self.iterations():
+            visualizer = self.visualizer(FPGAWires)
+            visualizer.visualize_segment_wire_usage(self.rrg, route_data, iteration)
+            self.save(visualizer, self.output_path("segment_usage", iteration))
+
+    # 6 - Bounding box jednog signala
+    def bbox(self):
+        from .fpga_bounding_box import FPGABoundingBox
+        for iteration, route_data in self.iterations():
+            for net_id in self.net_ids(route_data):
+                visualizer = self.visualizer(FPGABoundingBox)
+                visualizer.visualize_signal_with_bounding_box(self.rrg, route_data.nets[net_id].path(), net_id)
+                self.save(visualizer, self.output_path("bbox", iteration, net_id))
+
+    # 7 - Terminal bounding box jednog signala
+    def terminal_bbox(self):
+        from .fpga_bounding_box import FPGABoundingBox
+        for iteration, route_data in self.iterations():
+            for net_id in self.net_ids(route_data):
+                visualizer = self.visualizer(FPGABoundingBox)
+                visualizer.visualize_terminal_bounding_box(self.rrg, route_data.nets[net_id].path(), net_id)
+                self.save(visualizer, self.output_path("terminal_bbox", iteration, net_id))
+
+    # 8 - Najveci bounding box-ovi
+    def top_bbox(self):
+        from .fpga_bounding_box import FPGABoundingBox
+        for iteration, route_data in self.iterations():
+            visualizer = self.visualizer(FPGABoundingBox)
+            visualizer.visualize_top_n_bounding_box_nets(self.rrg, route_data, self.args.n)
+            self.save(visualizer, self.output_path(f"top{self.args.n}_bbox", iteration))
+
+    # 9 - Najveci terminal bounding box-ovi
+    def top_terminal_bbox(self):
+        from .fpga_bounding_box import FPGABoundingBox
+        for iteration, route_data in self.iterations():
+            visualizer = self.visualizer(FPGABoundingBox)
+            visualizer.visualize_top_n_terminal_bounding_box_nets(self.rrg, route_data, self.args.n)
+            self.save(visualizer, self.output_path(f"top{self.args.n}_terminal_bbox", iteration))
+
+    # 10 - HPWL
+    def hpwl(self):
+        from .fpga_metrics import FPGAMetrics
+        analyzer = FPGAMetrics()
+        analyzer.map_rrg_to_grid(self.rrg)
+        for iteration, _, _, metrics in self.walk(analyzer.coord_map):
+            net_numbers, hpwl, hpwl_grid = metrics.hpwl_table()
+            analyzer.save_hpwl(analyzer.hpwl_results(net_numbers, hpwl),
+                               self.output_path("hpwl", iteration, extension="txt"),
+                               analyzer.hpwl_results(net_numbers, hpwl_grid))
+
+    # 11 - Prvih N signala
+    def first_n(self):
+        from .fpga_routing import FPGARouting
+        for iteration, route_data in self.iterations():
+            visualizer = self.visualizer(FPGARouting)
+            routing_paths = [net.path() for net in route_data.nets.values()]
+            visualizer.visualize_first_n_routings(self.rrg, routing_paths, self.args.n)
+            self.save(visualizer, self.output_path(f"first{self.args.n}", iteration))
+
+    # 12 - Analiza odstupanja ruta od HPWL
+    def deviation(self):
+        from .fpga_metrics import FPGAMetrics
+        analyzer = FPGAMetrics()
+        analyzer.map_rrg_to_grid(self.rrg)
+        for iteration, route_data, _, metrics in self.walk(analyzer.coord_map):
+            deviation_metrics = metrics.deviation_metrics()
+            if self.args.print:
+                analyzer.print_deviation_analysis(self.rrg, route_data, self.args.n, deviation_metrics)
+            analyzer.save_deviation_analysis(self.rrg, route_data,
+                                             self.output_path("deviation", iteration, extension="txt"),
+                                             self.args.n, deviation_metrics)
+
+    # 13 - Preklapanje bounding box-ova na segmentima
+    def bbox_overlap(self):
+        from .fpga_bounding_box import FPGABoundingBox
+        for iteration, route_data in self.iterations():
+            visualizer = self.visualizer(FPGABoundingBox)
+            visualizer.visualize_segment_terminal_bbox_overlap(self.rrg, route_data)
+            self.save(visualizer, self.output_path("bbox_overlap", iteration))
+
+    # 14 - Film konvergencije kroz iteracije
+    def movie(self):
+        from .movie import ConvergenceMovie
+        movie = ConvergenceMovie()
+        movie.prepare(self.rrg, self.iterations(packed=True), self.args.view)
+        filename = movie.save_movie(self.output_path(f"{self.args.view}_movie", extension=self.args.movie_format),
+                                    fps=self.args.fps, dpi=self.args.dpi, labels=not self.args.no_labels)
+        if filename:
+            print(f"Film je sačuvan kao {filename}")
+
+    # 15 - PathFinder rutiranje signala (SOURCE/SINK) iz postojece rute. Svaka iteracija se upisuje kao
+    # iteration_NNN.route, a poslednja i pod imenom ulazne rute, pa je izlaz ulaz za ostale komande (--route-dir)
+    def pathfinder(self):
+        from .router import PathFinderRouter, net_terminals
+        number, route_data = next(self.iterations(packed=True), (None, None))
+        if route_data is None:
+            return
+        route_file = self.route_files[number]
+        header = route_header(route_file)
+
+        router = PathFinderRouter(self.rrg, initial_pres_fac=self.args.pres_fac,
+                                  pres_fac_mult=self.args.pres_fac_mult, hist_fac=self.args.hist_fac,
+                                  max_iterations=self.args.max_iterations, lookahead=not self.args.no_lookahead,
+                                  lookahead_samples=self.args.lookahead_samples)
+        terminals = net_terminals(route_data, self.rrg)
+        if not any(sinks for _, _, _, sinks in terminals):
+            print(f"Ruta {route_file} nema nijedan SINK, nema sta da se rutira")
+            return
+
+        total = 0.0
+        route, stats = None, None
+        try:
+            for iteration, route, stats in router.iterate(terminals):
+                total += stats["time"]
+                print(f"Iteracija {iteration}: {stats['time']:.3f} s, preopterecenih cvorova: {stats['overused']}, "
+                      f"obidjenih cvorova: {stats['expanded']}")
+                write_route(route, self.rrg, self.output_path(f"iteration_{iteration:03d}", extension="route"),
+                            header)
+        except ValueError as e:
+            print(f"Greška pri rutiranju: {e}")
+            return
+
+        if route is None:
+            print(f"Nije izvrsena nijedna iteracija rutiranja (--max-iterations {self.args.max_iterations})")
+            return
+        if stats["overused"]:
+            print(f"Rutiranje nije legalno posle {self.args.max_iterations} iteracija")
+        filename = os.path.join(self.args.out, os.path.basename(self.route_files.get(0, route_file)))
+        write_route(route, self.rrg, filename, header)
+        print(f"Ukupno rutiranje: {total:.3f} s")
+        print(f"Ruta je sačuvana kao {filename}")
+
+    # 16 - Obilazak svake konekcije u odnosu na najkraci put u RRG-u (txt)
+    def detour(self):
+        from .detour import detour_table
+        for iteration, route_data in self.iterations(packed=True):
+            table = detour_table(self.rrg, route_data, workers=self.args.workers)
+            table.save(self.output_path("detour", iteration, extension="txt"), self.args.n)
+
+    # 17 - Staticka analiza kasnjenja (zbir Tdel prekidaca do svakog SINK-a); za vise iteracija i tabela
+    # kriticnog i prosecnog kasnjenja kroz iteracije. Posle prve rute se kasnjenja racunaju samo za signale
+    # koji su se promenili (diff_routes), ostala se preuzimaju iz prethodne iteracije
+    def timing(self):
+        from .route_diff import diff_routes
+        from .timing import TimingReport, save_timing_evolution
+        reports = {}
+        previous, previous_route = None, None
+        for iteration, route_data in self.iterations(packed=True):
+            diff = diff_routes(previous_route, route_data) if previous_route is not None else None
+            report = TimingReport(self.rrg, route_data, previous, diff)
+            previous, previous_route = report, route_data
+            report.save(self.output_path("timing", iteration, extension="txt"), self.args.n)
+            reports[iteration] = report
+        if len(reports) > 1:
+            save_timing_evolution(reports, self.output_path("timing_iterations", extension="txt"))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="parse_all.py",
+        description="Neinteraktivna analiza i vizualizacija FPGA rutiranja (VPR rrg.xml + .route).")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--rrg", default="b9/rrg.xml", help="putanja do rrg.xml (default: b9/rrg.xml)")
+    common.add_argument("--route-dir", default="b9",
+                        help="direktorijum sa iteration_NNN.route i finalnom .route rutom (default: b9)")
+    common.add_argument("-i", "--iterations", default=None,
+                        help='iteracije, npr. "0", "1-63", "1,5,10" ili "all"; 0 je finalna ruta '
+                             '(default: 0, za movie: all)')
+    common.add_argument("-o", "--out", default="out", help="izlazni direktorijum (default: out)")
+    common.add_argument("--format", default="png", help="format slika (default: png)")
+    common.add_argument("--no-background-cache", action="store_true",
+                        help="crtaj celu sliku svaki put umesto kesirane pozadine (matrica + legenda)")
+
+    nets = argparse.ArgumentParser(add_help=False)
+    nets.add_argument("--nets", default="0", help='signali, npr. "0", "3,7", "0-10" ili "all" (default: 0)')
+
+    top_n = argparse.ArgumentParser(add_help=False)
+    top_n.add_argument("-n", type=int, default=10, help="broj signala (default: 10)")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("matrix", parents=[common], help="1 - matricni prikaz")
+    subparsers.add_parser("route", parents=[common, nets], help="2 - ruta signala")
+    branching = subparsers.add_parser("branching", parents=[common], help="3 - rute po faktoru grananja")
+    branching.add_argument("--factor", type=int, required=True, help="broj SINK cvorova signala")
+    subparsers.add_parser("congestion", parents=[common], help="4 - zagusenje po zicama")
+    subparsers.add_parser("segment-usage", parents=[common], help="5 - zauzete zice po segmentu")
+    subparsers.add_parser("bbox", parents=[common, nets], help="6 - bounding box signala")
+    subparsers.add_parser("terminal-bbox", parents=[common, nets], help="7 - terminal bounding box signala")
+    subparsers.add_parser("top-bbox", parents=[common, top_n], help="8 - najveci bounding box-ovi")
+    subparsers.add_parser("top-terminal-bbox", parents=[common, top_n], help="9 - najveci terminal bounding box-ovi")
+    subparsers.add_parser("hpwl", parents=[common], help="10 - HPWL svih signala (txt)")
+    subparsers.add_parser("first-n", parents=[common, top_n], help="11 - prvih N signala")
+    deviation = subparsers.add_parser("deviation", parents=[common, top_n], help="12 - odstupanje ruta od HPWL (txt)")
+    deviation.add_argument("--print", action="store_true", help="ispisi i top N signala na konzolu")
+    subparsers.add_parser("bbox-overlap", parents=[common], help="13 - preklapanje bounding box-ova na segmentima")
+    movie = subparsers.add_parser("movie", parents=[common], help="14 - film zagusenja kroz iteracije (mp4/gif)")
+    movie.add_argument("--view", choices=("congestion", "segment-usage"), default="congestion",
+                       help="prikaz u filmu (default: congestion)")
+    movie.add_argument("--movie-format", choices=("mp4", "gif"), default="mp4",
+                       help="mp4 trazi ffmpeg, bez njega se cuva gif (default: mp4)")
+    movie.add_argument("--fps", type=int, default=5, help="frejmova u sekundi (default: 5)")
+    movie.add_argument("--dpi", type=int, default=100, help="rezolucija frejma (default: 100)")
+    movie.add_argument("--no-labels", action="store_true", help="bez brojeva uz zice/segmente (brze)")
+    pathfinder = subparsers.add_parser("pathfinder", parents=[common],
+                                       help="15 - PathFinder rutiranje signala iz rute -i (.route u -o)")
+    pathfinder.add_argument("--max-iterations", type=int, default=50, help="najvise iteracija (default: 50)")
+    pathfinder.add_argument("--pres-fac", type=float, default=0.5,
+                            help="pres_fac u drugoj iteraciji, prva ga ne koristi (default: 0.5)")
+    pathfinder.add_argument("--pres-fac-mult", type=float, default=1.3,
+                            help="mnozilac pres_fac po iteraciji (default: 1.3)")
+    pathfinder.add_argument("--hist-fac", type=float, default=1.0, help="tezina istorije zagusenja (default: 1.0)")
+    pathfinder.add_argument("--no-lookahead", action="store_true", help="Dijkstra umesto A* sa lookahead mapom")
+    pathfinder.add_argument("--lookahead-samples", type=int, default=None,
+                            help="broj SINK-ova za lookahead mapu (default: svi, procena nikad ne precenjuje)")
+    detour = subparsers.add_parser("detour", parents=[common, top_n],
+                                   help="16 - obilazak konekcija u odnosu na najkrace puteve u RRG-u (txt)")
+    detour.add_argument("--workers", type=int, default=None,
+                        help="broj procesa za BFS (default: broj jezgara)")
+    subparsers.add_parser("timing", parents=[common, top_n],
+                          help="17 - kasnjenje konekcija iz Tdel prekidaca, kriticne konekcije (txt)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command not in METRIC_COMMANDS:
+        # neinteraktivni nacin rada: sve slike idu u fajlove, nema prozora
+        import matplotlib
+        matplotlib.use("Agg")
+    runner = BatchRunner(args)
+    getattr(runner, args.command.replace("-", "_"))()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,180 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List
+
+import numpy as np
+
+from .models import RRG, as_packed
+from .ranking import top_k_indices
+
+# stanje procesa radnika: CSR iz deljene memorije i niz dubina za BFS (puni attach_worker)
+WORKER = {}
+
+
+# fan-out CSR RRG-a u blokovima deljene memorije; radnici ga mapiraju po imenu (attach_worker), pa se
+# graf ne kopira ni ne pickle-uje u svaki proces. Blokovi se oslobadjaju u close() (ili na kraju with bloka)
+class SharedCSR:
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray):
+        self.blocks = []
+        # (ime bloka, format za memoryview.cast, broj bajtova) za indptr i indices
+        self.spec = []
+        for column in (indptr, indices):
+            column = np.ascontiguousarray(column)
+            block = shared_memory.SharedMemory(create=True, size=max(column.nbytes, 1))
+            np.ndarray(column.shape, dtype=column.dtype, buffer=block.buf)[:] = column
+            self.blocks.append(block)
+            self.spec.append((block.name, column.dtype.char, column.nbytes))
+
+    def close(self) -> None:
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# initializer procesa radnika: memoryview nad deljenim blokovima daje Python int po elementu bez kopije
+def attach_worker(spec, num_nodes: int) -> None:
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in spec]
+    WORKER["blocks"] = blocks
+    WORKER["indptr"], WORKER["indices"] = [block.buf[:nbytes].cast(fmt)
+                                           for block, (_, fmt, nbytes) in zip(blocks, spec)]
+    WORKER["depth"] = array("i", [-1]) * num_nodes
+
+
+# BFS iz source-a dok se ne dostignu svi targets; vraca broj grana do svakog target-a (-1 ako nije dostizan,
+# kao i za indeks -1, tj. cvor kog nema u grafu). depth je niz -1 za ceo graf koji se posle pretrage
+# vraca u pocetno stanje (samo dotaknuti cvorovi)
+def min_hops(indptr, indices, depth, source: int, targets: List[int]) -> List[int]:
+    if source < 0:
+        return [-1] * len(targets)
+    wanted = {target for target in targets if target >= 0}
+    remaining = len(wanted)
+    depth[source] = 0
+    touched = [source]
+    frontier = [source]
+    level = 0
+    while frontier and remaining:
+        level += 1
+        next_frontier = []
+        for i in frontier:
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if depth[j] < 0:
+                    depth[j] = level
+                    touched.append(j)
+                    next_frontier.append(j)
+                    if j in wanted:
+                        remaining -= 1
+        frontier = next_frontier
+
+    result = [depth[target] if target >= 0 else -1 for target in targets]
+    for i in touched:
+        depth[i] = -1
+    return result
+
+
+# posao za radnika: lista (source, targets) -> lista rezultata min_hops
+def min_hops_batch(tasks):
+    return [min_hops(WORKER["indptr"], WORKER["indices"], WORKER["depth"], source, targets)
+            for source, targets in tasks]
+
+
+# tabela obilazaka: jedan red po konekciji (signal, SINK). routed_hops je dubina SINK-a u stablu rute,
+# min_hops najmanji broj grana od SOURCE-a do tog SINK-a u celom RRG-u, detour = routed_hops / min_hops.
+# Za razliku od HPWL odstupanja ne zavisi od rasporeda crteza (clb_size, clb_channel_gap)
+class DetourTable:
+    def __init__(self, net_numbers, net_names, source_ids, sink_ids, net_pin_index, routed_hops, min_hops):
+        self.net_numbers = net_numbers
+        # ime signala za svaki red
+        self.net_names: List[str] = net_names
+        self.source_ids = source_ids
+        self.sink_ids = sink_ids
+        self.net_pin_index = net_pin_index
+        self.routed_hops = routed_hops
+        self.min_hops = min_hops
+        # NaN ako SINK nije dostizan iz SOURCE-a (ruta ne odgovara grafu)
+        self.detour = np.where(min_hops > 0, routed_hops / np.maximum(min_hops, 1), np.nan)
+        self.extra_hops = np.where(min_hops >= 0, routed_hops - min_hops, -1)
+
+    def __len__(self):
+        return len(self.sink_ids)
+
+    def row(self, k: int) -> str:
+        return (f"Net {self.net_numbers[k]} ({self.net_names[k]}) SINK {self.sink_ids[k]} "
+                f"pin {self.net_pin_index[k]}: rutirano={self.routed_hops[k]}, najkrace={self.min_hops[k]}, "
+                f"visak={self.extra_hops[k]}, obilazak={self.detour[k]:.2f}")
+
+    def save(self, filename: str, n: int = 10) -> None:
+        valid = ~np.isnan(self.detour)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("ANALIZA OBILAZAKA RUTA U ODNOSU NA NAJKRACE PUTEVE U RRG-U\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(f"Ukupan broj konekcija: {len(self)}\n")
+            if valid.any():
+                f.write(f"Prosečan obilazak: {self.detour[valid].mean():.3f}\n")
+                f.write(f"Konekcija po najkracem putu: {np.count_nonzero(self.extra_hops[valid] == 0)}\n")
+                f.write(f"Ukupno visak grana: {self.extra_hops[valid].sum()}\n")
+            if not valid.all():
+                f.write(f"Nedostizni SINK-ovi: {np.count_nonzero(~valid)}\n")
+            f.write("-" * 80 + "\n\n")
+
+            f.write(f"TOP {n} KONEKCIJA PO OBILASKU:\n\n")
+            for i, k in enumerate(top_k_indices(np.where(valid, self.detour, -np.inf), n).tolist()):
+                f.write(f"{i + 1:2d}. {self.row(k)}\n")
+
+            f.write("\n" + "=" * 80 + "\n")
+            f.write("\nSVE KONEKCIJE:\n")
+            f.write("-" * 80 + "\n")
+            for k in range(len(self)):
+                f.write(self.row(k) + "\n")
+        print(f"Analiza obilazaka je sačuvana u fajl: {filename}")
+
+
+# tabela obilazaka za sve konekcije rute. BFS se radi jednom po SOURCE cvoru (za sve njegove SINK-ove);
+# sa workers > 1 SOURCE-ovi se dele procesima koji citaju CSR iz deljene memorije (SharedCSR)
+def detour_table(rrg: RRG, route, workers: int = None, chunksize: int = None) -> DetourTable:
+    rrg = rrg.arrays()
+    route = as_packed(route)
+
+    sinks = np.flatnonzero(route.sink_mask(rrg))
+    net_index = route.net_of_node()[sinks]
+    source_ids = route.node_ids[route.offsets[net_index]].astype(np.int64)
+    sink_ids = route.node_ids[sinks].astype(np.int64)
+    routed_hops = route.depths()[sinks]
+
+    # konekcije grupisane po SOURCE-u, sa gustim indeksima cvorova
+    sources, inverse = np.unique(rrg.index_of(source_ids), return_inverse=True)
+    targets = rrg.index_of(sink_ids)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(len(sources) + 1))
+    tasks = [(source, targets[order[bounds[s]:bounds[s + 1]]].tolist())
+             for s, source in enumerate(sources.tolist())]
+
+    workers = workers or os.cpu_count() or 1
+    num_nodes = len(rrg.node_ids)
+    if workers == 1 or len(tasks) < 2:
+        depth = array("i", [-1]) * num_nodes
+        indptr, indices = memoryview(rrg.fanout_indptr), memoryview(rrg.fanout_indices)
+        results = [min_hops(indptr, indices, depth, source, task_targets) for source, task_targets in tasks]
+    else:
+        chunksize = chunksize or max(1, len(tasks) // (workers * 4))
+        batches = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+        with SharedCSR(rrg.fanout_indptr, rrg.fanout_indices) as graph:
+            with ProcessPoolExecutor(max_workers=workers, initializer=attach_worker,
+                                     initargs=(graph.spec, num_nodes)) as executor:
+                results = [result for batch in executor.map(min_hops_batch, batches) for result in batch]
+
+    hops = np.empty(len(sinks), dtype=np.int64)
+    if results:
+        hops[order] = np.concatenate([np.asarray(result, dtype=np.int64) for result in results])
+
+    return DetourTable(route.net_numbers[net_index], [route.net_names[k] for k in net_index.tolist()],
+                       source_ids, sink_ids, route.net_pin_index[sinks], routed_hops, hops)
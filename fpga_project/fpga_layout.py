@@ -0,0 +1,320 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from .models import RRG
+
+
+# {id cvora: (x, y)} pogled nad node_x/node_y; cvorovi bez koordinate imaju NaN
+class CoordMap(Mapping):
+    def __init__(self, node_x: np.ndarray, node_y: np.ndarray):
+        self.node_x = node_x
+        self.node_y = node_y
+
+    def __getitem__(self, node_id):
+        if node_id not in self:
+            raise KeyError(node_id)
+        return float(self.node_x[node_id]), float(self.node_y[node_id])
+
+    def __setitem__(self, node_id, coord):
+        if not 0 <= node_id < len(self.node_x):
+            raise KeyError(node_id)
+        self.node_x[node_id], self.node_y[node_id] = coord
+
+    def __contains__(self, node_id) -> bool:
+        try:
+            return 0 <= node_id < len(self.node_x) and not np.isnan(self.node_x[node_id])
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(np.flatnonzero(~np.isnan(self.node_x)).tolist())
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self.node_x)))
+
+
+# raspored FPGA matrice u koordinatama crteza (velicine blokova, kanala i razmaci) i mapiranje
+# RR cvorova na te koordinate. Nema nikakvog crtanja, pa se koristi i za metrike bez matplotlib-a
+class FPGALayout:
+    def __init__(self):
+        self.clb_size = 0.5
+        self.io_size = 0.5
+        self.channel_spacing = 0.12
+        self.num_channels = 8
+        self.channel_width = self.num_channels * self.channel_spacing
+        self.clb_channel_gap = 1.25
+        self.io_clb_gap = 1.25
+        # kanal sa vise staza se ne siri preko ove sirine, nego se staze zgusnjavaju
+        self.max_channel_width = self.channel_width
+        # broj CLB redova i kolona; size_from_rrg ih postavlja iz <grid> sekcije rrg.xml
+        self.num_rows = 6
+        self.num_cols = 6
+
+    # velicina matrice i broj staza iz rrg.xml; <grid> ukljucuje IO prsten, pa je CLB deo za 2 manji.
+    # ako graf nema <grid>/<channels> (npr. napravljen rucno) ostaju trenutne vrednosti
+    def size_from_rrg(self, rrg: RRG):
+        grid_size = rrg.grid_size()
+        if grid_size is not None:
+            grid_width, grid_height = grid_size
+            self.num_cols = grid_width - 2
+            self.num_rows = grid_height - 2
+
+        if rrg.chan_width_max:
+            self.num_channels = rrg.chan_width_max
+            if self.num_channels * self.channel_spacing > self.max_channel_width:
+                self.channel_spacing = self.max_channel_width / self.num_channels
+            self.channel_width = self.num_channels * self.channel_spacing
+
+    # vizuelne koordinate svih cvorova odjednom (NumPy); rezultat je u node_x/node_y (indeks = id cvora)
+    # i u coord_map koji se ponasa kao ranije {id: (x, y)}. Daje iste brojeve kao calculate_node_position
+    # sa starim fallback-om za cvorove van opsega
+    def map_rrg_to_grid(self, rrg: RRG, num_rows=None, num_cols=None):
+        self.size_from_rrg(rrg)
+        if num_rows is not None:
+            self.num_rows = num_rows
+        if num_cols is not None:
+            self.num_cols = num_cols
+        num_rows, num_cols = self.num_rows, self.num_cols
+
+        arrays = rrg.arrays()
+        size = int(arrays.ids.max()) + 1 if len(arrays.ids) else 0
+
+        start_clb_x = self.io_size + self.io_clb_gap
+        start_clb_y = self.io_size + self.io_clb_gap
+
+        cell_w = self.clb_size + self.clb_channel_gap
+        cell_h = self.clb_size + self.clb_channel_gap
+
+        # unutrašnji offset kanala (isti koji koristiš u draw_fpga_grid)
+        channel_x_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
+        channel_y_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
+
+        # kanali izmedju IO i CLB (isto kao calculate_io_clb_channel_position)
+        io_low = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
+        y_io_top = start_clb_y + num_rows * cell_h
+        io_top = y_io_top - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
+        x_io_right = start_clb_x + num_cols * cell_w
+        io_right = x_io_right - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
+
+        xlow, ylow = arrays.xlow, arrays.ylow
+        col_x = start_clb_x + (xlow - 1) * cell_w
+        row_y = start_clb_y + (ylow - 1) * cell_h
+        track_offset = arrays.ptc * self.channel_spacing
+
+        # svi ostali cvorovi (SOURCE, SINK, OPIN, IPIN) idu na centar bloka
+        visual_x = col_x + self.clb_size / 2
+        visual_y = row_y + self.clb_size / 2
+
+        # horizontalni kanali; van opsega redova ostaje centar bloka po x (stari fallback)
+        chanx = arrays.types == arrays.type_code("CHANX")
+        channel_y = row_y + self.clb_size + channel_y_inner_offset
+        inner = chanx & (ylow >= 1) & (ylow < num_rows)
+        visual_x = np.where(inner, col_x, visual_x)
+        visual_y = np.where(chanx, np.select([ylow == 0, ylow == num_rows], [io_low, io_top], channel_y)
+                            + track_offset, visual_y)
+        visual_x = np.where(chanx & ((ylow == 0) | (ylow == num_rows)), col_x, visual_x)
+
+        # vertikalni kanali
+        chany = arrays.types == arrays.type_code("CHANY")
+        channel_x = col_x + self.clb_size + channel_x_inner_offset
+        inner = chany & (xlow >= 1) & (xlow < num_cols)
+        visual_y = np.where(inner, row_y, visual_y)
+        visual_x = np.where(chany, np.select([xlow == 0, xlow == num_cols], [io_low, io_right], channel_x)
+                            + track_offset, visual_x)
+        visual_y = np.where(chany & ((xlow == 0) | (xlow == num_cols)), row_y, visual_y)
+
+        self.node_x = np.full(size, np.nan)
+        self.node_y = np.full(size, np.nan)
+        self.node_x[arrays.ids] = visual_x
+        self.node_y[arrays.ids] = visual_y
+        self.coord_map = CoordMap(self.node_x, self.node_y)
+
+    # segmenti kanala: CHANX/CHANY zice grupisane po koordinati iz get_segment_coord (bez ptc offseta),
+    # za sve zice odjednom. Vraca (segment_x, segment_y, first_wire, wire_ids, wire_segment): segment i je
+    # na (segment_x[i], segment_y[i]) i first_wire[i] mu je najmanja zica, a zica wire_ids[j] pripada
+    # segmentu wire_segment[j]. Segmenti su poredjani po prvoj zici, kao ranije grupisanje po rrg.nodes
+    def segment_coords(self, rrg: RRG):
+        arrays = rrg.arrays()
+        num_rows, num_cols = self.num_rows, self.num_cols
+
+        start_clb_x = self.io_size + self.io_clb_gap
+        start_clb_y = self.io_size + self.io_clb_gap
+        cell_w = self.clb_size + self.clb_channel_gap
+        cell_h = self.clb_size + self.clb_channel_gap
+        channel_x_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
+        channel_y_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
+
+        io_low = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
+        y_io_top = start_clb_y + num_rows * cell_h
+        io_top = y_io_top - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
+        x_io_right = start_clb_x + num_cols * cell_w
+        io_right = x_io_right - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
+
+        chanx = arrays.types == arrays.type_code("CHANX")
+        wires = chanx | (arrays.types == arrays.type_code("CHANY"))
+        wire_ids = arrays.ids[wires]
+        is_chanx = chanx[wires]
+        xlow, ylow = arrays.xlow[wires], arrays.ylow[wires]
+        col_x = start_clb_x + (xlow - 1) * cell_w
+        row_y = start_clb_y + (ylow - 1) * cell_h
+
+        io_row = (ylow == 0) | (ylow == num_rows)
+        io_col = (xlow == 0) | (xlow == num_cols)
+        segment_x = np.where(is_chanx, np.where(io_row, col_x, col_x + self.clb_size / 2),
+                             np.select([xlow == 0, xlow == num_cols], [io_low, io_right],
+                                       col_x + self.clb_size + channel_x_inner_offset))
+        segment_y = np.where(is_chanx,
+                             np.select([ylow == 0, ylow == num_rows], [io_low, io_top],
+                                       row_y + self.clb_size + channel_y_inner_offset),
+                             np.where(io_col, row_y, row_y + self.clb_size / 2))
+
+        if len(wire_ids) == 0:
+            empty = np.empty(0)
+            return empty, empty, wire_ids, wire_ids, np.empty(0, dtype=np.int64)
+
+        _, first, inverse = np.unique(np.stack([segment_x, segment_y], axis=1), axis=0,
+                                      return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        first = first[order]
+        return segment_x[first], segment_y[first], wire_ids[first], wire_ids, rank[inverse.ravel()]
+
+    def calculate_node_position(self, node, start_clb_x, start_clb_y):
+        if node.type in ['SOURCE', 'SINK', 'OPIN', 'IPIN']:
+            if 1 <= node.xlow <= self.num_cols and 1 <= node.ylow <= self.num_rows:
+                visual_x = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
+                visual_y = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
+
+                # na centar bloka
+                visual_x += self.clb_size / 2
+                visual_y += self.clb_size / 2
+
+                return visual_x, visual_y
+
+        elif node.type in ['CHANX', 'CHANY']:
+            return self.calculate_channel_position(node, start_clb_x, start_clb_y)
+
+        return None, None
+
+    def calculate_channel_position(self, node, start_clb_x, start_clb_y):
+        # moramo proveriti da li su ovo kanali izmedju clb blokova
+        if (node.type == 'CHANX' and (node.ylow == 0 or node.ylow == self.num_rows)) or \
+                (node.type == 'CHANY' and (node.xlow == 0 or node.xlow == self.num_cols)):
+            return self.calculate_io_clb_channel_position(node, start_clb_x, start_clb_y)
+
+        # horizontalni kanali
+        if node.type == 'CHANX':
+            if 1 <= node.ylow < self.num_rows:
+                y_pos = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap) + self.clb_size
+                y_pos += (self.clb_channel_gap / 2) - (self.channel_width / 2)
+
+                x_pos = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
+
+
+                track_offset = node.ptc * self.channel_spacing
+                return x_pos, y_pos + track_offset
+
+        # vertikalni kanali
+        elif node.type == 'CHANY':
+            if 1 <= node.xlow < self.num_cols:
+                x_pos = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap) + self.clb_size
+                x_pos += (self.clb_channel_gap / 2) - (self.channel_width / 2)
+
+                y_pos = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
+
+                track_offset = node.ptc * self.channel_spacing
+                return x_pos + track_offset, y_pos
+
+        return None, None
+
+    def calculate_io_clb_channel_position(self, node, start_clb_x, start_clb_y):
+        # horizontani kanali
+        if node.type == 'CHANX':
+            # gornji
+            if node.ylow == 0:
+                y_pos = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
+                x_base = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
+
+                track_offset = node.ptc * self.channel_spacing
+                return x_base, y_pos + track_offset
+            # donji
+            elif node.ylow == self.num_rows:
+                y_io_top = start_clb_y + self.num_rows * (self.clb_size + self.clb_channel_gap)
+                y_pos = y_io_top - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
+                x_base = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
+
+                track_offset = node.ptc * self.channel_spacing
+                return x_base, y_pos + track_offset
+
+        # vertikalni kanali
+        elif node.type == 'CHANY':
+            # levi
+            if node.xlow == 0:
+                x_pos = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
+                y_base = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
+
+                track_offset = node.ptc * self.channel_spacing
+                return x_pos + track_offset, y_base
+
+            # desni
+            elif node.xlow == self.num_cols:
+                x_io_right = start_clb_x + self.num_cols * (self.clb_size + self.clb_channel_gap)
+                x_pos = x_io_right - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
+                y_base = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
+
+                track_offset = node.ptc * self.channel_spacing
+                return x_pos + track_offset, y_base
+
+        return None, None
+
+    def get_segment_coord(self, node):
+        num_rows = self.num_rows
+        num_cols = self.num_cols
+        start_clb_x = self.io_size + self.io_clb_gap
+        start_clb_y = self.io_size + self.io_clb_gap
+        cell_w = self.clb_size + self.clb_channel_gap
+        cell_h = self.clb_size + self.clb_channel_gap
+        channel_x_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
+        channel_y_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
+
+        if node.type == 'CHANX':
+            if node.ylow == 0 or node.ylow == num_rows:
+                # IO<->CLB horizontalni kanali
+                # koristi koordinate bez ptc offseta!
+                if node.ylow == 0:
+                    y_pos = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
+                    x_base = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
+                    return (x_base, y_pos)
+                elif node.ylow == num_rows:
+                    y_io_top = start_clb_y + num_rows * (self.clb_size + self.clb_channel_gap)
+                    y_pos = y_io_top - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
+                    x_base = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
+                    return (x_base, y_pos)
+                return None
+            x_base = start_clb_x + (node.xlow - 1) * cell_w
+            y_channel = start_clb_y + (node.ylow - 1) * cell_h + self.clb_size + channel_y_inner_offset
+            visual_x = x_base + self.clb_size / 2
+            visual_y = y_channel
+            return (visual_x, visual_y)
+        elif node.type == 'CHANY':
+            if node.xlow == 0 or node.xlow == num_cols:
+                # IO<->CLB vertikalni kanali
+                # koristi koordinate bez ptc offseta!
+                if node.xlow == 0:
+                    x_pos = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
+                    y_base = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
+                    return (x_pos, y_base)
+                elif node.xlow == num_cols:
+                    x_io_right = start_clb_x + num_cols * (self.clb_size + self.clb_channel_gap)
+                    x_pos = x_io_right - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
+                    y_base = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
+                    return (x_pos, y_base)
+                return None
+            x_channel = start_clb_x + (node.xlow - 1) * cell_w + self.clb_size + channel_x_inner_offset
+            y_base = start_clb_y + (node.ylow - 1) * cell_h
+            visual_x = x_channel
+            visual_y = y_base + self.clb_size / 2
+            return (visual_x, visual_y)
+        return None
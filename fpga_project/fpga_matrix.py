@@ -1,12 +1,18 @@
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.lines import Line2D
-from .models import RRG
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.textpath import TextPath
+from .fpga_layout import FPGALayout
 
 
-class FPGAMatrix:
+class FPGAMatrix(FPGALayout):
     def __init__(self):
-        self.fig, self.ax = plt.subplots(figsize=(14, 12))
+        super().__init__()
+        # figura se pravi tek kad nesto zaista crta (vidi ax/fig)
+        self._fig = None
+        self._ax = None
         self.routing_path = []
         self.colors = {
             'CLB': 'linen',
@@ -16,25 +22,29 @@ class FPGAMatrix:
             'SINK': 'lightgreen'
         }
 
-        self.clb_size = 0.5
-        self.io_size = 0.5
-        self.channel_spacing = 0.12
-        self.num_channels = 8
-        self.channel_width = self.num_channels * self.channel_spacing
-        self.clb_channel_gap = 1.25
-        self.io_clb_gap = 1.25
+    @property
+    def ax(self):
+        if self._ax is None:
+            self._fig, self._ax = plt.subplots(figsize=(14, 12))
+        return self._ax
 
-    def visualize_matrix(self, rrg, num_rows=6, num_cols=6):
-        self.num_rows = num_rows
-        self.num_cols = num_cols
-
-        self.draw_fpga_grid(num_rows, num_cols)
+    @property
+    def fig(self):
+        if self._fig is None:
+            self.ax
+        return self._fig
 
+    def visualize_matrix(self, rrg, num_rows=None, num_cols=None):
+        # velicina se uzima iz rrg.xml, osim ako nije eksplicitno zadata
         self.map_rrg_to_grid(rrg, num_rows, num_cols)
 
+        self.draw_fpga_grid(self.num_rows, self.num_cols)
+
         self.draw_detailed_legend()
 
-    def draw_fpga_grid(self, num_rows=6, num_cols=6):
+    def draw_fpga_grid(self, num_rows=None, num_cols=None):
+        num_rows = self.num_rows if num_rows is None else num_rows
+        num_cols = self.num_cols if num_cols is None else num_cols
         self.ax.clear()
 
         # racunanje velicine za dobro skaliranje
@@ -51,264 +61,137 @@ class FPGAMatrix:
         start_clb_x = self.io_size + self.io_clb_gap
         start_clb_y = self.io_size + self.io_clb_gap
 
-        # crtamo CLB blokove
+        # blokovi i kanali se prvo skupljaju, pa crtaju kao po jedna kolekcija
+        # (umesto Rectangle/Line2D artista za svaki blok i svaku zicu)
+        blocks = []
+        tracks = []
+
+        # CLB blokovi
         for row in range(num_rows):
             for col in range(num_cols):
                 # pozicija CLB bloka
                 x_clb = start_clb_x + col * (self.clb_size + self.clb_channel_gap)
                 y_clb = start_clb_y + row * (self.clb_size + self.clb_channel_gap)
-
-                # crtamo CLB blok
-                clb = patches.Rectangle((x_clb, y_clb), self.clb_size, self.clb_size,
-                                        color=self.colors['CLB'])
-                self.ax.add_patch(clb)
-                self.ax.text(x_clb + self.clb_size / 2, y_clb + self.clb_size / 2, 'CLB',
-                             ha='center', va='center', color='black', fontweight='bold')
+                blocks.append((x_clb, y_clb, 'CLB'))
 
                 # vertikalni kanali desno od CLB bloka
                 if col < num_cols - 1:
                     channel_x = x_clb + self.clb_size + (self.clb_channel_gap / 2) - (self.channel_width / 2)
-                    self.draw_channels(channel_x, y_clb, self.clb_size, is_horizontal=False)
+                    tracks.append(self.channel_segments(channel_x, y_clb, self.clb_size, is_horizontal=False))
 
                 # horizontalni kanali iznad CLB bloka
                 if row < num_rows - 1:
                     channel_y = y_clb + self.clb_size + (self.clb_channel_gap / 2) - (self.channel_width / 2)
-                    self.draw_channels(x_clb, channel_y, self.clb_size, is_horizontal=True)
-
-        self.draw_io_blocks(num_rows, num_cols, start_clb_x, start_clb_y)
+                    tracks.append(self.channel_segments(x_clb, channel_y, self.clb_size, is_horizontal=True))
 
+        blocks.extend(self.io_blocks(num_rows, num_cols, start_clb_x, start_clb_y))
+        tracks.extend(self.io_clb_channels(num_rows, num_cols, start_clb_x, start_clb_y))
 
-        self.draw_io_clb_channels(num_rows, num_cols, start_clb_x, start_clb_y)
+        self.draw_blocks(blocks)
+        self.draw_tracks(tracks)
 
-    def draw_io_blocks(self, num_rows, num_cols, start_clb_x, start_clb_y):
+    # pozicije IO blokova: (x, y, 'IO')
+    def io_blocks(self, num_rows, num_cols, start_clb_x, start_clb_y):
+        blocks = []
         for col in range(num_cols):
-            # donji IO
             x_io = start_clb_x + col * (self.clb_size + self.clb_channel_gap)
-            y_io = 0
-            io = patches.Rectangle((x_io, y_io), self.clb_size, self.clb_size,
-                                   color=self.colors['IO'])
-            self.ax.add_patch(io)
-            self.ax.text(x_io + self.clb_size / 2, y_io + self.clb_size / 2, 'IO',
-                         ha='center', va='center', color='black', fontweight='bold')
-
+            # donji IO
+            blocks.append((x_io, 0, 'IO'))
             # gornji IO
             y_io_top = start_clb_y + num_rows * (self.clb_size + self.clb_channel_gap)
-            io_top = patches.Rectangle((x_io, y_io_top), self.clb_size, self.clb_size,
-                                       color=self.colors['IO'])
-            self.ax.add_patch(io_top)
-            self.ax.text(x_io + self.clb_size / 2, y_io_top + self.clb_size / 2, 'IO',
-                         ha='center', va='center', color='black', fontweight='bold')
+            blocks.append((x_io, y_io_top, 'IO'))
 
         for row in range(num_rows):
-            # levi IO
-            x_io_left = 0
             y_io_left = start_clb_y + row * (self.clb_size + self.clb_channel_gap)
-            io_left = patches.Rectangle((x_io_left, y_io_left), self.clb_size, self.clb_size,
-                                        color=self.colors['IO'])
-            self.ax.add_patch(io_left)
-            self.ax.text(x_io_left + self.clb_size / 2, y_io_left + self.clb_size / 2, 'IO',
-                         ha='center', va='center', color='black', fontweight='bold')
-
+            # levi IO
+            blocks.append((0, y_io_left, 'IO'))
             # desni IO
             x_io_right = start_clb_x + num_cols * (self.clb_size + self.clb_channel_gap)
-            io_right = patches.Rectangle((x_io_right, y_io_left), self.clb_size, self.clb_size,
-                                         color=self.colors['IO'])
-            self.ax.add_patch(io_right)
-            self.ax.text(x_io_right + self.clb_size / 2, y_io_left + self.clb_size / 2, 'IO',
-                         ha='center', va='center', color='black', fontweight='bold')
+            blocks.append((x_io_right, y_io_left, 'IO'))
+        return blocks
 
-    def draw_io_clb_channels(self, num_rows, num_cols, start_clb_x, start_clb_y):
+    # segmenti zica kanala izmedju IO i CLB blokova
+    def io_clb_channels(self, num_rows, num_cols, start_clb_x, start_clb_y):
+        tracks = []
         # donji io i clb kanali
         for col in range(num_cols):
             x_io_bottom = start_clb_x + col * (self.clb_size + self.clb_channel_gap)
             channel_y = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
-            self.draw_channels(x_io_bottom, channel_y, self.io_size, is_horizontal=True)
+            tracks.append(self.channel_segments(x_io_bottom, channel_y, self.io_size, is_horizontal=True))
 
         # gornji io i clb kanali
         for col in range(num_cols):
             x_io_top = start_clb_x + col * (self.clb_size + self.clb_channel_gap)
             y_io_top = start_clb_y + num_rows * (self.clb_size + self.clb_channel_gap)
             channel_y = y_io_top - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
-            self.draw_channels(x_io_top, channel_y, self.io_size, is_horizontal=True)
+            tracks.append(self.channel_segments(x_io_top, channel_y, self.io_size, is_horizontal=True))
 
         # levi io i clb kanali
         for row in range(num_rows):
             y_io_left = start_clb_y + row * (self.clb_size + self.clb_channel_gap)
             channel_x = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
-            self.draw_channels(channel_x, y_io_left, self.io_size, is_horizontal=False)
+            tracks.append(self.channel_segments(channel_x, y_io_left, self.io_size, is_horizontal=False))
 
         # desni io i clb kanali
         for row in range(num_rows):
             y_io_right = start_clb_y + row * (self.clb_size + self.clb_channel_gap)
             x_io_right = start_clb_x + num_cols * (self.clb_size + self.clb_channel_gap)
             channel_x = x_io_right - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
-            self.draw_channels(channel_x, y_io_right, self.io_size, is_horizontal=False)
+            tracks.append(self.channel_segments(channel_x, y_io_right, self.io_size, is_horizontal=False))
+        return tracks
 
-    # vise kanala
-    def draw_channels(self, x, y, length, is_horizontal):
+    # segmenti svih zica jednog kanala, oblik (num_channels, 2, 2)
+    def channel_segments(self, x, y, length, is_horizontal):
+        offsets = np.arange(self.num_channels) * self.channel_spacing
+        segments = np.empty((self.num_channels, 2, 2))
         if is_horizontal:
-            for i in range(self.num_channels):
-                line = Line2D([x, x + length],
-                              [y + i * self.channel_spacing, y + i * self.channel_spacing],
-                              color='gray', linewidth=1, alpha=0.7)
-                self.ax.add_line(line)
+            segments[:, 0, 0] = x
+            segments[:, 1, 0] = x + length
+            segments[:, 0, 1] = segments[:, 1, 1] = y + offsets
         else:
-            for i in range(self.num_channels):
-                line = Line2D([x + i * self.channel_spacing, x + i * self.channel_spacing],
-                              [y, y + length],
-                              color='gray', linewidth=1, alpha=0.7)
-                self.ax.add_line(line)
-
-    # popravljeno, radi za sada
-    def map_rrg_to_grid(self, rrg: RRG, num_rows=6, num_cols=6):
-        self.coord_map = {}
-        self.num_rows = num_rows
-        self.num_cols = num_cols
-
-        start_clb_x = self.io_size + self.io_clb_gap
-        start_clb_y = self.io_size + self.io_clb_gap
-
-        cell_w = self.clb_size + self.clb_channel_gap
-        cell_h = self.clb_size + self.clb_channel_gap
+            segments[:, 0, 0] = segments[:, 1, 0] = x + offsets
+            segments[:, 0, 1] = y
+            segments[:, 1, 1] = y + length
+        return segments
+
+    # blocks: lista (x, y, tip) gde je tip 'CLB' ili 'IO'
+    def draw_blocks(self, blocks):
+        if not blocks:
+            return
+        rectangles = [patches.Rectangle((x, y), self.clb_size, self.clb_size) for x, y, _ in blocks]
+        colors = [self.colors[kind] for _, _, kind in blocks]
+        self.ax.add_collection(PatchCollection(rectangles, facecolors=colors, edgecolors=colors, linewidths=1.0,
+                                               joinstyle='miter'),
+                               autolim=False)
+        # Text artist po bloku je najskuplji deo matrice; na velikoj matrici se natpisi ionako preklapaju,
+        # pa se crtaju samo dok staju u razmak izmedju susednih blokova
+        if self.block_labels_fit():
+            for x, y, kind in blocks:
+                self.ax.text(x + self.clb_size / 2, y + self.clb_size / 2, kind,
+                             ha='center', va='center', color='black', fontweight='bold')
 
-        # unutrašnji offset kanala (isti koji koristiš u draw_fpga_grid)
-        channel_x_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
-        channel_y_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
-
-        for node in rrg.nodes.values():
-            try:
-                vx, vy = self.calculate_node_position(node, start_clb_x, start_clb_y)
-            except Exception:
-                vx = vy = None
-
-            if vx is not None and vy is not None:
-                self.coord_map[node.id] = (vx, vy)
-                continue
-
-            # fallback — eksplicitna mapiranja koja repliciraju draw_* logiku
-            if node.type not in ['CHANX', 'CHANY']:
-                # (RRG xlow/ylow su 1-based za CLB polja — zato -1)
-                visual_x = start_clb_x + (node.xlow - 1) * cell_w + self.clb_size / 2
-                visual_y = start_clb_y + (node.ylow - 1) * cell_h + self.clb_size / 2
-
-            elif node.type == 'CHANX':
-                if node.ylow == 0 or node.ylow == self.num_rows:
-                    coord = self.calculate_io_clb_channel_position(node, start_clb_x, start_clb_y)
-                    if coord is not None:
-                        self.coord_map[node.id] = coord
-                    continue
-
-                # horizontalni kanal između redova CLB
-                x_base = start_clb_x + (node.xlow - 1) * cell_w
-                y_channel = start_clb_y + (node.ylow - 1) * cell_h + self.clb_size + channel_y_inner_offset
-                visual_x = x_base + self.clb_size / 2
-                visual_y = y_channel + node.ptc * self.channel_spacing
-
-            elif node.type == 'CHANY':
-                if node.xlow == 0 or node.xlow == self.num_cols:
-                    coord = self.calculate_io_clb_channel_position(node, start_clb_x, start_clb_y)
-                    if coord is not None:
-                        self.coord_map[node.id] = coord
-                    continue
-
-                # vertikalni kanal između kolona CLB
-                x_channel = start_clb_x + (node.xlow - 1) * cell_w + self.clb_size + channel_x_inner_offset
-                y_base = start_clb_y + (node.ylow - 1) * cell_h
-                visual_x = x_channel + node.ptc * self.channel_spacing
-                visual_y = y_base + self.clb_size / 2
-
-            else:
-                continue
-
-            self.coord_map[node.id] = (visual_x, visual_y)
-
-    def calculate_node_position(self, node, start_clb_x, start_clb_y):
-        if node.type in ['SOURCE', 'SINK', 'OPIN', 'IPIN']:
-            if 1 <= node.xlow <= self.num_cols and 1 <= node.ylow <= self.num_rows:
-                visual_x = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
-                visual_y = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
-
-                # na centar bloka
-                visual_x += self.clb_size / 2
-                visual_y += self.clb_size / 2
-
-                return visual_x, visual_y
-
-        elif node.type in ['CHANX', 'CHANY']:
-            return self.calculate_channel_position(node, start_clb_x, start_clb_y)
-
-        return None, None
-
-    def calculate_channel_position(self, node, start_clb_x, start_clb_y):
-        # moramo proveriti da li su ovo kanali izmedju clb blokova
-        if (node.type == 'CHANX' and (node.ylow == 0 or node.ylow == self.num_rows)) or \
-                (node.type == 'CHANY' and (node.xlow == 0 or node.xlow == self.num_cols)):
-            return self.calculate_io_clb_channel_position(node, start_clb_x, start_clb_y)
-
-        # horizontalni kanali
-        if node.type == 'CHANX':
-            if 1 <= node.ylow < self.num_rows:
-                y_pos = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap) + self.clb_size
-                y_pos += (self.clb_channel_gap / 2) - (self.channel_width / 2)
-
-                x_pos = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
-
-
-                track_offset = node.ptc * self.channel_spacing
-                return x_pos, y_pos + track_offset
-
-        # vertikalni kanali
-        elif node.type == 'CHANY':
-            if 1 <= node.xlow < self.num_cols:
-                x_pos = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap) + self.clb_size
-                x_pos += (self.clb_channel_gap / 2) - (self.channel_width / 2)
-
-                y_pos = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
-
-                track_offset = node.ptc * self.channel_spacing
-                return x_pos + track_offset, y_pos
-
-        return None, None
-
-    def calculate_io_clb_channel_position(self, node, start_clb_x, start_clb_y):
-        # horizontani kanali
-        if node.type == 'CHANX':
-            # gornji
-            if node.ylow == 0:
-                y_pos = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
-                x_base = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
-
-                track_offset = node.ptc * self.channel_spacing
-                return x_base, y_pos + track_offset
-            # donji
-            elif node.ylow == self.num_rows:
-                y_io_top = start_clb_y + self.num_rows * (self.clb_size + self.clb_channel_gap)
-                y_pos = y_io_top - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
-                x_base = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
-
-                track_offset = node.ptc * self.channel_spacing
-                return x_base, y_pos + track_offset
-
-        # vertikalni kanali
-        elif node.type == 'CHANY':
-            # levi
-            if node.xlow == 0:
-                x_pos = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
-                y_base = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
-
-                track_offset = node.ptc * self.channel_spacing
-                return x_pos + track_offset, y_base
-
-            # desni
-            elif node.xlow == self.num_cols:
-                x_io_right = start_clb_x + self.num_cols * (self.clb_size + self.clb_channel_gap)
-                x_pos = x_io_right - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
-                y_base = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
-
-                track_offset = node.ptc * self.channel_spacing
-                return x_pos + track_offset, y_base
+    # da li je natpis "CLB" (podrazumevani font, bold) uzi od razmaka izmedju blokova na trenutnoj osi;
+    # razmera tacke po jedinici je kao kod set_aspect('equal'): manja od dve ose
+    def block_labels_fit(self) -> bool:
+        position = self.ax.get_position()
+        x_low, x_high = self.ax.get_xlim()
+        y_low, y_high = self.ax.get_ylim()
+        points_per_unit = min(position.width * self.fig.get_figwidth() * 72 / (x_high - x_low),
+                              position.height * self.fig.get_figheight() * 72 / (y_high - y_low))
+        label = TextPath((0, 0), 'CLB', size=plt.rcParams['font.size'], prop=FontProperties(weight='bold'))
+        return label.get_extents().width <= (self.clb_size + self.clb_channel_gap) * points_per_unit
+
+    # tracks: lista nizova segmenata iz channel_segments
+    def draw_tracks(self, tracks):
+        if not tracks:
+            return
+        self.ax.add_collection(LineCollection(np.concatenate(tracks), colors='gray', linewidths=1, alpha=0.7,
+                                              capstyle='projecting', zorder=2),
+                               autolim=False)
 
-        return None, None
+    # vise kanala
+    def draw_channels(self, x, y, length, is_horizontal):
+        self.draw_tracks([self.channel_segments(x, y, length, is_horizontal)])
 
     def draw_detailed_legend(self):
         legend_elements = []
@@ -0,0 +1,493 @@
+import math
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+from .fpga_layout import FPGALayout
+from .models import RRG, as_packed
+from .occupancy import WireOccupancy
+from .ranking import top_k, top_k_indices
+
+
+# izracunate metrike po ruti i RRG-u (Route/PackedRoute -> RRG -> {kljuc: rezultat}); oba nivoa su slabe
+# reference, pa kes nestaje zajedno sa rutom ili grafom i id nekog obrisanog objekta se ne moze pomesati
+# sa novim. Npr. top 10 pa top 50 bounding box-ova ili ispis pa snimanje odstupanja ne racunaju nista ponovo.
+# Kes ne prati izmene: ruta i RRG se posle ucitavanja ne menjaju (parseri prave nove objekte za svaku
+# iteraciju); ko menja rutu na mestu mora da pozove forget_route_metrics(route)
+ROUTE_METRICS = WeakKeyDictionary()
+
+
+# brise kesirane metrike rute (posle izmene rute na mestu)
+def forget_route_metrics(route) -> None:
+    ROUTE_METRICS.pop(route, None)
+
+
+# metrike nad rutom (HPWL, odstupanje, bounding box) bez ikakvog crtanja; treba samo coord_map
+# iz map_rrg_to_grid, pa se moze koristiti i bez matplotlib-a
+class FPGAMetrics(FPGALayout):
+    def __init__(self):
+        super().__init__()
+
+    # vraca kesiran rezultat compute() za ovu rutu i RRG; kljuc ukljucuje raspored jer od njega zavise koordinate
+    def route_metric(self, rrg: RRG, route, name, compute):
+        cache = ROUTE_METRICS.setdefault(route, WeakKeyDictionary()).setdefault(rrg, {})
+        key = (name, self.num_rows, self.num_cols, self.channel_spacing, self.clb_size,
+               self.clb_channel_gap, self.io_size, self.io_clb_gap)
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+
+    # HPWL svih signala odjednom nad ravnim nizovima rute (PackedRoute): min/max koordinata po signalu
+    # preko np.minimum/maximum.reduceat. Vraca (redni brojevi signala, HPWL u koordinatama crteza,
+    # HPWL u RR jedinicama matrice); signal bez validnih koordinata ima NaN
+    def calculate_hpwl(self, rrg: RRG, route):
+        route = as_packed(route)
+        node_ids = route.node_ids.astype(np.int64)
+
+        mapped = (node_ids >= 0) & (node_ids < len(self.node_x))
+        safe_ids = np.where(mapped, node_ids, 0)
+        xs = np.where(mapped, self.node_x[safe_ids], np.nan)
+        ys = np.where(mapped, self.node_y[safe_ids], np.nan)
+        x_low, x_high = self.reduce_per_net(route, xs, xs)
+        y_low, y_high = self.reduce_per_net(route, ys, ys)
+        hpwl = (x_high - x_low) + (y_high - y_low)
+
+        # zica zauzima xlow..xhigh / ylow..yhigh, pa granice idu po tim kolonama
+        arrays = rrg.arrays()
+        index = arrays.index_of(node_ids)
+        known = index >= 0
+        safe_index = np.where(known, index, 0)
+        grid_x_low, grid_x_high = self.reduce_per_net(
+            route, np.where(known, arrays.xlow[safe_index], np.nan), np.where(known, arrays.xhigh[safe_index], np.nan))
+        grid_y_low, grid_y_high = self.reduce_per_net(
+            route, np.where(known, arrays.ylow[safe_index], np.nan), np.where(known, arrays.yhigh[safe_index], np.nan))
+        hpwl_grid = (grid_x_high - grid_x_low) + (grid_y_high - grid_y_low)
+
+        for node_id in np.unique(node_ids[np.isnan(xs)]).tolist():
+            print(f"Nije moguce dobiti koordinatu za cvor {node_id}")
+
+        return route.net_numbers, hpwl, hpwl_grid
+
+    # najmanja vrednost `low_values` i najveca `high_values` za svaki signal (nizovi poravnati sa
+    # route.node_ids); NaN se preskace, a signal bez ijedne vrednosti (i prazan signal) dobija NaN
+    @staticmethod
+    def reduce_per_net(route, low_values, high_values):
+        num_nets = len(route.net_numbers)
+        low = np.full(num_nets, np.nan)
+        high = np.full(num_nets, np.nan)
+
+        # reduceat ne podrzava prazne segmente, zato se racuna samo za neprazne signale
+        nonempty = np.flatnonzero(np.diff(route.offsets))
+        if len(nonempty):
+            starts = route.offsets[nonempty]
+            low[nonempty] = np.minimum.reduceat(np.where(np.isnan(low_values), np.inf, low_values), starts)
+            high[nonempty] = np.maximum.reduceat(np.where(np.isnan(high_values), -np.inf, high_values), starts)
+
+        missing = np.isinf(low)
+        low[missing] = np.nan
+        high[missing] = np.nan
+        return low, high
+
+    # terminal bounding box (SOURCE/SINK cvorovi) svih signala odjednom, u koordinatama crteza.
+    # Vraca (redni brojevi signala, min_x, max_x, min_y, max_y); signal bez terminala ima NaN
+    def terminal_bounding_boxes(self, rrg: RRG, route):
+        route = as_packed(route)
+        node_ids = route.node_ids.astype(np.int64)
+
+        arrays = rrg.arrays()
+        index = arrays.index_of(node_ids)
+        known = index >= 0
+        terminal_codes = [arrays.type_code("SOURCE"), arrays.type_code("SINK")]
+        terminal = known & np.isin(arrays.types[np.where(known, index, 0)], terminal_codes)
+        terminal &= node_ids < len(self.node_x)
+
+        safe_ids = np.where(terminal, node_ids, 0)
+        xs = np.where(terminal, self.node_x[safe_ids], np.nan)
+        ys = np.where(terminal, self.node_y[safe_ids], np.nan)
+        min_x, max_x = self.reduce_per_net(route, xs, xs)
+        min_y, max_y = self.reduce_per_net(route, ys, ys)
+        return route.net_numbers, min_x, max_x, min_y, max_y
+
+    # bounding box-ovi svih signala sa povrsinom u celijama, isto kao calculate_bounding_box_area
+    # (terminal=False, svi cvorovi rute) odnosno calculate_terminal_bounding_box_area (terminal=True).
+    # Vraca dict nizova: net_numbers, min_x, max_x, min_y, max_y (NaN za prazne) i area_cells_ceil
+    def bounding_box_table(self, rrg: RRG, route, terminal=False, padding=0.4):
+        return self.route_metric(rrg, route, ("bounding_box_table", terminal, padding),
+                                 lambda: self.compute_bounding_box_table(rrg, route, terminal, padding))
+
+    def compute_bounding_box_table(self, rrg: RRG, route, terminal, padding):
+        if terminal:
+            net_numbers, min_x, max_x, min_y, max_y = self.terminal_bounding_boxes(rrg, route)
+        else:
+            packed = as_packed(route)
+            node_ids = packed.node_ids.astype(np.int64)
+            mapped = (node_ids >= 0) & (node_ids < len(self.node_x))
+            safe_ids = np.where(mapped, node_ids, 0)
+            xs = np.where(mapped, self.node_x[safe_ids], np.nan)
+            ys = np.where(mapped, self.node_y[safe_ids], np.nan)
+            min_x, max_x = self.reduce_per_net(packed, xs, xs)
+            min_y, max_y = self.reduce_per_net(packed, ys, ys)
+            net_numbers = packed.net_numbers
+
+        cell_w = self.clb_size + self.clb_channel_gap
+        cell_h = self.clb_size + self.clb_channel_gap
+        width_cells = np.ceil(((max_x - min_x) + 2 * padding) / cell_w)
+        height_cells = np.ceil(((max_y - min_y) + 2 * padding) / cell_h)
+        area = np.where(np.isnan(min_x), 0, width_cells * height_cells).astype(np.int64)
+
+        return {"net_numbers": net_numbers, "min_x": min_x, "max_x": max_x,
+                "min_y": min_y, "max_y": max_y, "area_cells_ceil": area}
+
+    # metrike k-tog signala iz bounding_box_table u obliku koji vraca calculate_bounding_box_area
+    @staticmethod
+    def bounding_box_metrics(table, k):
+        area = int(table["area_cells_ceil"][k])
+        if math.isnan(table["min_x"][k]):
+            return {"area_cells_ceil": area}
+        return {
+            "min_x": float(table["min_x"][k]),
+            "max_x": float(table["max_x"][k]),
+            "min_y": float(table["min_y"][k]),
+            "max_y": float(table["max_y"][k]),
+            "area_cells_ceil": area
+        }
+
+    # koliko terminal bounding box-ova (prosirenih za padding) pokriva svaki segment kanala iz segment_coords.
+    # 2D difference array nad sazetim x/y koordinatama segmenata: svaki bbox upise 4 vrednosti, a posle
+    # cumsum po obe ose (summed-area) broj za segment se cita direktno; O(signali + segmenti) umesto
+    # provere svakog segmenta sa svakim signalom. Granice su ukljucene, kao min_x <= x <= max_x
+    def segment_bbox_overlap(self, rrg: RRG, route, padding=0.4):
+        segment_x, segment_y = self.segment_coords(rrg)[:2]
+        _, min_x, max_x, min_y, max_y = self.terminal_bounding_boxes(rrg, route)
+        valid = ~np.isnan(min_x)
+
+        xs = np.unique(segment_x)
+        ys = np.unique(segment_y)
+        x0 = np.searchsorted(xs, min_x[valid] - padding, side="left")
+        x1 = np.searchsorted(xs, max_x[valid] + padding, side="right")
+        y0 = np.searchsorted(ys, min_y[valid] - padding, side="left")
+        y1 = np.searchsorted(ys, max_y[valid] + padding, side="right")
+
+        diff = np.zeros((len(xs) + 1, len(ys) + 1), dtype=np.int64)
+        np.add.at(diff, (x0, y0), 1)
+        np.add.at(diff, (x1, y0), -1)
+        np.add.at(diff, (x0, y1), -1)
+        np.add.at(diff, (x1, y1), 1)
+        coverage = diff.cumsum(axis=0).cumsum(axis=1)
+
+        return coverage[np.searchsorted(xs, segment_x), np.searchsorted(ys, segment_y)]
+
+    # HPWL u koordinatama crteza po signalu, {redni broj signala: HPWL}
+    def hpwl_all_signals(self, rrg: RRG, route):
+        net_numbers, hpwl, _ = self.calculate_hpwl(rrg, route)
+        return self.hpwl_results(net_numbers, hpwl)
+
+    # HPWL u RR jedinicama (broj CLB polja), {redni broj signala: HPWL}
+    def hpwl_grid_all_signals(self, rrg: RRG, route):
+        net_numbers, _, hpwl_grid = self.calculate_hpwl(rrg, route)
+        return self.hpwl_results(net_numbers, hpwl_grid)
+
+    def hpwl_results(self, net_numbers, hpwl):
+        hpwl_results = {}
+        for net_id, value in zip(net_numbers.tolist(), hpwl.tolist()):
+            if math.isnan(value):
+                hpwl_results[net_id] = 0
+                print(f"Signal {net_id} nema validnih koordinata")
+            else:
+                hpwl_results[net_id] = value
+        return hpwl_results
+
+    # grid_results (hpwl_grid_all_signals) je opciono; ako je zadat, uz svaki signal se upisuje i HPWL u RR jedinicama
+    def save_hpwl(self, hpwl_results, filename="hpwl_metrika.txt", grid_results=None):
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write("HPWL METRIKA\n")
+                f.write("*" * 25 + "\n")
+
+                total_hpwl = 0
+                for net_id, hpwl in hpwl_results.items():
+                    if grid_results is not None:
+                        f.write(f"Signal {net_id}: HPWL = {hpwl:.2f}, HPWL (RR) = {grid_results.get(net_id, 0):.0f}\n")
+                    else:
+                        f.write(f"Signal {net_id}: HPWL = {hpwl:.2f}\n")
+                    total_hpwl += hpwl
+
+                avg_hpwl = total_hpwl / len(hpwl_results) if hpwl_results else 0
+                max_hpwl = max(hpwl_results.values()) if hpwl_results else 0
+                min_hpwl = min(hpwl_results.values()) if hpwl_results else 0
+
+                f.write("\n" + "*" * 25 + "\n")
+                f.write(f"Ukupan HPWL: {total_hpwl:.2f}\n")
+                f.write(f"Prosečan HPWL: {avg_hpwl:.2f}\n")
+                f.write(f"Maksimalni HPWL: {max_hpwl:.2f}\n")
+                f.write(f"Minimalni HPWL: {min_hpwl:.2f}\n")
+                if grid_results:
+                    f.write(f"Ukupan HPWL (RR): {sum(grid_results.values()):.0f}\n")
+                    f.write(f"Prosečan HPWL (RR): {sum(grid_results.values()) / len(grid_results):.2f}\n")
+                f.write("*" * 25 + "\n")
+
+            print(f"HPWL metrike su sačuvane u fajl: {filename}")
+
+        except Exception as e:
+            print(f"Greška pri snimanju HPWL metrika u fajl: {e}")
+
+
+    def calculate_real_wire_usage(self, rrg: RRG, route_data):
+        # Brojimo sve CHANX i CHANY čvorove u stablu rute (žice), svaku žicu jednom
+        return WireOccupancy(rrg, route_data).wire_usage()
+
+    def calculate_deviation_metrics(self, rrg: RRG, route_data):
+        return self.route_metric(rrg, route_data, "deviation_metrics",
+                                 lambda: self.compute_deviation_metrics(rrg, route_data))
+
+    def compute_deviation_metrics(self, rrg: RRG, route_data):
+        # ruta se pakuje jednom za obe metrike
+        route_data = as_packed(route_data)
+
+        # Izracunaj HPWL za sve signale
+        hpwl_results = self.hpwl_all_signals(rrg, route_data)
+
+        # Izracunaj stvarnu duzinu rute za sve signale
+        real_wire_usage = self.calculate_real_wire_usage(rrg, route_data)
+
+        # Izracunaj odstupanje za svaki signal
+        deviation_metrics = {}
+
+        for net_id in hpwl_results.keys():
+            if net_id in real_wire_usage:
+                hpwl = hpwl_results[net_id]
+                real = real_wire_usage[net_id]
+
+                # Apsolutno odstupanje
+                absolute_deviation = real - hpwl
+
+                # Relativno odstupanje (procenat)
+                relative_deviation = (absolute_deviation / hpwl) * 100 if hpwl > 0 else 0
+
+                deviation_metrics[net_id] = {
+                    'hpwl': hpwl,
+                    'real_wires': real,
+                    'absolute_deviation': absolute_deviation,
+                    'relative_deviation': relative_deviation
+                }
+
+        return deviation_metrics
+
+    # deviation_metrics je opciono vec izracunat rezultat (npr. IncrementalRouteMetrics.deviation_metrics)
+    def print_deviation_analysis(self, rrg: RRG, route_data, n=10, deviation_metrics=None):
+
+        if deviation_metrics is None:
+            deviation_metrics = self.calculate_deviation_metrics(rrg, route_data)
+
+        print("\n" + "=" * 80)
+        print("ANALIZA ODSTUPANJA RUTA OD HPWL METRIKE")
+        print("=" * 80)
+
+        # Ukupne statistike
+        total_signals = len(deviation_metrics)
+        total_absolute_dev = sum(m['absolute_deviation'] for m in deviation_metrics.values())
+        total_relative_dev = sum(m['relative_deviation'] for m in deviation_metrics.values())
+        avg_absolute_dev = total_absolute_dev / total_signals if total_signals > 0 else 0
+        avg_relative_dev = total_relative_dev / total_signals if total_signals > 0 else 0
+
+        print(f"Ukupan broj signala: {total_signals}")
+        print(f"Prosečno apsolutno odstupanje: {avg_absolute_dev:.2f}")
+        print(f"Prosečno relativno odstupanje: {avg_relative_dev:.2f}%")
+        print("-" * 80)
+
+        # Top N po apsolutnom odstupanju (heap, bez sortiranja svih signala)
+        top_by_absolute = top_k(deviation_metrics.items(), n, key=lambda x: x[1]['absolute_deviation'])
+
+        print(f"\nTOP {n} SIGNALA PO APSOLUTNOM ODSTUPANJU:")
+        print("-" * 60)
+        for i, (net_id, metrics) in enumerate(top_by_absolute):
+            print(f"{i + 1:2d}. Net {net_id:4d}: HPWL={metrics['hpwl']:6.2f}, "
+                  f"Žice={metrics['real_wires']:3d}, "
+                  f"Aps.dev={metrics['absolute_deviation']:6.2f}, "
+                  f"Rel.dev={metrics['relative_deviation']:6.2f}%")
+
+        # Top N po relativnom odstupanju
+        top_by_relative = top_k(deviation_metrics.items(), n, key=lambda x: x[1]['relative_deviation'])
+
+        print(f"\nTOP {n} SIGNALA PO RELATIVNOM ODSTUPANJU:")
+        print("-" * 60)
+        for i, (net_id, metrics) in enumerate(top_by_relative):
+            print(f"{i + 1:2d}. Net {net_id:4d}: HPWL={metrics['hpwl']:6.2f}, "
+                  f"Žice={metrics['real_wires']:3d}, "
+                  f"Aps.dev={metrics['absolute_deviation']:6.2f}, "
+                  f"Rel.dev={metrics['relative_deviation']:6.2f}%")
+
+        print("=" * 80)
+
+    def save_deviation_analysis(self, rrg: RRG, route_data, filename="hpwl_odstupanje_analiza.txt", n = 10,
+                                deviation_metrics=None):
+
+        if deviation_metrics is None:
+            deviation_metrics = self.calculate_deviation_metrics(rrg, route_data)
+
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write("ANALIZA ODSTUPANJA RUTA OD HPWL METRIKE\n")
+                f.write("=" * 80 + "\n\n")
+
+                # Ukupne statistike
+                total_signals = len(deviation_metrics)
+                total_absolute_dev = sum(m['absolute_deviation'] for m in deviation_metrics.values())
+                total_relative_dev = sum(m['relative_deviation'] for m in deviation_metrics.values())
+                avg_absolute_dev = total_absolute_dev / total_signals if total_signals > 0 else 0
+                avg_relative_dev = total_relative_dev / total_signals if total_signals > 0 else 0
+
+                f.write(f"Ukupan broj signala: {total_signals}\n")
+                f.write(f"Prosečno apsolutno odstupanje: {avg_absolute_dev:.2f}\n")
+                f.write(f"Prosečno relativno odstupanje: {avg_relative_dev:.2f}%\n")
+                f.write("-" * 80 + "\n\n")
+
+                # Top N po apsolutnom odstupanju (heap, bez sortiranja svih signala)
+                items = list(deviation_metrics.items())
+                top_by_absolute = top_k(items, n, key=lambda x: x[1]['absolute_deviation'])
+
+                f.write(f"\nTOP {n} SIGNALA PO APSOLUTNOM ODSTUPANJU:\n\n")
+                f.write("-" * 80 + "\n\n")
+                for i, (net_id, metrics) in enumerate(top_by_absolute):
+                    f.write(f"{i + 1:2d}. Net {net_id:4d}: HPWL={metrics['hpwl']:6.2f}, "
+                          f"Žice={metrics['real_wires']:3d}, "
+                          f"Aps.dev={metrics['absolute_deviation']:6.2f}, "
+                          f"Rel.dev={metrics['relative_deviation']:6.2f}%\n")
+
+                f.write("\n")
+
+                # Top N po relativnom odstupanju
+                top_by_relative = top_k(items, n, key=lambda x: x[1]['relative_deviation'])
+
+                f.write(f"\nTOP {n} SIGNALA PO RELATIVNOM ODSTUPANJU:\n\n")
+                f.write("-" * 80 + "\n\n")
+                for i, (net_id, metrics) in enumerate(top_by_relative):
+                    f.write(f"{i + 1:2d}. Net {net_id:4d}: HPWL={metrics['hpwl']:6.2f}, "
+                          f"Žice={metrics['real_wires']:3d}, "
+                          f"Aps.dev={metrics['absolute_deviation']:6.2f}, "
+                          f"Rel.dev={metrics['relative_deviation']:6.2f}%\n")
+
+                f.write("\n" + "=" * 80 + "\n")
+
+                # Detaljan pregled svih signala
+                f.write("\nDETALJAN PREGLED SVIH SIGNALA:\n")
+                f.write("=" * 80 + "\n")
+
+                # pun redosled za pregled jednim NumPy sortiranjem (isti redosled kao sorted(..., reverse=True))
+                absolute = np.array([m['absolute_deviation'] for _, m in items], dtype=float)
+                relative = np.array([m['relative_deviation'] for _, m in items], dtype=float)
+
+                f.write("\nSignali sortirani po apsolutnom odstupanju:\n")
+                f.write("-" * 80 + "\n")
+                for k in top_k_indices(absolute, len(items)).tolist():
+                    net_id, metrics = items[k]
+                    f.write(f"Net {net_id}: HPWL={metrics['hpwl']:.2f}, "
+                            f"Žice={metrics['real_wires']}, "
+                            f"Aps.dev={metrics['absolute_deviation']:.2f}, "
+                            f"Rel.dev={metrics['relative_deviation']:.2f}%\n")
+
+                f.write("\n\nSignali sortirani po relativnom odstupanju:\n")
+                f.write("-" * 80 + "\n")
+                for k in top_k_indices(relative, len(items)).tolist():
+                    net_id, metrics = items[k]
+                    f.write(f"Net {net_id}: HPWL={metrics['hpwl']:.2f}, "
+                            f"Žice={metrics['real_wires']}, "
+                            f"Aps.dev={metrics['absolute_deviation']:.2f}, "
+                            f"Rel.dev={metrics['relative_deviation']:.2f}%\n")
+
+            print(f"Analiza odstupanja je sačuvana u fajl: {filename}")
+
+        except Exception as e:
+            print(f"Greška pri snimanju analize odstupanja: {e}")
+
+    def calculate_terminal_bounding_box_area(self, routing_path, rrg, include_padding=True, padding=0.4):
+        if not hasattr(self, "coord_map"):
+            raise RuntimeError(
+                "coord_map missing; call visualize_matrix(rrg) or map_rrg_to_grid(rrg) first")
+
+        # Pronađi samo SOURCE i SINK čvorove u ruti
+        terminal_nodes = [
+            n for n in routing_path
+            if n in self.coord_map and getattr(rrg.nodes[n], "type", None) in ("SOURCE", "SINK")
+        ]
+        if not terminal_nodes:
+            return {
+                "area_cells_ceil": 0
+            }
+
+        coords = [self.coord_map[n] for n in terminal_nodes]
+        xs, ys = zip(*coords)
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+
+        width_no_pad = max_x - min_x
+        height_no_pad = max_y - min_y
+
+        pad = padding if include_padding else 0.0
+        width_mpl = width_no_pad + 2 * pad
+        height_mpl = height_no_pad + 2 * pad
+
+        cell_w = self.clb_size + self.clb_channel_gap
+        cell_h = self.clb_size + self.clb_channel_gap
+
+        if cell_w == 0 or cell_h == 0:
+            raise RuntimeError(
+                "Invalid clb_size or clb_channel_gap (would divide by zero)")
+
+        width_cells = width_mpl / cell_w
+        height_cells = height_mpl / cell_h
+
+        area_cells_ceil = math.ceil(width_cells) * math.ceil(height_cells)
+
+        return {
+            "min_x": min_x,
+            "max_x": max_x,
+            "min_y": min_y,
+            "max_y": max_y,
+            "area_cells_ceil": area_cells_ceil
+        }
+
+    def calculate_bounding_box_area(self, routing_path, include_padding=True, padding=0.4):
+        if not hasattr(self, "coord_map"):
+            raise RuntimeError(
+                "coord_map missing; call visualize_matrix(rrg) or map_rrg_to_grid(rrg) first")
+
+        coords = [self.coord_map[n]
+                  for n in routing_path if n in self.coord_map]
+        if not coords:
+            return {
+                "area_cells_ceil": 0
+            }
+
+        xs, ys = zip(*coords)
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+
+        width_no_pad = max_x - min_x
+        height_no_pad = max_y - min_y
+
+        pad = padding if include_padding else 0.0
+        width_mpl = width_no_pad + 2 * pad
+        height_mpl = height_no_pad + 2 * pad
+
+        area_mpl = width_mpl * height_mpl
+
+        cell_w = self.clb_size + self.clb_channel_gap
+        cell_h = self.clb_size + self.clb_channel_gap
+
+        if cell_w == 0 or cell_h == 0:
+            raise RuntimeError(
+                "Invalid clb_size or clb_channel_gap (would divide by zero)")
+
+        width_cells = width_mpl / cell_w
+        height_cells = height_mpl / cell_h
+
+        area_cells_ceil = math.ceil(width_cells) * math.ceil(height_cells)
+
+        return {
+            "min_x": min_x,
+            "max_x": max_x,
+            "min_y": min_y,
+            "max_y": max_y,
+            "area_cells_ceil": area_cells_ceil  # povrsina
+        }
@@ -1,15 +1,34 @@
-import matplotlib.pyplot as plt
-from bokeh.colors.named import lemonchiffon
+import numpy as np
 import random
-from matplotlib import patches
+from matplotlib.collections import LineCollection, PolyCollection
 
 from .fpga_matrix import FPGAMatrix
 from .models import RRG
 
+# oblik strelice iz ax.arrow(..., head_width=0.09, head_length=0.09) (FancyArrow, width=0.001): rep duzine
+# ARROW_TAIL od tacke strelice, pa glava duzine ARROW_HEAD_LENGTH
+ARROW_TAIL = 0.05
+ARROW_HEAD_WIDTH = 0.09
+ARROW_HEAD_LENGTH = 0.09
+ARROW_WIDTH = 0.001
+
+# temena strelice u lokalnim koordinatama: pocetak repa u (0, 0), smer duz x ose
+ARROW_TEMPLATE = np.array([
+    [ARROW_TAIL + ARROW_HEAD_LENGTH, 0.0],    # vrh
+    [ARROW_TAIL, -ARROW_HEAD_WIDTH / 2],      # desni ugao glave
+    [ARROW_TAIL, -ARROW_WIDTH / 2],           # spoj glave i repa
+    [0.0, -ARROW_WIDTH / 2],                  # pocetak repa
+    [0.0, ARROW_WIDTH / 2],
+    [ARROW_TAIL, ARROW_WIDTH / 2],
+    [ARROW_TAIL, ARROW_HEAD_WIDTH / 2],       # levi ugao glave
+])
+
 
 class FPGARouting(FPGAMatrix):
     def __init__(self):
         super().__init__()
+        # (rrg, kodovi tipova po id-ju cvora), vidi node_types
+        self._node_types = None
 
     def visualize_routing_on_grid(self, rrg: RRG, routing_path, net_id=None):
         self.routing_path = routing_path
@@ -17,164 +36,119 @@ class FPGARouting(FPGAMatrix):
 
         self.draw_routing_path_on_grid(rrg)
 
+    # kod tipa svakog cvora, indeks = id cvora (-1 za id-jeve kojih nema u grafu)
+    def node_types(self, rrg: RRG) -> np.ndarray:
+        if self._node_types is None or self._node_types[0] is not rrg:
+            arrays = rrg.arrays()
+            size = int(arrays.ids.max()) + 1 if len(arrays.ids) else 0
+            types = np.full(size, -1, dtype=np.int16)
+            types[arrays.ids] = arrays.types
+            self._node_types = (rrg, types)
+        return self._node_types[1]
+
+    # geometrija rute kao NumPy nizovi: (edges, segments, arrows)
+    #   edges    - indeksi i grana (routing_path[i], routing_path[i + 1]) koje se crtaju (bez SINK grana
+    #              i cvorova bez koordinate)
+    #   segments - (S, 2, 2) linije; CHANX <-> CHANY grana je L-oblik od dva segmenta
+    #   arrows   - (S, 4) po segmentu: x, y strelice (70% segmenta) i normalizovan smer dx, dy
+    # unique_edges=True crta ponovljenu granu samo jednom
+    def route_geometry(self, rrg: RRG, routing_path, unique_edges=False):
+        path = np.asarray(routing_path, dtype=np.int64)
+        types = self.node_types(rrg)
+        code = rrg.arrays().type_code
+        sink, chanx, chany, io = code("SINK"), code("CHANX"), code("CHANY"), code("IO")
+
+        src, dst = path[:-1], path[1:]
+        type1, type2 = types[src], types[dst]
+        edges = np.flatnonzero((type1 != sink) & (type2 != sink))
+
+        known = ~np.isnan(self.node_x[src[edges]]) & ~np.isnan(self.node_x[dst[edges]])
+        for i in edges[~known].tolist():
+            print(f"Upozorenje: Node {path[i]} ili {path[i + 1]} nije na coord_map")
+        edges = edges[known]
+
+        drawn = edges
+        if unique_edges and len(edges):
+            # prvo pojavljivanje svake grane, redom kao u putanji
+            keys = src[edges] * len(types) + dst[edges]
+            _, first = np.unique(keys, return_index=True)
+            drawn = edges[np.sort(first)]
+
+        x1, y1 = self.node_x[src[drawn]], self.node_y[src[drawn]]
+        x2, y2 = self.node_x[dst[drawn]], self.node_y[dst[drawn]]
+        type1, type2 = type1[drawn], type2[drawn]
+
+        # razlicita vrsta kanala - L-oblik preko tacke okreta
+        channel1 = (type1 == chanx) | (type1 == chany)
+        channel2 = (type2 == chanx) | (type2 == chany)
+        turn = channel1 & channel2 & (type1 != type2)
+        turn_x = np.where(type1 == chanx, x2, x1)
+        turn_y = np.where(type1 == chanx, y1, y2)
+        # io veza se crta dva puta (direktno i kao pin-kanal veza), kao ranije
+        twice = turn | (type1 == io) | (type2 == io)
+
+        # prvi segment svake grane, pa drugi gde postoji
+        first = np.stack([np.stack([x1, y1], axis=-1),
+                          np.stack([np.where(turn, turn_x, x2), np.where(turn, turn_y, y2)], axis=-1)], axis=1)
+        second = np.stack([np.stack([np.where(turn, turn_x, x1), np.where(turn, turn_y, y1)], axis=-1),
+                           np.stack([x2, y2], axis=-1)], axis=1)
+        segments = np.stack([first, second], axis=1).reshape(-1, 2, 2)
+        segments = segments[np.stack([np.ones(len(drawn), dtype=bool), twice], axis=1).ravel()]
+
+        start = segments[:, 0]
+        delta = segments[:, 1] - start
+        length = (delta[:, 0] ** 2 + delta[:, 1] ** 2) ** 0.5
+        direction = np.zeros_like(delta)
+        np.divide(delta, length[:, None], out=direction, where=length[:, None] > 0)
+        arrows = np.concatenate([start + 0.7 * delta, direction], axis=1)
+        return edges, segments, arrows
+
+    # poligoni strelica (N, 7, 2): ARROW_TEMPLATE zarotiran u smer (dx, dy) i pomeren u tacku (x, y)
+    @staticmethod
+    def arrow_polygons(arrows: np.ndarray) -> np.ndarray:
+        cos, sin = arrows[:, 2], arrows[:, 3]
+        # redovi su vektori, pa je rotacija za ugao smera [[cos, sin], [-sin, cos]]
+        rotation = np.stack([np.stack([cos, sin], axis=-1), np.stack([-sin, cos], axis=-1)], axis=1)
+        return ARROW_TEMPLATE @ rotation + arrows[:, None, :2]
+
+    # jedna LineCollection za linije i jedna PolyCollection za strelice
+    def draw_route_geometry(self, segments, arrows, color):
+        if len(segments):
+            self.ax.add_collection(LineCollection(segments, colors=[color], linewidths=2, alpha=0.9,
+                                                  capstyle='projecting', joinstyle='round'),
+                                   autolim=False)
+
+        # crtamo samo strelice koje imaju dobar smer
+        arrows = arrows[(arrows[:, 2] != 0) | (arrows[:, 3] != 0)]
+        if len(arrows):
+            self.ax.add_collection(PolyCollection(self.arrow_polygons(arrows), facecolors=[color],
+                                                  edgecolors=[color], linewidths=1.0, joinstyle='miter'),
+                                   autolim=False)
+
     def draw_routing_path_on_grid(self, rrg: RRG):
         if not self.routing_path:
             print("Nemamo rutu")
             return
 
-        # pratimo edges da bi izbegli duplikate
-        drawn_edges = set()
-        x_coords = []
-        y_coords = []
-        node_ids = []
-        arrow_positions = []
-
-        # pratimo putanju signala, tj. lista nodova
-        signal_flow = {}
-
-        # pravimo rutu
-        for i in range(len(self.routing_path) - 1):
-            node_id1 = self.routing_path[i]
-            node_id2 = self.routing_path[i + 1]
-
-            if node_id1 not in signal_flow:
-                signal_flow[node_id1] = []
-            signal_flow[node_id1].append(node_id2)
-
-        # skupljamo sve sinkove
-        sink_nodes = []
-        for node_id in self.routing_path:
-            if rrg.nodes[node_id].type == "SINK":
-                if node_id in self.coord_map:
-                    sink_nodes.append((node_id, self.coord_map[node_id]))
-
-        for i in range(len(self.routing_path) - 1):
-            node_id1 = self.routing_path[i]
-            node_id2 = self.routing_path[i + 1]
-
-            if (rrg.nodes[node_id1].type == "SINK" or
-                    rrg.nodes[node_id2].type == "SINK"):
-                continue
-
-            if node_id1 not in self.coord_map or node_id2 not in self.coord_map:
-                print(f"Upozorenje: Node {node_id1} ili {node_id2} nije na coord_map")
-                continue
-
-            x1, y1 = self.coord_map[node_id1]
-            x2, y2 = self.coord_map[node_id2]
-
-            node1 = rrg.nodes[node_id1]
-            node2 = rrg.nodes[node_id2]
-
-            if i == 0:
-                x_coords.append(x1)
-                y_coords.append(y1)
-                node_ids.append(node_id1)
-            x_coords.append(x2)
-            y_coords.append(y2)
-            node_ids.append(node_id2)
-
-            edge_key = (node_id1, node_id2)
-            if edge_key in drawn_edges:
-                continue
-            drawn_edges.add(edge_key)
-
-            # racunamo vektor u kom smeru cemo nacrtati strelice
-            dx = x2 - x1
-            dy = y2 - y1
-            length = (dx ** 2 + dy ** 2) ** 0.5
-            if length > 0:
-                dx_norm = dx / length
-                dy_norm = dy / length
-            else:
-                dx_norm, dy_norm = 0, 0
-
-            # io veze - direktna linija
-            if node1.type == 'IO' or node2.type == 'IO':
-                self.ax.plot([x1, x2], [y1, y2],
-                             color=self.colors['ROUTED_PATH'], linewidth=2, alpha=0.9)
-                arrow_x = x1 + 0.7 * dx
-                arrow_y = y1 + 0.7 * dy
-                arrow_positions.append((arrow_x, arrow_y, dx_norm, dy_norm))
-
-            # kanal-kanal veza
-            if node1.type in ['CHANX', 'CHANY'] and node2.type in ['CHANX', 'CHANY']:
-                # ista vrsta kanala - direktna linija
-                if node1.type == node2.type:
-                    self.ax.plot([x1, x2], [y1, y2],
-                                 color=self.colors['ROUTED_PATH'], linewidth=2, alpha=0.9)
-                    arrow_x = x1 + 0.7 * dx
-                    arrow_y = y1 + 0.7 * dy
-                    arrow_positions.append((arrow_x, arrow_y, dx_norm, dy_norm))
-                else:
-                    # razlicita vrsta kanala - L-oblik
-                    if node1.type == 'CHANX':  # horizontalni -> vertikalni
-                        turn_x = x2
-                        turn_y = y1
-                    else:  # vertikalni -> horizontalni
-                        turn_x = x1
-                        turn_y = y2
-
-                    # Crtamo L-oblik: prvi segment do tacke okreta, pa drugi segment
-                    self.ax.plot([x1, turn_x], [y1, turn_y],
-                                 color=self.colors['ROUTED_PATH'], linewidth=2, alpha=0.9)
-                    self.ax.plot([turn_x, x2], [turn_y, y2],
-                                 color=self.colors['ROUTED_PATH'], linewidth=2, alpha=0.9)
-
-                    # dodajemo strelice za oba smera crtanja
-                    seg1_dx = turn_x - x1
-                    seg1_dy = turn_y - y1
-                    seg1_length = (seg1_dx ** 2 + seg1_dy ** 2) ** 0.5
-                    if seg1_length > 0:
-                        seg1_dx_norm = seg1_dx / seg1_length
-                        seg1_dy_norm = seg1_dy / seg1_length
-                    else:
-                        seg1_dx_norm, seg1_dy_norm = 0, 0
-
-                    arrow_x1 = x1 + 0.7 * seg1_dx
-                    arrow_y1 = y1 + 0.7 * seg1_dy
-                    arrow_positions.append((arrow_x1, arrow_y1, seg1_dx_norm, seg1_dy_norm))
-
-                    seg2_dx = x2 - turn_x
-                    seg2_dy = y2 - turn_y
-                    seg2_length = (seg2_dx ** 2 + seg2_dy ** 2) ** 0.5
-                    if seg2_length > 0:
-                        seg2_dx_norm = seg2_dx / seg2_length
-                        seg2_dy_norm = seg2_dy / seg2_length
-                    else:
-                        seg2_dx_norm, seg2_dy_norm = 0, 0
-
-                    arrow_x2 = turn_x + 0.7 * seg2_dx
-                    arrow_y2 = turn_y + 0.7 * seg2_dy
-                    arrow_positions.append((arrow_x2, arrow_y2, seg2_dx_norm, seg2_dy_norm))
-
-            else:
-                # pin-kanal ili kanal-pin veza - direktna linija
-                self.ax.plot([x1, x2], [y1, y2],
-                             color=self.colors['ROUTED_PATH'], linewidth=2, alpha=0.9)
-                arrow_x = x1 + 0.7 * dx
-                arrow_y = y1 + 0.7 * dy
-                arrow_positions.append((arrow_x, arrow_y, dx_norm, dy_norm))
-
-        # sve strelice
-        for arrow_x, arrow_y, dx_norm, dy_norm in arrow_positions:
-            # crtamo samo ako imamo dobar smer
-            if dx_norm != 0 or dy_norm != 0:
-                tail_length = 0.05
-                self.ax.arrow(arrow_x, arrow_y, dx_norm * tail_length, dy_norm * tail_length, head_width=0.09,
-                              head_length=0.09,
-                              fc=self.colors['ROUTED_PATH'],
-                              ec=self.colors['ROUTED_PATH'])
-
-        if len(node_ids) >= 2:
-            self.ax.text(x_coords[0], y_coords[0] - 0.3, f'{node_ids[0]}',
+        path = np.asarray(self.routing_path, dtype=np.int64)
+        edges, segments, arrows = self.route_geometry(rrg, path, unique_edges=True)
+        self.draw_route_geometry(segments, arrows, self.colors['ROUTED_PATH'])
+
+        # pocetni cvor: prvi cvor prve nacrtane grane (labela samo ako ruta ima bar dva cvora)
+        if len(edges) and len(edges) + (edges[0] == 0) >= 2:
+            first = int(path[0] if edges[0] == 0 else path[edges[0] + 1])
+            x, y = self.coord_map[first]
+            self.ax.text(x, y - 0.3, f'{first}',
                          ha='center', va='center', fontsize=7,
                          bbox=dict(boxstyle="round,pad=0.2", facecolor="lightblue"))
 
-        for node_id, (x, y) in sink_nodes:
-            self.ax.text(x, y - 0.3, f'{node_id}',
-                         ha='center', va='center', fontsize=7,
-                         bbox=dict(boxstyle="round,pad=0.2", facecolor="lightgreen"))
+        sink = rrg.arrays().type_code("SINK")
+        for node_id in path[self.node_types(rrg)[path] == sink].tolist():
+            if node_id in self.coord_map:
+                x, y = self.coord_map[node_id]
+                self.ax.text(x, y - 0.3, f'{node_id}',
+                             ha='center', va='center', fontsize=7,
+                             bbox=dict(boxstyle="round,pad=0.2", facecolor="lightgreen"))
 
     def visualize_routing_by_branching(self, rrg: RRG, route_data, branching_factor: int):
         if not route_data.nets:
@@ -184,11 +158,11 @@ class FPGARouting(FPGAMatrix):
         all_routing_paths = []
 
         for net_id, net in route_data.nets.items():
-            num_sinks = sum(1 for node in net.nodes if node.type == "SINK")
+            num_sinks = sum(1 for node_id in net.node_ids if rrg.nodes[node_id].type == "SINK")
             if num_sinks != branching_factor:
                 continue  # preskocimo netove koji ne zadovoljavaju faktor
 
-            routing_path = [node.id for node in net.nodes]
+            routing_path = net.path()
             all_routing_paths.append((routing_path, net_id))
 
         self.draw_branching_paths_on_grid(rrg, all_routing_paths)
@@ -205,85 +179,9 @@ class FPGARouting(FPGAMatrix):
             colors[net_id] = (random.random(), random.random(), random.random())
 
         for routing_path, net_id in all_routing_paths:
-            drawn_edges = set()
-            arrow_positions = []
-            x_coords, y_coords = [], []
-
-            for i in range(len(routing_path) - 1):
-                node_id1 = routing_path[i]
-                node_id2 = routing_path[i + 1]
-
-                node1 = rrg.nodes[node_id1]
-                node2 = rrg.nodes[node_id2]
-
-                if (rrg.nodes[node_id1].type == "SINK" or
-                        rrg.nodes[node_id2].type == "SINK"):
-                    continue
-
-                if node_id1 not in self.coord_map or node_id2 not in self.coord_map:
-                    print(f"Upozorenje: Node {node_id1} ili {node_id2} nije na coord_map")
-                    continue
-
-                x1, y1 = self.coord_map[node_id1]
-                x2, y2 = self.coord_map[node_id2]
-
-                if node2.type == "SINK":
-                    self.ax.plot([x1, x2], [y1, y2], color=colors[net_id], linewidth=2, alpha=0.9)
-                    dx, dy = x2 - x1, y2 - y1
-                    length = (dx ** 2 + dy ** 2) ** 0.5
-                    if length > 0:
-                        dx_norm, dy_norm = dx / length, dy / length
-                        self.ax.arrow(x1 + 0.7 * dx, y1 + 0.7 * dy, dx_norm * 0.05, dy_norm * 0.05,
-                                      head_width=0.09, head_length=0.09, fc=colors[net_id], ec=colors[net_id])
-                    # dodavanje koordinata za source/sink label
-                    if i == 0:
-                        x_coords.append(x1)
-                        y_coords.append(y1)
-                    x_coords.append(x2)
-                    y_coords.append(y2)
-                    break  # preskoci dalje, ne crtamo iz SINK-a
-
-                dx = x2 - x1
-                dy = y2 - y1
-                length = (dx ** 2 + dy ** 2) ** 0.5
-                dx_norm, dy_norm = (dx / length, dy / length) if length > 0 else (0, 0)
-
-                if node1.type in ['CHANX', 'CHANY'] and node2.type in ['CHANX', 'CHANY'] and node1.type != node2.type:
-
-                    turn_x = x2 if node1.type == 'CHANX' else x1
-                    turn_y = y1 if node1.type == 'CHANX' else y2
-                    self.ax.plot([x1, turn_x], [y1, turn_y], color=colors[net_id], linewidth=2, alpha=0.9)
-                    self.ax.plot([turn_x, x2], [turn_y, y2], color=colors[net_id], linewidth=2, alpha=0.9)
-
-                    # strelice za L-shape
-                    seg1_dx, seg1_dy = turn_x - x1, turn_y - y1
-                    seg1_length = (seg1_dx ** 2 + seg1_dy ** 2) ** 0.5
-                    seg1_dx_norm = seg1_dx / seg1_length if seg1_length > 0 else 0
-                    seg1_dy_norm = seg1_dy / seg1_length if seg1_length > 0 else 0
-                    arrow_positions.append((x1 + 0.7 * seg1_dx, y1 + 0.7 * seg1_dy, seg1_dx_norm, seg1_dy_norm))
-
-                    seg2_dx, seg2_dy = x2 - turn_x, y2 - turn_y
-                    seg2_length = (seg2_dx ** 2 + seg2_dy ** 2) ** 0.5
-                    seg2_dx_norm = seg2_dx / seg2_length if seg2_length > 0 else 0
-                    seg2_dy_norm = seg2_dy / seg2_length if seg2_length > 0 else 0
-                    arrow_positions.append((turn_x + 0.7 * seg2_dx, turn_y + 0.7 * seg2_dy, seg2_dx_norm, seg2_dy_norm))
-                else:
-
-                    self.ax.plot([x1, x2], [y1, y2], color=colors[net_id], linewidth=2, alpha=0.9)
-                    arrow_positions.append((x1 + 0.7 * dx, y1 + 0.7 * dy, dx_norm, dy_norm))
-
-                if i == 0:
-                    x_coords.append(x1)
-                    y_coords.append(y1)
-                x_coords.append(x2)
-                y_coords.append(y2)
-                drawn_edges.add((node_id1, node_id2))
-
-            for arrow_x, arrow_y, dx_norm, dy_norm in arrow_positions:
-                if dx_norm != 0 or dy_norm != 0:
-                    tail_length = 0.05
-                    self.ax.arrow(arrow_x, arrow_y, dx_norm * tail_length, dy_norm * tail_length,
-                                  head_width=0.09, head_length=0.09, fc=colors[net_id], ec=colors[net_id])
+            # SINK grane se ne crtaju, pa se ruta svodi na linije i strelice ostalih grana
+            _, segments, arrows = self.route_geometry(rrg, routing_path)
+            self.draw_route_geometry(segments, arrows, colors[net_id])
 
             nodes_list = [rrg.nodes[node_id] for node_id in routing_path]
             for i, node in enumerate(nodes_list):
@@ -309,7 +207,6 @@ class FPGARouting(FPGAMatrix):
                                  bbox=dict(boxstyle="round,pad=0.1", facecolor=facecolor))
 
 
-
     def visualize_first_n_routings(self, rrg: RRG, routing_paths, n):
         color_palette = [
             'red', 'blue', 'green', 'orange', 'purple',
@@ -1,7 +1,8 @@
 import matplotlib.cm as cm
+import numpy as np
 import matplotlib.patches as mpatches
 from .fpga_matrix import FPGAMatrix
-from .models import RRG
+from .occupancy import WireOccupancy
 
 
 class FPGAWires(FPGAMatrix):
@@ -9,41 +10,92 @@ class FPGAWires(FPGAMatrix):
     def __init__(self):
         super().__init__()
 
+    # zagusenje kao jedan scatter za sve zice (boja po broju signala), a broj signala se ispisuje samo uz
+    # zice koje neki signal koristi. Vraca WireOccupancy; signali po zici se prave tek na zahtev (nets_of)
     def visualize_wire_congestion(self, rrg, route, iteration):
-        # izdvojimo sve zice (CHANX/CHANY cvorove)
-        wires = {node.id: node for node in rrg.nodes.values() if node.type in [
-            'CHANX', 'CHANY']}
-
-        # brojanje zagusenja po zicama
-        wire_load = {wire_id: 0 for wire_id in wires.keys()}
-        wire_signals = {wire_id: set()
-                        for wire_id in wires.keys()}  # set za signale po zici
-
-        for net_id, net in route.nets.items():
-            # svaki wire u ruti signala evidentiramo samo jednom
-            wire_ids = set(node.id for node in net.nodes if node.type in [
-                           'CHANX', 'CHANY'])
-            for wire_id in wire_ids:
-                if net_id not in wire_signals[wire_id]:
-                    wire_signals[wire_id].add(net_id)
-                    wire_load[wire_id] += 1  # brojimo signal samo jednom
-
-        max_load = max(wire_load.values()) if wire_load else 1
+        # broj signala po zici; signal se broji jednom po zici koliko god puta kroz nju prolazi
+        occupancy = WireOccupancy(rrg, route)
+        wire_ids = occupancy.wires()
+        wire_load = occupancy.occupancy[wire_ids]
+
+        max_load = int(wire_load.max()) if len(wire_load) and wire_load.max() > 0 else 1
 
         # crtanje zagusenja na matrici
-        for wire_id, load in wire_load.items():
+        layout = self.wire_label_layout(rrg, wire_ids)
+        loads = occupancy.occupancy[np.array([item[0] for item in layout], dtype=np.int64)]
+        if layout:
+            self.ax.scatter([item[1] for item in layout], [item[2] for item in layout],
+                            color=cm.Blues(loads / max_load), edgecolors='gray', linewidths=1, s=20, zorder=10)
+
+        for (_, _, _, text_x, text_y, ha, va), load in zip(layout, loads.tolist()):
+            if load > 0:
+                self.ax.text(text_x, text_y, str(load), ha=ha, va=va, fontsize=6, color='black')
+
+        # naslov figure
+        if iteration == 0:
+            self.ax.set_title("Zagušenje po žicama - Finalna iteracija")
+        else:
+            self.ax.set_title(
+                "Zagušenje po žicama - Iteracija broj " + str(iteration))
+
+        return occupancy
+
+    def visualize_segment_wire_usage(self, rrg, route, iteration):
+        # isti brojac zauzetosti kao u visualize_wire_congestion
+        occupancy = WireOccupancy(rrg, route)
+
+        segment_x, segment_y, used_counts, total_counts = self.segment_usage_counts(rrg, occupancy.occupancy)
+
+        segment_usage = {}
+        for x, y, used, total in zip(segment_x.tolist(), segment_y.tolist(), used_counts.tolist(),
+                                     total_counts.tolist()):
+            segment_usage[(x, y)] = (used, total)
+
+        # Vizualizuj na gridu
+        for coord, rect_xy, rect_w, rect_h, text_x, text_y, ha, va in self.segment_label_layout(rrg):
+            used, total = segment_usage[coord]
+            usage_ratio = used / total if total else 0
+            color = cm.Reds(usage_ratio)
+            
+            rect = mpatches.Rectangle(
+                rect_xy,
+                rect_w, rect_h,
+                linewidth=0, edgecolor=None,
+                facecolor=color, alpha=0.38, zorder=6
+            )
+            self.ax.add_patch(rect)
+            
+            self.ax.text(
+                text_x, text_y,
+                f"{used}/{total}",
+                ha=ha, va=va,
+                fontsize=14, color='black', fontweight='bold'
+            )
+
+        if iteration == 0:
+            self.ax.set_title("Broj zauzetih žica po segmentu - Finalna iteracija")
+        else:
+            self.ax.set_title(f"Broj zauzetih žica po segmentu - Iteracija broj {iteration}")
+
+        return segment_usage
+
+    # Grupisi zice po koordinatama (segmentima) i za svaki segment prebroj zice sa zauzetoscu > 0.
+    # Vraca (segment_x, segment_y, used_counts, total_counts), redom kao segment_coords
+    def segment_usage_counts(self, rrg, occupancy):
+        segment_x, segment_y, first_wire, wire_ids, wire_segment = self.segment_coords(rrg)
+        used_counts = np.bincount(wire_segment, weights=occupancy[wire_ids] > 0,
+                                  minlength=len(first_wire)).astype(np.int64)
+        total_counts = np.bincount(wire_segment, minlength=len(first_wire))
+        return segment_x, segment_y, used_counts, total_counts
+
+    # polozaj markera i labele za svaku zicu koja ima koordinatu:
+    # lista (id zice, x, y, text_x, text_y, ha, va), redom kao wire_ids
+    def wire_label_layout(self, rrg, wire_ids):
+        layout = []
+        for wire_id in wire_ids.tolist():
             x, y = self.coord_map.get(wire_id, (None, None))
             if x is None or y is None:
                 continue
-            color = cm.Blues(load / max_load)
-            self.ax.scatter(
-                x, y,
-                color=[color],
-                edgecolors='gray',
-                linewidths=1,
-                s=20,
-                zorder=10
-            )
 
             node_type = rrg.nodes[wire_id].type
 
@@ -61,56 +113,27 @@ class FPGAWires(FPGAMatrix):
                 ha = 'center'
                 va = 'top'
 
-            self.ax.text(text_x, text_y, str(load), ha=ha,
-                         va=va, fontsize=6, color='black')
-
-        # naslov figure
-        if iteration == 0:
-            self.ax.set_title("Zagušenje po žicama - Finalna iteracija")
-        else:
-            self.ax.set_title(
-                "Zagušenje po žicama - Iteracija broj " + str(iteration))
-
-        # vracamo i mapu signala po žici ako bude potrebno
-        return wire_signals
+            layout.append((wire_id, x, y, text_x, text_y, ha, va))
+        return layout
 
-    def visualize_segment_wire_usage(self, rrg, route, iteration):
-        # Dobavi wire_load iz visualize_wire_congestion logike
-        wires = [node for node in rrg.nodes.values() if node.type in ['CHANX', 'CHANY']]
-        wire_load = {wire.id: 0 for wire in wires}
-        for net_id, net in route.nets.items():
-            wire_ids = set(node.id for node in net.nodes if node.type in ['CHANX', 'CHANY'])
-            for wire_id in wire_ids:
-                wire_load[wire_id] += 1
-
-        # Grupisi zice po koordinatama (segmentima)
-        segment_wires = {}
-        for wire in wires:
-            coord = self.get_segment_coord(wire)
-            if coord is None:
-                continue
-            if coord not in segment_wires:
-                segment_wires[coord] = []
-            segment_wires[coord].append(wire.id)
+    # pravougaonik i labela za svaki segment kanala (koordinata iz segment_coords):
+    # lista ((x, y), (rect_x, rect_y), rect_w, rect_h, text_x, text_y, ha, va)
+    def segment_label_layout(self, rrg):
+        segment_x, segment_y, first_wire, _, _ = self.segment_coords(rrg)
+        segment_first_wire = {}
+        for x, y, wire_id in zip(segment_x.tolist(), segment_y.tolist(), first_wire.tolist()):
+            segment_first_wire[(x, y)] = wire_id
 
-        # Za svaki segment prebroji zice sa wire_load > 0
-        segment_usage = {}
-        for coord, wire_ids in segment_wires.items():
-            used_count = sum(1 for wid in wire_ids if wire_load[wid] > 0)
-            total_count = len(wire_ids)
-            segment_usage[coord] = (used_count, total_count)
-
-        # Vizualizuj na gridu
-        for coord, (used, total) in segment_usage.items():
+        layout = []
+        for coord, wire_id in segment_first_wire.items():
             x, y = coord
-            wire_ids = segment_wires[coord]
-            wire_type = rrg.nodes[wire_ids[0]].type if wire_ids else 'CHANX'
-            
+            node = rrg.nodes[wire_id]
+            wire_type = node.type
+
             # IO kanali detektuj po xlow/ylow (ako imas pristup node-u)
             io_channel = False
-            node = rrg.nodes[wire_ids[0]]
-            num_rows = getattr(self, 'num_rows', 6)
-            num_cols = getattr(self, 'num_cols', 6)
+            num_rows = self.num_rows
+            num_cols = self.num_cols
             if wire_type == 'CHANX' and (node.ylow == 0 or node.ylow == num_rows):
                 io_channel = True
             if wire_type == 'CHANY' and (node.xlow == 0 or node.xlow == num_cols):
@@ -164,77 +187,5 @@ class FPGAWires(FPGAMatrix):
                 ha = 'center'
                 va = 'center'
 
-            usage_ratio = used / total if total else 0
-            color = cm.Reds(usage_ratio)
-            
-            rect = mpatches.Rectangle(
-                (rect_x, rect_y),
-                rect_w, rect_h,
-                linewidth=0, edgecolor=None,
-                facecolor=color, alpha=0.38, zorder=6
-            )
-            self.ax.add_patch(rect)
-            
-            self.ax.text(
-                text_x, text_y,
-                f"{used}/{total}",
-                ha=ha, va=va,
-                fontsize=14, color='black', fontweight='bold'
-            )
-
-        if iteration == 0:
-            self.ax.set_title("Broj zauzetih žica po segmentu - Finalna iteracija")
-        else:
-            self.ax.set_title(f"Broj zauzetih žica po segmentu - Iteracija broj {iteration}")
-
-        return segment_usage
-    
-    def get_segment_coord(self, node):
-        num_rows = getattr(self, 'num_rows', 6)
-        num_cols = getattr(self, 'num_cols', 6)
-        start_clb_x = self.io_size + self.io_clb_gap
-        start_clb_y = self.io_size + self.io_clb_gap
-        cell_w = self.clb_size + self.clb_channel_gap
-        cell_h = self.clb_size + self.clb_channel_gap
-        channel_x_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
-        channel_y_inner_offset = (self.clb_channel_gap / 2) - (self.channel_width / 2)
-
-        if node.type == 'CHANX':
-            if node.ylow == 0 or node.ylow == num_rows:
-                # IO<->CLB horizontalni kanali
-                # koristi koordinate bez ptc offseta!
-                if node.ylow == 0:
-                    y_pos = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
-                    x_base = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
-                    return (x_base, y_pos)
-                elif node.ylow == num_rows:
-                    y_io_top = start_clb_y + num_rows * (self.clb_size + self.clb_channel_gap)
-                    y_pos = y_io_top - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
-                    x_base = start_clb_x + (node.xlow - 1) * (self.clb_size + self.clb_channel_gap)
-                    return (x_base, y_pos)
-                return None
-            x_base = start_clb_x + (node.xlow - 1) * cell_w
-            y_channel = start_clb_y + (node.ylow - 1) * cell_h + self.clb_size + channel_y_inner_offset
-            visual_x = x_base + self.clb_size / 2
-            visual_y = y_channel
-            return (visual_x, visual_y)
-        elif node.type == 'CHANY':
-            if node.xlow == 0 or node.xlow == num_cols:
-                # IO<->CLB vertikalni kanali
-                # koristi koordinate bez ptc offseta!
-                if node.xlow == 0:
-                    x_pos = self.io_size + (self.io_clb_gap / 2) - (self.channel_width / 2)
-                    y_base = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
-                    return (x_pos, y_base)
-                elif node.xlow == num_cols:
-                    x_io_right = start_clb_x + num_cols * (self.clb_size + self.clb_channel_gap)
-                    x_pos = x_io_right - self.io_clb_gap + (self.io_clb_gap / 2) - (self.channel_width / 2)
-                    y_base = start_clb_y + (node.ylow - 1) * (self.clb_size + self.clb_channel_gap)
-                    return (x_pos, y_base)
-                return None
-            x_channel = start_clb_x + (node.xlow - 1) * cell_w + self.clb_size + channel_x_inner_offset
-            y_base = start_clb_y + (node.ylow - 1) * cell_h
-            visual_x = x_channel
-            visual_y = y_base + self.clb_size / 2
-            return (visual_x, visual_y)
-        return None
+            layout.append((coord, (rect_x, rect_y), rect_w, rect_h, text_x, text_y, ha, va))
+        return layout
@@ -1,8 +1,14 @@
-from typing import Dict, List
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 
 class Node:
-    def __init__(self, node_id, node_type, ptc, xhigh, xlow, yhigh, ylow):
+    __slots__ = ("id", "type", "ptc", "xhigh", "xlow", "yhigh", "ylow", "side", "capacity")
+
+    def __init__(self, node_id, node_type, ptc, xhigh, xlow, yhigh, ylow, side=None, capacity=1):
         self.id = node_id
         # IPIN, sto oznacava ulazni pin (u arhitekturama koje cemo mi koristiti, ulazni pin klastera ili IO bloka),
         # OPIN, sto oznacava izlazni pin (u arhitekturama koje cemo mi koristiti, izlazni pin klastera ili IO bloka),
@@ -18,6 +24,10 @@ class Node:
         self.xlow = xlow
         self.yhigh = yhigh
         self.ylow = ylow
+        # strana bloka na kojoj je pin ("TOP", "TOP_RIGHT" itd.), samo za IPIN/OPIN, inace None
+        self.side = side
+        # broj signala koji smeju istovremeno da koriste cvor (za SOURCE/SINK broj ekvivalentnih pinova)
+        self.capacity = capacity
 
     def __str__(self):
         return (f"Node(id={self.id}, type={self.type}, ptc={self.ptc}, "
@@ -26,26 +36,171 @@ class Node:
 
 
 class Edge:
-    def __init__(self, sink, src):
+    __slots__ = ("sink", "src", "switch")
+
+    def __init__(self, sink, src, switch=None):
         # id uvorisnog cvora
         self.sink = sink
         # id izvorisnog cvora
         self.src = src
+        # id prekidaca (switch_id) preko kog grana vodi, None ako nije poznat
+        self.switch = switch
 
     def __str__(self):
         return f"Edge(sink={self.sink}, src={self.src})"
 
 
+class Switch:
+    def __init__(self, switch_id, name, switch_type, tdel=0.0):
+        self.id = switch_id
+        self.name = name
+        # mux, tristate, short, buffer...
+        self.type = switch_type
+        # intrinsicno kasnjenje prekidaca u sekundama (<timing Tdel>), 0 ako nije navedeno
+        self.tdel = tdel
+
+    def __str__(self):
+        return f"Switch(id={self.id}, name={self.name}, type={self.type}, Tdel={self.tdel})"
+
+
+# CSR (compressed sparse row) iz parova (red, kolona): indptr duzine n + 1, kolone sortirane po redu.
+# edge_order[k] je redni broj grane koja je na poziciji k u indices
+def csr_from_pairs(rows: np.ndarray, cols: np.ndarray, n: int):
+    edge_order = np.argsort(rows, kind="stable")
+    indices = cols[edge_order].astype(np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, indices, edge_order.astype(np.int32)
+
+
 class RRG:
     def __init__(self):
         self.nodes: Dict[int, Node] = {}
         self.edges: List[Edge] = []
+        self.switches: Dict[int, Switch] = {}
+        # <channels>, <block_types> i <grid> iz rrg.xml: broj staza u kanalu, id tipa bloka -> ime
+        # i (x, y) -> id tipa bloka za svaku lokaciju matrice (ukljucujuci IO prsten)
+        self.chan_width_max: Optional[int] = None
+        self.block_types: Dict[int, str] = {}
+        self.grid: Dict[Tuple[int, int], int] = {}
+
+        # gusti indeksi: node_ids[i] je id cvora sa indeksom i (rastuce sortirano)
+        self.node_ids = None
+        # True kada su id-jevi 0..n-1, pa je indeks jednak id-ju
+        self.dense_ids = False
+        # fan-out: sledbenici cvora i su fanout_indices[fanout_indptr[i]:fanout_indptr[i + 1]]
+        self.fanout_indptr = None
+        self.fanout_indices = None
+        self.fanout_edges = None
+        # fan-in: prethodnici, isti raspored
+        self.fanin_indptr = None
+        self.fanin_indices = None
+        self.fanin_edges = None
+        # kolonski oblik grafa (vidi arrays())
+        self.array_view = None
 
     def add_node(self, node: Node) -> None:
         self.nodes[node.id] = node
+        self.node_ids = None
+        self.array_view = None
 
     def add_edge(self, edge: Edge) -> None:
         self.edges.append(edge)
+        self.node_ids = None
+        self.array_view = None
+
+    def add_switch(self, switch: Switch) -> None:
+        self.switches[switch.id] = switch
+
+    def add_grid_location(self, x: int, y: int, block_type_id: int) -> None:
+        self.grid[(x, y)] = block_type_id
+
+    # (sirina, visina) matrice u RR koordinatama, ukljucujuci IO prsten; None ako <grid> nije ucitan
+    def grid_size(self) -> Optional[Tuple[int, int]]:
+        if not self.grid:
+            return None
+        return max(x for x, _ in self.grid) + 1, max(y for _, y in self.grid) + 1
+
+    def block_type_at(self, x: int, y: int) -> Optional[str]:
+        block_type_id = self.grid.get((x, y))
+        return self.block_types.get(block_type_id) if block_type_id is not None else None
+
+    # id-jevi izvora i odredista svih grana, redom kojim su grane dodate
+    def edge_arrays(self):
+        src = np.fromiter((e.src for e in self.edges), dtype=np.int64, count=len(self.edges))
+        sink = np.fromiter((e.sink for e in self.edges), dtype=np.int64, count=len(self.edges))
+        return src, sink
+
+    def sorted_node_ids(self) -> np.ndarray:
+        return np.array(sorted(self.nodes), dtype=np.int64)
+
+    # pravi fan-out i fan-in CSR nizove, poziva se jednom posle parsiranja
+    def build_adjacency(self) -> None:
+        self.node_ids = self.sorted_node_ids()
+        n = len(self.node_ids)
+        self.dense_ids = n == 0 or int(self.node_ids[-1]) == n - 1
+
+        edge_src, edge_sink = self.edge_arrays()
+        src = self.index_of(edge_src)
+        sink = self.index_of(edge_sink)
+
+        # grane ka cvorovima kojih nema u rr_nodes se preskacu
+        valid = np.flatnonzero((src >= 0) & (sink >= 0))
+        src, sink = src[valid], sink[valid]
+
+        self.fanout_indptr, self.fanout_indices, order = csr_from_pairs(src, sink, n)
+        self.fanout_edges = valid[order].astype(np.int32)
+        self.fanin_indptr, self.fanin_indices, order = csr_from_pairs(sink, src, n)
+        self.fanin_edges = valid[order].astype(np.int32)
+
+    # id cvora (ili niz id-jeva) -> gusti indeks, -1 ako cvor ne postoji
+    def index_of(self, node_ids):
+        if self.node_ids is None:
+            self.build_adjacency()
+        n = len(self.node_ids)
+
+        if self.dense_ids and isinstance(node_ids, (int, np.integer)):
+            return int(node_ids) if 0 <= node_ids < n else -1
+
+        ids = np.asarray(node_ids, dtype=np.int64)
+        if n == 0:
+            result = np.full(ids.shape, -1, dtype=np.int64)
+        elif self.dense_ids:
+            result = np.where((ids >= 0) & (ids < n), ids, -1)
+        else:
+            pos = np.minimum(np.searchsorted(self.node_ids, ids), n - 1)
+            result = np.where(self.node_ids[pos] == ids, pos, -1)
+        return int(result) if result.ndim == 0 else result
+
+    # id-jevi cvorova u koje vodi grana iz node_id
+    def successors(self, node_id: int) -> np.ndarray:
+        i = self.index_of(node_id)
+        if i < 0:
+            return np.empty(0, dtype=np.int64)
+        return self.node_ids[self.fanout_indices[self.fanout_indptr[i]:self.fanout_indptr[i + 1]]]
+
+    # id-jevi cvorova iz kojih vodi grana u node_id
+    def predecessors(self, node_id: int) -> np.ndarray:
+        i = self.index_of(node_id)
+        if i < 0:
+            return np.empty(0, dtype=np.int64)
+        return self.node_ids[self.fanin_indices[self.fanin_indptr[i]:self.fanin_indptr[i + 1]]]
+
+    # isti graf u kolonskom (ArrayRRG) obliku, pravi se jednom i pamti
+    def arrays(self) -> "ArrayRRG":
+        if self.array_view is None:
+            array_rrg = ArrayRRG()
+            for node_id in sorted(self.nodes):
+                array_rrg.add_node(self.nodes[node_id])
+            for edge in self.edges:
+                array_rrg.add_edge(edge)
+            array_rrg.switches = self.switches
+            array_rrg.chan_width_max = self.chan_width_max
+            array_rrg.block_types = self.block_types
+            array_rrg.grid = self.grid
+            array_rrg.build_adjacency()
+            self.array_view = array_rrg
+        return self.array_view
 
     def __str__(self):
         result = ["RRG:"]
@@ -58,16 +213,255 @@ class RRG:
         return "\n".join(result)
 
 
+# pogled na cvorove ArrayRRG-a kao na dict id -> Node; Node objekat se pravi tek pri pristupu
+class NodeTable(Mapping):
+    def __init__(self, rrg: "ArrayRRG"):
+        self.rrg = rrg
+
+    def __getitem__(self, node_id) -> Node:
+        rrg = self.rrg
+        i = rrg.index_of(node_id) if isinstance(node_id, (int, np.integer)) else -1
+        if i < 0:
+            raise KeyError(node_id)
+        side = rrg.sides[i]
+        return Node(int(rrg.node_ids[i]), rrg.type_names[rrg.types[i]], int(rrg.ptc[i]),
+                    int(rrg.xhigh[i]), int(rrg.xlow[i]), int(rrg.yhigh[i]), int(rrg.ylow[i]),
+                    rrg.side_names[side] if side else None, int(rrg.capacity[i]))
+
+    def __contains__(self, node_id) -> bool:
+        return isinstance(node_id, (int, np.integer)) and self.rrg.index_of(node_id) >= 0
+
+    def __iter__(self):
+        return iter(self.rrg.arrays().node_ids.tolist())
+
+    def __len__(self) -> int:
+        return len(self.rrg.arrays().node_ids)
+
+
+# pogled na grane ArrayRRG-a kao na listu Edge objekata
+class EdgeTable(Sequence):
+    def __init__(self, rrg: "ArrayRRG"):
+        self.rrg = rrg
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        self.rrg.flush_pending()
+        switch = int(self.rrg.edge_switch[k])
+        return Edge(int(self.rrg.edge_sink[k]), int(self.rrg.edge_src[k]), switch if switch >= 0 else None)
+
+    def __len__(self) -> int:
+        self.rrg.flush_pending()
+        return len(self.rrg.edge_src)
+
+
+# RRG cije su kolone NumPy nizovi (struct-of-arrays) umesto po jednog Node objekta po cvoru.
+# nodes i edges su pogledi (NodeTable, EdgeTable), pa postojeci kod koji radi sa rrg.nodes[id] radi isto
+class ArrayRRG(RRG):
+    COORD_DTYPE = np.int32
+
+    def __init__(self):
+        super().__init__()
+        self.nodes = NodeTable(self)
+        self.edges = EdgeTable(self)
+
+        # tipovi i strane se cuvaju kao uint8 kodovi; side 0 znaci "nema strane"
+        self.type_names: List[str] = []
+        self.side_names: List[str] = [None]
+
+        empty = np.empty(0, dtype=self.COORD_DTYPE)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.types = np.empty(0, dtype=np.uint8)
+        self.sides = np.empty(0, dtype=np.uint8)
+        self.ptc = self.xlow = self.xhigh = self.ylow = self.yhigh = empty
+        self.capacity = np.empty(0, dtype=np.uint16)
+        self.edge_src = np.empty(0, dtype=self.COORD_DTYPE)
+        self.edge_sink = np.empty(0, dtype=self.COORD_DTYPE)
+        # -1 kada switch grane nije poznat
+        self.edge_switch = np.empty(0, dtype=np.int16)
+
+        # baferi za add_node/add_edge, prebacuju se u nizove u build_adjacency
+        self.pending_nodes = None
+        self.pending_edges = None
+
+    @classmethod
+    def from_arrays(cls, node_ids, types, type_names, ptc, xlow, xhigh, ylow, yhigh,
+                    sides, side_names, edge_src, edge_sink, edge_switch, switches=None,
+                    adjacency=None, chan_width_max=None, block_types=None, grid=None,
+                    capacity=None) -> "ArrayRRG":
+        rrg = cls()
+        rrg.ids, rrg.types, rrg.ptc = node_ids, types, ptc
+        # bez kolone kapaciteta (stariji pozivi) svaki cvor ima kapacitet 1
+        rrg.capacity = capacity if capacity is not None else np.ones(len(node_ids), dtype=np.uint16)
+        rrg.xlow, rrg.xhigh, rrg.ylow, rrg.yhigh = xlow, xhigh, ylow, yhigh
+        rrg.sides, rrg.type_names, rrg.side_names = sides, list(type_names), list(side_names)
+        rrg.edge_src, rrg.edge_sink, rrg.edge_switch = edge_src, edge_sink, edge_switch
+        rrg.switches = dict(switches or {})
+        rrg.chan_width_max = chan_width_max
+        rrg.block_types = dict(block_types or {})
+        rrg.grid = dict(grid or {})
+        if adjacency is None:
+            rrg.build_adjacency()
+        else:
+            # CSR vec izracunat (npr. iz kesa), samo se postavi
+            for name, value in adjacency.items():
+                setattr(rrg, name, value)
+            rrg.node_ids = rrg.ids
+            rrg.dense_ids = len(rrg.ids) == 0 or int(rrg.ids[-1]) == len(rrg.ids) - 1
+        return rrg
+
+    def code_of(self, names: List[str], name: str) -> int:
+        try:
+            return names.index(name)
+        except ValueError:
+            names.append(name)
+            return len(names) - 1
+
+    def add_node(self, node: Node) -> None:
+        if self.pending_nodes is None:
+            self.pending_nodes = {
+                "id": array("q", self.ids.tobytes()),
+                "type": array("B", self.types.tobytes()),
+                "side": array("B", self.sides.tobytes()),
+                "ptc": array("i", self.ptc.tobytes()),
+                "xlow": array("i", self.xlow.tobytes()),
+                "xhigh": array("i", self.xhigh.tobytes()),
+                "ylow": array("i", self.ylow.tobytes()),
+                "yhigh": array("i", self.yhigh.tobytes()),
+                "capacity": array("H", self.capacity.tobytes()),
+            }
+        pending = self.pending_nodes
+        pending["id"].append(node.id)
+        pending["type"].append(self.code_of(self.type_names, node.type))
+        pending["side"].append(self.code_of(self.side_names, node.side) if node.side else 0)
+        pending["ptc"].append(node.ptc)
+        pending["xlow"].append(node.xlow)
+        pending["xhigh"].append(node.xhigh)
+        pending["ylow"].append(node.ylow)
+        pending["yhigh"].append(node.yhigh)
+        pending["capacity"].append(node.capacity)
+        self.node_ids = None
+
+    def add_edge(self, edge: Edge) -> None:
+        if self.pending_edges is None:
+            self.pending_edges = (array("i", self.edge_src.tobytes()), array("i", self.edge_sink.tobytes()),
+                                  array("h", self.edge_switch.tobytes()))
+        self.pending_edges[0].append(edge.src)
+        self.pending_edges[1].append(edge.sink)
+        self.pending_edges[2].append(edge.switch if edge.switch is not None else -1)
+        self.node_ids = None
+
+    # prebacuje bafere u NumPy nizove sortirane po id-ju cvora
+    def flush_pending(self) -> None:
+        if self.pending_nodes is not None:
+            pending = self.pending_nodes
+            ids = np.frombuffer(pending["id"], dtype=np.int64)
+            order = np.argsort(ids, kind="stable")
+            self.ids = ids[order]
+            self.types = np.frombuffer(pending["type"], dtype=np.uint8)[order]
+            self.sides = np.frombuffer(pending["side"], dtype=np.uint8)[order]
+            self.ptc = np.frombuffer(pending["ptc"], dtype=self.COORD_DTYPE)[order]
+            self.xlow = np.frombuffer(pending["xlow"], dtype=self.COORD_DTYPE)[order]
+            self.xhigh = np.frombuffer(pending["xhigh"], dtype=self.COORD_DTYPE)[order]
+            self.ylow = np.frombuffer(pending["ylow"], dtype=self.COORD_DTYPE)[order]
+            self.yhigh = np.frombuffer(pending["yhigh"], dtype=self.COORD_DTYPE)[order]
+            self.capacity = np.frombuffer(pending["capacity"], dtype=np.uint16)[order]
+            self.pending_nodes = None
+
+        if self.pending_edges is not None:
+            self.edge_src = np.array(self.pending_edges[0], dtype=self.COORD_DTYPE)
+            self.edge_sink = np.array(self.pending_edges[1], dtype=self.COORD_DTYPE)
+            self.edge_switch = np.array(self.pending_edges[2], dtype=np.int16)
+            self.pending_edges = None
+
+    def edge_arrays(self):
+        return self.edge_src.astype(np.int64), self.edge_sink.astype(np.int64)
+
+    def sorted_node_ids(self) -> np.ndarray:
+        return self.ids
+
+    def build_adjacency(self) -> None:
+        self.flush_pending()
+        super().build_adjacency()
+
+    def arrays(self) -> "ArrayRRG":
+        if self.node_ids is None:
+            self.build_adjacency()
+        return self
+
+    # kod tipa cvora (npr. "CHANX") ili -1 ako se tip ne pojavljuje u grafu
+    def type_code(self, node_type: str) -> int:
+        return self.type_names.index(node_type) if node_type in self.type_names else -1
+
+
+# stablo rutiranja jednog signala. VPR .route zapisuje stablo u dubinu, pri cemu se tacka grananja
+# ponavlja kao prva linija svake nove grane; ovde se svaki RR cvor cuva samo jednom
+# (osim SINK-a do kog signal stize vise puta, on je svaki put poseban list)
 class Net:
     def __init__(self, net_id):
         # id signala
         self.id = net_id
-        self.nodes: List[Node] = []
+        # id-jevi RR cvorova u stablu, redom prvog pojavljivanja; koren (SOURCE) je na indeksu 0
+        self.node_ids = array("i")
+        # indeks roditelja u node_ids, -1 za koren
+        self.parent = array("i")
+        # switch (id iz <switches>) preko kog se iz roditelja ulazi u cvor, -1 za koren
+        self.switch = array("h")
+        # Net_pin_index za SINK cvorove, -1 za ostale
+        self.net_pin_index = array("h")
+
+    def add_node(self, node_id: int, parent: int, switch: int, net_pin_index: int = -1) -> int:
+        self.node_ids.append(node_id)
+        self.parent.append(parent)
+        self.switch.append(switch)
+        self.net_pin_index.append(net_pin_index)
+        return len(self.node_ids) - 1
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    # indeksi dece za svaki cvor, redom kojim su dodata
+    def children(self) -> List[List[int]]:
+        children = [[] for _ in range(len(self.node_ids))]
+        for i, p in enumerate(self.parent):
+            if p >= 0:
+                children[p].append(i)
+        return children
+
+    # putanja kao u .route fajlu: obilazak u dubinu gde se tacka grananja ponavlja pre svake nove grane
+    def path(self) -> List[int]:
+        node_ids = self.node_ids
+        return [node_ids[i] for i in self.path_indices()]
+
+    # isti obilazak kao path(), ali kao indeksi u node_ids
+    def path_indices(self) -> List[int]:
+        if not self.node_ids:
+            return []
+
+        children = self.children()
+        order = [0]
+        stack = [[0, 0]]
+        while stack:
+            top = stack[-1]
+            node_children = children[top[0]]
+            if top[1] < len(node_children):
+                if top[1] > 0:
+                    order.append(top[0])
+                child = node_children[top[1]]
+                top[1] += 1
+                order.append(child)
+                stack.append([child, 0])
+            else:
+                stack.pop()
+        return order
 
     def __str__(self):
         result = [f"Net {self.id}:"]
-        for node in self.nodes:
-            result.append(f"  {node}")
+        for i, node_id in enumerate(self.node_ids):
+            line = f"  Node {node_id} parent={self.parent[i]} switch={self.switch[i]}"
+            if self.net_pin_index[i] >= 0:
+                line += f" net_pin_index={self.net_pin_index[i]}"
+            result.append(line)
         return "\n".join(result)
 
 
@@ -86,3 +480,99 @@ class Route:
                     continue
                 result.append(f"    {line}")
         return "\n".join(result)
+
+
+# ceo Route u nekoliko ravnih nizova: cvorovi svih signala jedan za drugim, signal k zauzima
+# [offsets[k], offsets[k + 1]). parent je lokalni indeks unutar signala (kao u Net.parent).
+# Ovakav oblik se jeftino salje izmedju procesa i direktno koristi u NumPy racunu
+class PackedRoute:
+    def __init__(self, net_numbers, net_names, offsets, node_ids, parent, switch, net_pin_index):
+        # redni brojevi signala (kljucevi Route.nets), redom kao u fajlu
+        self.net_numbers = net_numbers
+        self.net_names: List[str] = net_names
+        self.offsets = offsets
+        self.node_ids = node_ids
+        self.parent = parent
+        self.switch = switch
+        self.net_pin_index = net_pin_index
+
+    @classmethod
+    def from_route(cls, route: Route) -> "PackedRoute":
+        nets = list(route.nets.values())
+        sizes = np.fromiter((len(net) for net in nets), dtype=np.int64, count=len(nets))
+        offsets = np.zeros(len(nets) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        def concat(field, dtype):
+            if not nets:
+                return np.empty(0, dtype=dtype)
+            return np.concatenate([np.frombuffer(getattr(net, field), dtype=dtype) for net in nets])
+
+        return cls(np.fromiter(route.nets.keys(), dtype=np.int32, count=len(nets)),
+                   [net.id for net in nets], offsets,
+                   concat("node_ids", np.int32), concat("parent", np.int32),
+                   concat("switch", np.int16), concat("net_pin_index", np.int16))
+
+    def to_route(self) -> Route:
+        route = Route()
+        for k, net_number in enumerate(self.net_numbers.tolist()):
+            net = Net(self.net_names[k])
+            part = self.net_slice(k)
+            net.node_ids = array("i", self.node_ids[part].astype(np.int32).tobytes())
+            net.parent = array("i", self.parent[part].astype(np.int32).tobytes())
+            net.switch = array("h", self.switch[part].astype(np.int16).tobytes())
+            net.net_pin_index = array("h", self.net_pin_index[part].astype(np.int16).tobytes())
+            route.nets[net_number] = net
+        return route
+
+    def net_slice(self, k: int) -> slice:
+        return slice(int(self.offsets[k]), int(self.offsets[k + 1]))
+
+    # ruta samo sa signalima `nets` (redni indeksi k), tim redom
+    def select(self, nets) -> "PackedRoute":
+        nets = np.asarray(nets, dtype=np.int64)
+        sizes = self.offsets[nets + 1] - self.offsets[nets]
+        offsets = np.zeros(len(nets) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        positions = np.repeat(self.offsets[nets] - offsets[:-1], sizes) + np.arange(offsets[-1])
+        return PackedRoute(self.net_numbers[nets], [self.net_names[k] for k in nets.tolist()], offsets,
+                           self.node_ids[positions], self.parent[positions], self.switch[positions],
+                           self.net_pin_index[positions])
+
+    # True za SINK cvorove rute: po Net_pin_index, a cvor bez te anotacije (npr. .route bez Net_pin_index)
+    # je SINK ako je tog tipa u RRG-u
+    def sink_mask(self, rrg: RRG) -> np.ndarray:
+        arrays = rrg.arrays()
+        index = arrays.index_of(self.node_ids)
+        known = index >= 0
+        is_sink = known & (arrays.types[np.where(known, index, 0)] == arrays.type_code("SINK"))
+        return (self.net_pin_index >= 0) | is_sink
+
+    # redni broj signala (k) za svaki cvor u node_ids
+    def net_of_node(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.net_numbers), dtype=np.int32), np.diff(self.offsets))
+
+    # roditelj svakog cvora kao globalni indeks u node_ids; koren pokazuje na sebe
+    def global_parent(self) -> np.ndarray:
+        parent = self.parent.astype(np.int64)
+        start = np.repeat(self.offsets[:-1], np.diff(self.offsets))
+        return np.where(parent >= 0, start + parent, np.arange(len(parent)))
+
+    # dubina svakog cvora u stablu svog signala (broj grana od SOURCE-a), za sve signale odjednom:
+    # pointer jumping, pa je broj NumPy prolaza log2 najvece dubine umesto same dubine
+    def depths(self) -> np.ndarray:
+        ancestor = self.global_parent()
+        depth = (self.parent >= 0).astype(np.int64)
+        is_root = ancestor == np.arange(len(ancestor))
+        while not is_root[ancestor].all():
+            depth += depth[ancestor]
+            ancestor = ancestor[ancestor]
+        return depth
+
+    def __len__(self):
+        return len(self.net_numbers)
+
+
+# Route ili PackedRoute -> PackedRoute
+def as_packed(route) -> PackedRoute:
+    return route if isinstance(route, PackedRoute) else PackedRoute.from_route(route)
@@ -0,0 +1,171 @@
+from io import BytesIO
+
+import numpy as np
+from matplotlib import animation
+from matplotlib.collections import PolyCollection
+from PIL import Image
+
+from .background import fit_to_tight_bbox, freeze_background
+from .fpga_wires import FPGAWires
+from .occupancy import wire_mask
+from .route_diff import walk_iterations
+
+MOVIE_VIEWS = ("congestion", "segment-usage")
+
+
+# GIF writer (Pillow) koji svaki frejm odmah prebacuje u paletu (1 bajt po pikselu umesto 4 za RGBA),
+# da bi stotine frejmova stale u memoriju do finish(). Paleta se pravi jednom, iz prvog frejma (pozadina,
+# legenda i skala boja su u svim frejmovima iste), pa iste boje ne trepere izmedju frejmova. Frejmove
+# cuva sam, bez unutrasnjosti PillowWriter-a
+class PalettePillowWriter(animation.AbstractMovieWriter):
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi=dpi)
+        self.frames = []
+        self.palette = None
+
+    def grab_frame(self, **savefig_kwargs):
+        buffer = BytesIO()
+        self.fig.savefig(buffer, **{**savefig_kwargs, "format": "rgba", "dpi": self.dpi})
+        image = Image.frombuffer("RGBA", self.frame_size, buffer.getbuffer(), "raw", "RGBA", 0, 1).convert("RGB")
+        if self.palette is None:
+            self.palette = image.quantize(method=Image.Quantize.FASTOCTREE)
+        # i prvi frejm ide kroz istu paletu, bez ditheringa: ista boja u svakom frejmu ima isti indeks
+        self.frames.append(image.quantize(palette=self.palette, dither=Image.Dither.NONE))
+
+    def finish(self):
+        self.frames[0].save(self.outfile, save_all=True, append_images=self.frames[1:],
+                            duration=int(1000 / self.fps), loop=0)
+
+
+# animacija konvergencije rutiranja kroz iteracije: jedna figura, matrica i legenda se renderuju jednom
+# (freeze_background), a za svaku iteraciju se samo menjaju boje (set_array) i tekstovi istih artista.
+# Vrednosti svih iteracija se racunaju unapred (walk_iterations, zauzetost se azurira samo za promenjene
+# signale), pa je frejm samo crtanje sloja
+class ConvergenceMovie(FPGAWires):
+    def __init__(self):
+        super().__init__()
+        # (broj iteracije, vrednosti po markeru/segmentu, maksimum za skalu boja)
+        self.frames = []
+        self.view = None
+        self.layout = None
+        self.values = None
+        self.totals = None
+        self.labels = []
+
+    # routes: parovi (broj iteracije, Route/PackedRoute), redom kojim idu u film
+    def prepare(self, rrg, routes, view="congestion"):
+        if view not in MOVIE_VIEWS:
+            raise ValueError(f"Nepoznat prikaz za film: {view}")
+        self.visualize_matrix(rrg)
+        self.view = view
+        is_wire = wire_mask(rrg)
+
+        if view == "congestion":
+            layout = self.wire_label_layout(rrg, np.flatnonzero(is_wire))
+            wire_ids = np.array([item[0] for item in layout], dtype=np.int64)
+            for iteration, _, metrics in walk_iterations(rrg, routes, self.coord_map):
+                occupancy = metrics.wire_load
+                wire_load = occupancy[is_wire]
+                # ista skala kao visualize_wire_congestion: najopterecenija zica u iteraciji
+                max_load = int(wire_load.max()) if len(wire_load) and wire_load.max() > 0 else 1
+                self.frames.append((iteration, occupancy[wire_ids], max_load))
+        else:
+            layout = self.segment_label_layout(rrg)
+            # segment_usage u visualize_segment_wire_usage je dict po koordinati, pa vazi poslednji segment
+            index = {}
+            segment_x, segment_y, _, total_counts = self.segment_usage_counts(rrg, np.zeros(len(is_wire)))
+            for i, coord in enumerate(zip(segment_x.tolist(), segment_y.tolist())):
+                index[coord] = i
+            segments = np.array([index[item[0]] for item in layout], dtype=np.int64)
+            self.totals = total_counts[segments]
+            for iteration, _, metrics in walk_iterations(rrg, routes, self.coord_map):
+                used_counts = self.segment_usage_counts(rrg, metrics.wire_load)[2]
+                self.frames.append((iteration, used_counts[segments], 1))
+        self.layout = layout
+
+    def create_artists(self, labels=True):
+        if self.view == "congestion":
+            self.create_congestion_artists(self.layout)
+        else:
+            self.create_segment_artists(self.layout)
+        for label in self.labels:
+            label.set_visible(labels)
+
+    def create_congestion_artists(self, layout):
+        x = [item[1] for item in layout]
+        y = [item[2] for item in layout]
+        self.values = self.ax.scatter(x, y, c=np.zeros(len(layout)), cmap='Blues', vmin=0, vmax=1,
+                                      edgecolors='gray', linewidths=1, s=20, zorder=10)
+        self.labels = [self.ax.text(text_x, text_y, '', ha=ha, va=va, fontsize=6, color='black')
+                       for _, _, _, text_x, text_y, ha, va in layout]
+
+    def create_segment_artists(self, layout):
+        rectangles = [[(x, y), (x + w, y), (x + w, y + h), (x, y + h)] for _, (x, y), w, h, *_ in layout]
+        self.values = PolyCollection(rectangles, cmap='Reds', linewidths=0, edgecolors='none',
+                                     alpha=0.38, zorder=6)
+        self.values.set_array(np.zeros(len(layout)))
+        self.values.set_clim(0, 1)
+        self.ax.add_collection(self.values, autolim=False)
+        self.labels = [self.ax.text(text_x, text_y, '', ha=ha, va=va, fontsize=14, color='black',
+                                    fontweight='bold')
+                       for _, _, _, _, text_x, text_y, ha, va in layout]
+
+    # FuncAnimation callback: samo azurira postojece artiste
+    def draw_frame(self, index):
+        iteration, values, max_load = self.frames[index]
+        if self.view == "congestion":
+            self.values.set_array(values)
+            self.values.set_clim(0, max_load)
+            for label, load in zip(self.labels, values.tolist()):
+                label.set_text(str(load))
+            title = "Zagušenje po žicama"
+        else:
+            self.values.set_array(np.divide(values, self.totals, out=np.zeros(len(values)),
+                                            where=self.totals > 0))
+            for label, used, total in zip(self.labels, values.tolist(), self.totals.tolist()):
+                label.set_text(f"{used}/{total}")
+            title = "Broj zauzetih žica po segmentu"
+
+        if iteration == 0:
+            self.ax.set_title(f"{title} - Finalna iteracija")
+        else:
+            self.ax.set_title(f"{title} - Iteracija broj {iteration}")
+        return [self.values, *self.labels, self.ax.title]
+
+    # legenda je van ose; figura se jednom prosiri kao za bbox_inches='tight' i zaokruzi na paran broj
+    # piksela (h264), pa se tek onda zamrzne pozadina, da writer vise ne bi menjao velicinu
+    def prepare_figure(self, dpi=100, labels=True):
+        self.fig.set_dpi(dpi)
+        fit_to_tight_bbox(self.fig, self.ax)
+        self.fig.set_size_inches(*animation.adjusted_figsize(*self.fig.get_size_inches(), dpi, 2))
+        freeze_background(self.fig, self.ax)
+        self.create_artists(labels)
+
+    # cuva film kao MP4 (ffmpeg) ili GIF (Pillow); bez ffmpeg-a MP4 prelazi u GIF. labels=False ne crta
+    # brojeve uz zice/segmente (najskuplji deo frejma). Vraca ime sacuvanog fajla
+    def save_movie(self, filename: str, fps=5, dpi=100, labels=True) -> str:
+        if not self.frames:
+            print("Nema iteracija za film")
+            return None
+
+        if not filename.endswith(".gif") and not animation.writers.is_available("ffmpeg"):
+            filename = filename.rsplit(".", 1)[0] + ".gif"
+            print(f"ffmpeg nije dostupan, film se cuva kao GIF: {filename}")
+        if filename.endswith(".gif"):
+            writer = PalettePillowWriter(fps=fps)
+        else:
+            writer = animation.FFMpegWriter(fps=fps)
+
+        self.prepare_figure(dpi, labels)
+        # isto sto i FuncAnimation.save, ali bez dodatnog draw_idle crtanja posle svakog frejma
+        with writer.saving(self.fig, filename, dpi):
+            for index in range(len(self.frames)):
+                self.draw_frame(index)
+                writer.grab_frame()
+        return filename
+
+    # interaktivni pregled (plt.show()); blit crta samo artiste koje vraca draw_frame
+    def animate(self, interval=200, labels=True):
+        self.prepare_figure(self.fig.dpi, labels)
+        return animation.FuncAnimation(self.fig, self.draw_frame, frames=len(self.frames),
+                                       interval=interval, blit=True)
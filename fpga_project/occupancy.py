@@ -0,0 +1,84 @@
+from typing import Dict, Set
+
+import numpy as np
+
+from .models import PackedRoute, RRG, as_packed
+
+
+# True za CHANX/CHANY cvorove, indeks = id cvora
+def wire_mask(rrg: RRG) -> np.ndarray:
+    arrays = rrg.arrays()
+    size = int(arrays.ids.max()) + 1 if len(arrays.ids) else 0
+    is_wire = np.zeros(size, dtype=bool)
+    wire_codes = [arrays.type_code("CHANX"), arrays.type_code("CHANY")]
+    is_wire[arrays.ids[np.isin(arrays.types, wire_codes)]] = True
+    return is_wire
+
+
+# jedinstveni parovi (redni indeks signala k, id zice) za signale `nets` (po defaultu svi),
+# sortirani po signalu pa po zici; signal koji vise puta prolazi kroz istu zicu broji se jednom
+def net_wire_pairs(route: PackedRoute, is_wire: np.ndarray, nets=None):
+    if nets is None:
+        node_ids = route.node_ids.astype(np.int64)
+        owner = route.net_of_node().astype(np.int64)
+    else:
+        nets = np.asarray(nets, dtype=np.int64)
+        sizes = route.offsets[nets + 1] - route.offsets[nets]
+        local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        node_ids = route.node_ids[np.repeat(route.offsets[nets], sizes) + local].astype(np.int64)
+        owner = np.repeat(nets, sizes)
+
+    size = len(is_wire)
+    known = (node_ids >= 0) & (node_ids < size)
+    keep = known & is_wire[np.where(known, node_ids, 0)]
+    # sort + poredjenje suseda; brze od np.unique (hash) za ovoliki broj kljuceva
+    keys = np.sort(owner[keep] * size + node_ids[keep])
+    if len(keys):
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return keys // size, keys % size
+
+
+# zauzetost zica za celu rutu: occupancy[id] = broj signala koji koriste zicu, wire_count[k] = broj
+# razlicitih zica signala k. with_nets=True pravi i CSR zica -> signali (redni brojevi iz Route.nets)
+class WireOccupancy:
+    def __init__(self, rrg: RRG, route, with_nets: bool = False, is_wire: np.ndarray = None):
+        self.route = as_packed(route)
+        self.is_wire = wire_mask(rrg) if is_wire is None else is_wire
+        size = len(self.is_wire)
+
+        self.net_index, self.wire_ids = net_wire_pairs(self.route, self.is_wire)
+        self.occupancy = np.bincount(self.wire_ids, minlength=size)
+        self.wire_count = np.bincount(self.net_index, minlength=len(self.route.net_numbers))
+
+        self.nets_indptr = None
+        self.nets_indices = None
+        if with_nets:
+            self.build_wire_nets()
+
+    # signali zice w su nets_indices[nets_indptr[w]:nets_indptr[w + 1]], rastuce
+    def build_wire_nets(self) -> None:
+        order = np.argsort(self.wire_ids, kind="stable")
+        self.nets_indptr = np.zeros(len(self.is_wire) + 1, dtype=np.int64)
+        np.cumsum(self.occupancy, out=self.nets_indptr[1:])
+        self.nets_indices = self.route.net_numbers[self.net_index[order]]
+
+    def nets_of(self, wire_id: int) -> np.ndarray:
+        if self.nets_indptr is None:
+            self.build_wire_nets()
+        return self.nets_indices[self.nets_indptr[wire_id]:self.nets_indptr[wire_id + 1]]
+
+    # id-jevi svih zica u grafu, rastuce
+    def wires(self) -> np.ndarray:
+        return np.flatnonzero(self.is_wire)
+
+    # {redni broj signala: broj razlicitih zica}
+    def wire_usage(self) -> Dict[int, int]:
+        return dict(zip(self.route.net_numbers.tolist(), self.wire_count.tolist()))
+
+    # {id zice: skup signala} za sve zice, ukljucujuci i nekoriscene
+    def wire_signals(self) -> Dict[int, Set[int]]:
+        if self.nets_indptr is None:
+            self.build_wire_nets()
+        indptr = self.nets_indptr.tolist()
+        indices = self.nets_indices.tolist()
+        return {wire_id: set(indices[indptr[wire_id]:indptr[wire_id + 1]]) for wire_id in self.wires().tolist()}
@@ -1,55 +1,180 @@
+import os
 import re
-from .models import Node, Net, Route
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from .models import RRG, Net, PackedRoute, Route
 
 
 class RouteParser:
     def __init__(self):
         self.route = Route()
 
+    # linije se dele na tokene (split) umesto regex-a:
+    #   Net 0 (c0)
+    #   Node:	547	SOURCE (4,0,0)  Pad: 7  Switch: 0
+    #   Node:	1109	 CHANX (4,0,0) to (5,0,0)  Track: 5  Switch: 2
+    #   Node:	450	  SINK (3,3,0)  Class: 0  Switch: -1 Net_pin_index: 4
+    # Switch na liniji je prekidac ka sledecoj liniji, pa se pamti i dodeljuje sledecem cvoru
     def parse(self, route_file: str):
         current_net = None
+        nets = self.route.nets
+        # id cvora -> indeks u stablu trenutnog signala
+        tree_index = {}
+        prev_index = -1
+        prev_switch = -1
 
         with open(route_file, "r") as f:
             for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Pocetak neta: Net 0 (c0)
-                if line.startswith("Net"):
-                    match = re.match(r"Net\s+(\d+)\s+\((.+)\)", line)
-                    if match:
-                        net_serial_numb = int(match.group(1))
-                        net_id = match.group(2)
-                        # kreiraj novi Net i ubaci ga u Route
-                        self.route.nets[net_serial_numb] = Net(net_id)
-                        current_net = net_serial_numb
+                parts = line.split()
+                if not parts:
                     continue
+                head = parts[0]
 
                 # Node linija
-                if line.startswith("Node") and current_net is not None:
-                    match = re.match(
-                        r"Node:\s*(\d+)\s+(\w+)\s+\((\d+),(\d+),\d+\)\s+.*?(\d+)",
-                        line
-                    )
-                    if match:
-                        node_id = int(match.group(1))
-                        node_type = match.group(2)
-                        x = int(match.group(3))
-                        y = int(match.group(4))
-                        # broj posle koordinata (Pad/Track/Pin/Class)
-                        ptc = int(match.group(5))
-
-                        node = Node(
-                            node_id=node_id,
-                            node_type=node_type,
-                            ptc=ptc,
-                            xhigh=x, xlow=x,
-                            yhigh=y, ylow=y
-                        )
-
-                        # dodaj node u trenutni Net
-                        self.route.nets[current_net].nodes.append(node)
+                if head == "Node:":
+                    if current_net is None or len(parts) < 6:
+                        continue
+
+                    node_id = int(parts[1])
+                    node_type = parts[2]
+
+                    if parts[-2] == "Switch:":
+                        switch = int(parts[-1])
+                        net_pin_index = -1
+                    elif parts[-2] == "Net_pin_index:" and parts[-4] == "Switch:":
+                        switch = int(parts[-3])
+                        net_pin_index = int(parts[-1])
+                    else:
+                        switch = int(parts[parts.index("Switch:") + 1]) if "Switch:" in parts else -1
+                        net_pin_index = -1
+
+                    index = tree_index.get(node_id)
+                    if index is not None and node_type != "SINK":
+                        # tacka grananja, nova grana krece iz vec postojeceg cvora
+                        prev_index = index
+                    else:
+                        index = current_net.add_node(node_id, prev_index, prev_switch, net_pin_index)
+                        if node_type != "SINK":
+                            tree_index[node_id] = index
+                        prev_index = index
+                    prev_switch = switch
+
+                # Pocetak neta: Net 0 (c0)
+                elif head == "Net" and len(parts) >= 3 and parts[1].isdigit():
+                    start = line.find("(")
+                    end = line.rfind(")")
+                    if start < 0 or end <= start + 1:
+                        continue
+                    net_serial_numb = int(parts[1])
+                    # kreiraj novi Net i ubaci ga u Route
+                    current_net = Net(line[start + 1:end])
+                    nets[net_serial_numb] = current_net
+                    tree_index = {}
+                    prev_index = -1
+                    prev_switch = -1
 
     def get_route(self) -> Route:
         return self.route
+
+
+# parsira jedan .route fajl i vraca ga kao PackedRoute (koristi se i kao posao u procesima)
+def parse_route_packed(route_file: str) -> PackedRoute:
+    parser = RouteParser()
+    parser.parse(route_file)
+    return PackedRoute.from_route(parser.get_route())
+
+
+# linije zaglavlja .route fajla pre "Routing:" (Placement_File, Array size), da bi se prepisale u novu rutu
+def route_header(route_file: str) -> List[str]:
+    header = []
+    with open(route_file, "r") as f:
+        for line in f:
+            if line.startswith("Routing:"):
+                break
+            header.append(line.rstrip("\n"))
+    while header and not header[-1]:
+        header.pop()
+    return header
+
+
+# upisuje Route u VPR .route format koji RouteParser cita. Switch na liniji je prekidac ka sledecoj liniji
+# (-1 posle SINK-a), tacka grananja se ponavlja pre svake nove grane (Net.path_indices). Ime pina
+# (npr. clb.I[2]) nije u rrg.xml, pa se za IPIN/OPIN pise samo broj pina
+def write_route(route: Route, rrg: RRG, route_file: str, header: List[str] = None) -> None:
+    nodes = rrg.nodes
+    lines = list(header or []) + ["", "Routing:", ""]
+    for net_number, net in route.nets.items():
+        lines.append(f"Net {net_number} ({net.id})")
+        lines.append("")
+        order = net.path_indices()
+        for position, index in enumerate(order):
+            node = nodes[net.node_ids[index]]
+            following = order[position + 1] if position + 1 < len(order) else -1
+            switch = net.switch[following] if following >= 0 and net.parent[following] == index else -1
+
+            location = f"({node.xlow},{node.ylow},0)"
+            if (node.xlow, node.ylow) != (node.xhigh, node.yhigh):
+                location += f" to ({node.xhigh},{node.yhigh},0)"
+            if node.type in ("CHANX", "CHANY"):
+                ptc = "Track"
+            elif rrg.block_type_at(node.xlow, node.ylow) == "io":
+                ptc = "Pad"
+            else:
+                ptc = "Pin" if node.type in ("IPIN", "OPIN") else "Class"
+
+            line = f"Node:\t{node.id}\t{node.type:>6} {location}  {ptc}: {node.ptc}  Switch: {switch}"
+            if net.net_pin_index[index] >= 0:
+                line += f" Net_pin_index: {net.net_pin_index[index]}"
+            lines.append(line)
+        lines.append("")
+        lines.append("")
+
+    with open(route_file, "w") as f:
+        f.write("\n".join(lines).rstrip("\n") + "\n")
+
+
+# pronalazi sve iteration_NNN.route fajlove u direktorijumu; finalna ruta dobija broj 0 i ide poslednja,
+# posle svih iteracija. Finalna ruta je jedini drugi .route fajl, a ako ih ima vise, onaj sa imenom
+# direktorijuma (b9/b9.route); inace izbor ne bi smeo da zavisi od redosleda os.listdir, pa je greska
+def find_iteration_files(directory: str) -> Dict[int, str]:
+    files = {}
+    finals = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".route"):
+            continue
+        match = re.fullmatch(r"iteration_(\d+)\.route", name)
+        if match:
+            files[int(match.group(1))] = os.path.join(directory, name)
+        else:
+            finals.append(name)
+
+    design = os.path.basename(os.path.normpath(directory)) + ".route"
+    if design in finals:
+        files[0] = os.path.join(directory, design)
+    elif len(finals) == 1:
+        files[0] = os.path.join(directory, finals[0])
+    elif finals:
+        raise ValueError(f"Vise finalnih ruta u {directory} ({', '.join(finals)}), a nijedna nije {design}")
+    return dict(sorted(files.items(), key=lambda item: (item[0] == 0, item[0])))
+
+
+# paralelno parsira sve iteracije rutiranja (ili samo `numbers`, redom kao u find_iteration_files);
+# rezultat je {broj iteracije: PackedRoute}
+def load_all_iterations(directory: str, max_workers: int = None, numbers=None) -> Dict[int, PackedRoute]:
+    files = find_iteration_files(directory)
+    if numbers is not None:
+        wanted = set(numbers)
+        files = {number: path for number, path in files.items() if number in wanted}
+    if not files:
+        return {}
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(files) == 1:
+        return {number: parse_route_packed(path) for number, path in files.items()}
+
+    # vise fajlova po poslu da bi se smanjio trosak komunikacije izmedju procesa
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        packed = executor.map(parse_route_packed, files.values(), chunksize=chunksize)
+        return dict(zip(files.keys(), packed))
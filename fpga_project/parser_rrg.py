@@ -3,79 +3,193 @@ from .models import *
 
 
 class RRGParser:
-    def __init__(self):
+    # sekcije ciji se elementi u parse_streaming brisu cim se obrade
+    CONTAINERS = ("rr_nodes", "rr_edges", "grid", "block_types")
+
+    # compact=True: cvorovi i grane se cuvaju u NumPy nizovima (ArrayRRG) umesto u Node/Edge objektima
+    def __init__(self, compact: bool = True):
         self.file = None
-        self.rrg = RRG()
+        self.rrg = ArrayRRG() if compact else RRG()
+        # zica -> strana, popunjava se jednim prolazom kroz grane (build_wire_side_index)
+        self.wire_sides = None
 
-    def parse(self, route_file: str):
+    def parse(self, route_file: str, streaming: bool = True):
         self.file = route_file
-        tree = ET.parse(self.file)
+        self.wire_sides = None
+        if streaming:
+            self.parse_streaming(route_file)
+        else:
+            self.parse_tree(route_file)
+        self.rrg.build_adjacency()
+
+    # ucitava ceo DOM pa ga obilazi, memorija raste sa velicinom rrg.xml fajla
+    def parse_tree(self, route_file: str):
+        tree = ET.parse(route_file)
         root = tree.getroot()
 
+        channel = root.find("channels/channel")
+        if channel is not None:
+            self.add_channel_element(channel)
+
+        for switch in root.findall("switches/switch"):
+            self.add_switch_element(switch)
+
+        for block_type in root.findall("block_types/block_type"):
+            self.add_block_type_element(block_type)
+
+        for grid_loc in root.findall("grid/grid_loc"):
+            self.add_grid_loc_element(grid_loc)
+
         for node in root.findall("rr_nodes/node"):
-            node_id = int(node.get("id"))
-            ntype = node.get("type")
-
-            loc = node.find("loc")
-            xhigh = int(loc.get("xhigh"))
-            xlow = int(loc.get("xlow"))
-            yhigh = int(loc.get("yhigh"))
-            ylow = int(loc.get("ylow"))
-            ptc = int(loc.get("ptc"))
-            self.rrg.add_node(
-                Node(node_id, ntype, ptc, xhigh, xlow, yhigh, ylow))
+            self.add_node_element(node)
 
         for edge in root.findall("rr_edges/edge"):
-            sink = int(edge.get("sink_node"))
-            src = int(edge.get("src_node"))
-            self.rrg.add_edge(Edge(sink, src))
+            self.add_edge_element(edge)
 
-    #dobije id pin-a i vraca sa koje je strane "TOP", "TOP_RIGHT" itd.
-    def get_pin_side(self, node_id: int) -> str:
-        tree = ET.parse(self.file)
-        root = tree.getroot()
+    # iterparse: svaki <node>/<edge> se obradi cim se zatvori i odmah izbaci iz stabla,
+    # tako da u memoriji nikad nije ceo DOM nego samo RRG model
+    def parse_streaming(self, route_file: str):
+        container = None
 
-        xpath = f"rr_nodes/node[@id='{node_id}']"
-        node_elem = root.find(xpath)
-        if node_elem is None:
-            return None
+        for event, elem in ET.iterparse(route_file, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag in self.CONTAINERS:
+                    container = elem
+                continue
 
-        if node_elem.get("type") not in ("IPIN", "OPIN"):
-            return None
+            if tag == "node":
+                self.add_node_element(elem)
+                container.clear()
+            elif tag == "edge":
+                self.add_edge_element(elem)
+                container.clear()
+            elif tag == "grid_loc":
+                self.add_grid_loc_element(elem)
+                container.clear()
+            elif tag == "block_type":
+                self.add_block_type_element(elem)
+                container.clear()
+            elif tag in self.CONTAINERS:
+                container = None
+            elif tag == "switch":
+                self.add_switch_element(elem)
+            elif tag == "channel":
+                self.add_channel_element(elem)
+
+    def add_node_element(self, node):
+        node_id = int(node.get("id"))
+        ntype = node.get("type")
+
+        loc = node.find("loc")
+        xhigh = int(loc.get("xhigh"))
+        xlow = int(loc.get("xlow"))
+        yhigh = int(loc.get("yhigh"))
+        ylow = int(loc.get("ylow"))
+        ptc = int(loc.get("ptc"))
+        side = loc.get("side") if ntype in ("IPIN", "OPIN") else None
+        capacity = int(node.get("capacity", 1))
+        self.rrg.add_node(
+            Node(node_id, ntype, ptc, xhigh, xlow, yhigh, ylow, side, capacity))
+
+    def add_edge_element(self, edge):
+        sink = int(edge.get("sink_node"))
+        src = int(edge.get("src_node"))
+        switch = edge.get("switch_id")
+        self.rrg.add_edge(Edge(sink, src, int(switch) if switch is not None else None))
+
+    def add_switch_element(self, switch):
+        timing = switch.find("timing")
+        tdel = timing.get("Tdel") if timing is not None else None
+        self.rrg.add_switch(
+            Switch(int(switch.get("id")), switch.get("name"), switch.get("type"),
+                   float(tdel) if tdel is not None else 0.0))
+
+    def add_channel_element(self, channel):
+        self.rrg.chan_width_max = int(channel.get("chan_width_max"))
 
-        loc_elem = node_elem.find("loc")
-        if loc_elem is not None:
-            return loc_elem.get("side")
-        return None
+    def add_block_type_element(self, block_type):
+        self.rrg.block_types[int(block_type.get("id"))] = block_type.get("name")
+
+    def add_grid_loc_element(self, grid_loc):
+        self.rrg.add_grid_location(int(grid_loc.get("x")), int(grid_loc.get("y")),
+                                   int(grid_loc.get("block_type_id")))
+
+    #dobije id pin-a i vraca sa koje je strane "TOP", "TOP_RIGHT" itd.
+    def get_pin_side(self, node_id: int) -> str:
+        node = self.rrg.nodes.get(node_id)
+        if node is None or node.type not in ("IPIN", "OPIN"):
+            return None
+        return node.side
 
     #dobija id zice i vraca sa koje je strane ali mora da bude samo jedna strana "TOP", ne moze da bude "TOP_RIGHT"
     #proverava sa kojim pinovima je povezana i proverava na kojoj strani su ti pinovi
     #dolazi do problema gde su svi pinovi sa kojima je povezana imaju duplu stranu i onda vraca None
     def get_wire_side(self, wire_id: int) -> str:
-        # proveri da li cvor postoji i da li je zica
-        wire_node = self.rrg.nodes.get(wire_id)
-        if not wire_node or wire_node.type not in ("CHANX", "CHANY"):
-            return None
+        if self.wire_sides is None:
+            self.build_wire_side_index()
+        return self.wire_sides.get(wire_id)
+
+    # strane za sve CHANX/CHANY cvorove odjednom
+    def get_all_wire_sides(self) -> Dict[int, str]:
+        if self.wire_sides is None:
+            self.build_wire_side_index()
+        return dict(self.wire_sides)
+
+    # jedan prolaz kroz grane: svaka zica dobija stranu prvog pina sa jednoznacnom stranom
+    # na koji je povezana, istim redosledom kojim bi je nasla pretraga grana za tu zicu
+    def build_wire_side_index(self):
+        if isinstance(self.rrg, ArrayRRG):
+            self.wire_sides = self.build_wire_side_index_arrays()
+            return
+        nodes = self.rrg.nodes
+        wire_sides = {}
 
-        # gledamo sve veze gde se pojavljuje ova zica
         for edge in self.rrg.edges:
-            # ako je zica izvor
-            if edge.src == wire_id and edge.sink in self.rrg.nodes:
-                sink_node = self.rrg.nodes[edge.sink]
-                if sink_node.type in ("IPIN", "OPIN"):
-                    side = self.get_pin_side(sink_node.id)
-                    if side and "_" not in side:  # samo jednoznacan side
-                        return side
-
-            # ako je zica odredište
-            if edge.sink == wire_id and edge.src in self.rrg.nodes:
-                src_node = self.rrg.nodes[edge.src]
-                if src_node.type in ("IPIN", "OPIN"):
-                    side = self.get_pin_side(src_node.id)
-                    if side and "_" not in side:
-                        return side
-
-        return None
+            src_node = nodes.get(edge.src)
+            sink_node = nodes.get(edge.sink)
+            if src_node is None or sink_node is None:
+                continue
+
+            # zica je izvor, pin odrediste
+            if src_node.type in ("CHANX", "CHANY") and edge.src not in wire_sides:
+                side = sink_node.side if sink_node.type in ("IPIN", "OPIN") else None
+                if side and "_" not in side:  # samo jednoznacan side
+                    wire_sides[edge.src] = side
+
+            # zica je odrediste, pin izvor
+            if sink_node.type in ("CHANX", "CHANY") and edge.sink not in wire_sides:
+                side = src_node.side if src_node.type in ("IPIN", "OPIN") else None
+                if side and "_" not in side:
+                    wire_sides[edge.sink] = side
+
+        self.wire_sides = wire_sides
+
+    # isto nad kolonama ArrayRRG: grane zica -> pin i pin -> zica su kandidati sa redosledom 2 * grana
+    # (zica kao izvor) i 2 * grana + 1 (zica kao odrediste); zica dobija prvog kandidata (np.unique)
+    def build_wire_side_index_arrays(self) -> Dict[int, str]:
+        rrg = self.rrg.arrays()
+        src, sink = rrg.index_of(rrg.edge_src), rrg.index_of(rrg.edge_sink)
+        known = np.flatnonzero((src >= 0) & (sink >= 0))
+        src, sink = src[known], sink[known]
+
+        is_wire = np.isin(rrg.types, [rrg.type_code("CHANX"), rrg.type_code("CHANY")])
+        # pin sa jednoznacnom stranom (bez "_", npr. "TOP" ali ne "TOP_RIGHT")
+        single_side = np.array([bool(name) and "_" not in name for name in rrg.side_names])
+        is_pin = np.isin(rrg.types, [rrg.type_code("IPIN"), rrg.type_code("OPIN")]) & single_side[rrg.sides]
+
+        wire_src = np.flatnonzero(is_wire[src] & is_pin[sink])
+        wire_sink = np.flatnonzero(is_wire[sink] & is_pin[src])
+        wires = np.concatenate([src[wire_src], sink[wire_sink]])
+        pins = np.concatenate([sink[wire_src], src[wire_sink]])
+        order = np.argsort(np.concatenate([2 * known[wire_src], 2 * known[wire_sink] + 1]), kind="stable")
+        wires, pins = wires[order], pins[order]
+
+        # np.sort: recnik je redom prvog pojavljivanja, kao u petlji po granama
+        first = np.sort(np.unique(wires, return_index=True)[1])
+        side_names = rrg.side_names
+        return {node_id: side_names[side] for node_id, side in
+                zip(rrg.ids[wires[first]].tolist(), rrg.sides[pins[first]].tolist())}
 
     def get_rrg(self) -> RRG:
         return self.rrg
@@ -0,0 +1,34 @@
+import heapq
+from typing import Callable, Iterable, List
+
+import numpy as np
+
+
+# indeksi k najvecih vrednosti, od najvece ka manjoj; jednake vrednosti zadrzavaju redosled
+# iz niza, isto kao sorted(..., reverse=True)[:k]. np.partition nalazi prag u O(n), pa se
+# sortiraju samo kandidati iznad praga. NaN (npr. odstupanje degenerisanog signala) se rangira
+# kao -inf, tj. iza svih brojeva
+def top_k_indices(values, k: int) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        values = np.where(np.isnan(values), -np.inf, values)
+    n = len(values)
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if k < n:
+        threshold = np.partition(values, n - k)[n - k]
+        candidates = np.flatnonzero(values >= threshold)
+    else:
+        candidates = np.arange(n)
+
+    # rastuce po vrednosti, a jednake od poslednjeg indeksa; obrnuto je opadajuce sa stabilnim
+    # redosledom jednakih (bez negacije, pa radi i za neoznacene cele brojeve)
+    order = np.lexsort((-candidates, values[candidates]))[::-1]
+    return candidates[order[:k]]
+
+
+# k najvecih elemenata po kljucu (heap), isti rezultat i redosled kao sorted(..., key, reverse=True)[:k]
+def top_k(items: Iterable, k: int, key: Callable) -> List:
+    return heapq.nlargest(max(k, 0), items, key=key)
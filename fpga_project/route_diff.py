@@ -0,0 +1,186 @@
+import math
+from typing import Dict, List
+
+import numpy as np
+
+from .fpga_layout import CoordMap
+from .fpga_metrics import FPGAMetrics
+from .models import PackedRoute, RRG, as_packed
+from .occupancy import net_wire_pairs, wire_mask
+
+
+class RouteDiff:
+    def __init__(self, changed: List[int], added: List[int], removed: List[int]):
+        # redni brojevi signala cije se stablo promenilo izmedju dve rute
+        self.changed = changed
+        # signali kojih nije bilo u prethodnoj, odnosno kojih nema u novoj ruti
+        self.added = added
+        self.removed = removed
+
+    def __len__(self):
+        return len(self.changed) + len(self.added) + len(self.removed)
+
+    def __str__(self):
+        return (f"RouteDiff(changed={len(self.changed)}, added={len(self.added)}, "
+                f"removed={len(self.removed)})")
+
+
+# poredi dve rute signal po signal; signal je promenjen ako mu se razlikuju cvorovi, oblik stabla, prekidaci
+# (od njih zavisi kasnjenje, TimingReport.reuse_delays) ili Net_pin_index SINK-ova
+def diff_routes(prev, cur) -> RouteDiff:
+    prev, cur = as_packed(prev), as_packed(cur)
+
+    if np.array_equal(prev.net_numbers, cur.net_numbers):
+        # uobicajeno izmedju iteracija: isti signali istim redom, bez trazenja preseka
+        common = cur.net_numbers
+        prev_k = cur_k = np.arange(len(common))
+        added, removed = [], []
+    else:
+        common, prev_k, cur_k = np.intersect1d(prev.net_numbers, cur.net_numbers, return_indices=True)
+        added = np.setdiff1d(cur.net_numbers, prev.net_numbers).tolist()
+        removed = np.setdiff1d(prev.net_numbers, cur.net_numbers).tolist()
+
+    prev_sizes = np.diff(prev.offsets)[prev_k]
+    cur_sizes = np.diff(cur.offsets)[cur_k]
+    changed = prev_sizes != cur_sizes
+
+    # signali iste velicine se porede element po element, odjednom za sve
+    same = np.flatnonzero(~changed)
+    if len(same):
+        sizes = prev_sizes[same]
+        local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        prev_pos = np.repeat(prev.offsets[prev_k[same]], sizes) + local
+        cur_pos = np.repeat(cur.offsets[cur_k[same]], sizes) + local
+        differs = ((prev.node_ids[prev_pos] != cur.node_ids[cur_pos]) |
+                   (prev.parent[prev_pos] != cur.parent[cur_pos]) |
+                   (prev.switch[prev_pos] != cur.switch[cur_pos]) |
+                   (prev.net_pin_index[prev_pos] != cur.net_pin_index[cur_pos]))
+        owner = np.repeat(np.arange(len(same)), sizes)
+        changed[same] = np.bincount(owner, weights=differs, minlength=len(same)) > 0
+
+    return RouteDiff(common[changed].tolist(), added, removed)
+
+
+# zauzetost zica, HPWL i odstupanje koji se posle prve rute azuriraju samo za signale koji su se promenili.
+# coord_map je isti kao u FPGALayout.map_rrg_to_grid (id cvora -> vizuelne koordinate)
+class IncrementalRouteMetrics:
+    def __init__(self, rrg: RRG, coord_map):
+        self.is_wire = wire_mask(rrg)
+        size = len(self.is_wire)
+
+        if isinstance(coord_map, CoordMap) and len(coord_map.node_x) == size:
+            # map_rrg_to_grid vec daje nizove indeksirane id-jem cvora
+            self.node_x = coord_map.node_x.copy()
+            self.node_y = coord_map.node_y.copy()
+        else:
+            self.node_x = np.full(size, np.nan)
+            self.node_y = np.full(size, np.nan)
+            for node_id, (x, y) in coord_map.items():
+                if 0 <= node_id < size:
+                    self.node_x[node_id] = x
+                    self.node_y[node_id] = y
+
+        # xlow, xhigh, ylow, yhigh po id-ju cvora, za HPWL u RR jedinicama (NaN za id kog nema u grafu)
+        arrays = rrg.arrays()
+        self.grid = np.full((4, size), np.nan)
+        self.grid[:, arrays.ids] = [arrays.xlow, arrays.xhigh, arrays.ylow, arrays.yhigh]
+
+        # broj signala koji koriste svaku zicu (indeks = id cvora)
+        self.wire_load = np.zeros(size, dtype=np.int64)
+        self.route = None
+        # redni broj signala -> njegove zice, HPWL (NaN bez validnih koordinata), HPWL u RR jedinicama i broj zica
+        self.net_wires: Dict[int, np.ndarray] = {}
+        self.hpwl: Dict[int, float] = {}
+        self.hpwl_grid: Dict[int, float] = {}
+        self.real_wires: Dict[int, int] = {}
+        # redni broj signala -> red iz deviation_metrics (racuna se samo za promenjene signale)
+        self.deviation: Dict[int, dict] = {}
+        # ukupan broj signala za koje su metrike racunate (prva ruta + promene svih sledecih)
+        self.recomputed = 0
+
+    # postavlja novu rutu; vraca RouteDiff u odnosu na prethodnu (za prvu rutu su svi signali "added")
+    def update(self, route) -> RouteDiff:
+        route = as_packed(route)
+        if self.route is None:
+            diff = RouteDiff([], route.net_numbers.tolist(), [])
+        else:
+            diff = diff_routes(self.route, route)
+
+        for net_number in diff.removed + diff.changed:
+            self.remove_net(net_number)
+
+        # zice i HPWL svih novih/promenjenih signala odjednom, nad rutom samo od tih signala
+        positions = {net_number: k for k, net_number in enumerate(route.net_numbers.tolist())}
+        net_numbers = diff.changed + diff.added
+        subset = route.select([positions[net_number] for net_number in net_numbers])
+        net_index, wire_ids = net_wire_pairs(subset, self.is_wire)
+        self.wire_load += np.bincount(wire_ids, minlength=len(self.wire_load))
+        hpwl, hpwl_grid = self.subset_hpwl(subset)
+
+        bounds = np.searchsorted(net_index, np.arange(len(net_numbers) + 1)).tolist()
+        for i, (net_number, value, grid_value) in enumerate(zip(net_numbers, hpwl.tolist(), hpwl_grid.tolist())):
+            wires = wire_ids[bounds[i]:bounds[i + 1]]
+            self.net_wires[net_number] = wires
+            self.real_wires[net_number] = len(wires)
+            self.hpwl[net_number] = value
+            self.hpwl_grid[net_number] = grid_value
+            self.deviation[net_number] = self.net_deviation(value, len(wires))
+
+        self.recomputed += len(net_numbers)
+        self.route = route
+        return diff
+
+    # HPWL (koordinate crteza i RR jedinice) za sve signale rute, isto kao FPGAMetrics.calculate_hpwl
+    def subset_hpwl(self, route: PackedRoute):
+        node_ids = route.node_ids.astype(np.int64)
+        mapped = (node_ids >= 0) & (node_ids < len(self.node_x))
+        safe_ids = np.where(mapped, node_ids, 0)
+
+        def per_net(low_values, high_values):
+            low, high = FPGAMetrics.reduce_per_net(route, np.where(mapped, low_values[safe_ids], np.nan),
+                                                   np.where(mapped, high_values[safe_ids], np.nan))
+            return high - low
+
+        hpwl = per_net(self.node_x, self.node_x) + per_net(self.node_y, self.node_y)
+        hpwl_grid = per_net(self.grid[0], self.grid[1]) + per_net(self.grid[2], self.grid[3])
+        return hpwl, hpwl_grid
+
+    def remove_net(self, net_number: int) -> None:
+        wires = self.net_wires.pop(net_number)
+        self.wire_load[wires] -= 1
+        del self.real_wires[net_number]
+        del self.hpwl[net_number]
+        del self.hpwl_grid[net_number]
+        del self.deviation[net_number]
+
+    # (redni brojevi signala, HPWL, HPWL u RR jedinicama) redom kao u trenutnoj ruti, kao calculate_hpwl
+    def hpwl_table(self):
+        numbers = self.route.net_numbers.tolist()
+        return (self.route.net_numbers, np.array([self.hpwl[k] for k in numbers], dtype=float),
+                np.array([self.hpwl_grid[k] for k in numbers], dtype=float))
+
+    # red iz FPGAMetrics.calculate_deviation_metrics za jedan signal (signal bez koordinata ima HPWL 0)
+    @staticmethod
+    def net_deviation(hpwl: float, real: int) -> dict:
+        hpwl = 0 if math.isnan(hpwl) else hpwl
+        absolute_deviation = real - hpwl
+        relative_deviation = (absolute_deviation / hpwl) * 100 if hpwl > 0 else 0
+        return {
+            'hpwl': hpwl,
+            'real_wires': real,
+            'absolute_deviation': absolute_deviation,
+            'relative_deviation': relative_deviation
+        }
+
+    # isti format kao FPGAMetrics.calculate_deviation_metrics, redom kao u trenutnoj ruti
+    def deviation_metrics(self) -> Dict[int, dict]:
+        return {net_number: self.deviation[net_number] for net_number in self.route.net_numbers.tolist()}
+
+
+# prolazi kroz iteracije redom ({broj: ruta} kao iz load_all_iterations, ili parovi (broj, ruta)) i za svaku
+# vraca (broj iteracije, RouteDiff, metrike) gde su metrike azurirane samo za promenjene signale
+def walk_iterations(rrg: RRG, iterations, coord_map):
+    metrics = IncrementalRouteMetrics(rrg, coord_map)
+    for number, route in iterations.items() if isinstance(iterations, dict) else iterations:
+        diff = metrics.update(route)
+        yield number, diff, metrics
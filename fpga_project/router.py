@@ -0,0 +1,348 @@
+import heapq
+import math
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from .models import RRG, Net, Route, as_packed
+
+# osnovna cena ulaska u cvor po tipu; IPIN je malo jeftiniji da bi se do SINK-a islo kroz najblizi pin
+BASE_COSTS = {"SOURCE": 1.0, "OPIN": 1.0, "CHANX": 1.0, "CHANY": 1.0, "IPIN": 0.95, "SINK": 0.0}
+
+
+# terminali signala iz postojece rute: (redni broj, ime, id SOURCE cvora, [(id SINK cvora, Net_pin_index)]).
+# SINK-ovi su po Net_pin_index, a bez te anotacije po tipu cvora u RRG-u (PackedRoute.sink_mask; pin je -1)
+def net_terminals(route, rrg: RRG) -> List[Tuple[int, str, int, List[Tuple[int, int]]]]:
+    packed = as_packed(route)
+    is_sink = packed.sink_mask(rrg)
+    terminals = []
+    for k, net_number in enumerate(packed.net_numbers.tolist()):
+        part = packed.net_slice(k)
+        node_ids = packed.node_ids[part].tolist()
+        if not node_ids:
+            continue
+        pins = packed.net_pin_index[part].tolist()
+        sinks = [(node_id, pin) for node_id, pin, sink in zip(node_ids, pins, is_sink[part].tolist()) if sink]
+        terminals.append((net_number, packed.net_names[k], node_ids[0], sinks))
+    return terminals
+
+
+# cena ulaska u cvor za merenje duzine puta: 1 za zicu (CHANX/CHANY), 0 za ostalo; ista mera kao
+# real_wires u calculate_deviation_metrics
+def wire_costs(rrg: RRG) -> np.ndarray:
+    rrg = rrg.arrays()
+    return np.isin(rrg.types, [rrg.type_code("CHANX"), rrg.type_code("CHANY")]).astype(np.float64)
+
+
+# Dijkstra unazad (po fan-in CSR-u) od jednog cvora: dist[i] = najmanja cena ulazaka u cvorove na putu
+# i -> target, bez cene samog i; math.inf za cvorove iz kojih se ne stize do target-a
+def reverse_distances(fanin_indptr, fanin_indices, node_cost, target: int) -> List[float]:
+    dist = [math.inf] * (len(fanin_indptr) - 1)
+    dist[target] = 0.0
+    heap = [(0.0, target)]
+    while heap:
+        cost, v = heapq.heappop(heap)
+        if cost > dist[v]:
+            continue
+        new_cost = cost + node_cost[v]
+        for k in range(fanin_indptr[v], fanin_indptr[v + 1]):
+            u = fanin_indices[k]
+            if new_cost < dist[u]:
+                dist[u] = new_cost
+                heapq.heappush(heap, (new_cost, u))
+    return dist
+
+
+# lookahead mapa za A*: najmanja cena od cvora tipa t do SINK-a pomerenog za (dx, dy) od njega, po
+# svim parovima (cvor, SINK) iz Dijkstra pretraga unazad od uzorka SINK-ova. Sa svim SINK-ovima
+# (samples=None) procena nikad ne precenjuje, pa A* nalazi najkraci put; sa uzorkom je brza za
+# pravljenje, ali moze da precenjuje. Polja bez ijednog para su 0
+class RouterLookahead:
+    def __init__(self, rrg: RRG, node_cost: np.ndarray, samples: int = None, seed: int = 0):
+        rrg = rrg.arrays()
+        x = np.asarray(rrg.xlow, dtype=np.int64)
+        y = np.asarray(rrg.ylow, dtype=np.int64)
+        width = int(x.max()) + 1 if len(x) else 1
+        height = int(y.max()) + 1 if len(y) else 1
+        self.span_y = 2 * height - 1
+        size = max(len(rrg.type_names), 1) * (2 * width - 1) * self.span_y
+
+        sinks = np.flatnonzero(rrg.types == rrg.type_code("SINK"))
+        if samples is not None and samples < len(sinks):
+            sinks = np.sort(np.random.default_rng(seed).choice(sinks, samples, replace=False))
+        self.samples = len(sinks)
+
+        # tabela[tip, dx + width - 1, dy + height - 1] u ravnom nizu; indeks je
+        # node_offset[cvor] + target_offset(SINK), pa A* po susedu radi samo jedno sabiranje
+        node_offset = (np.asarray(rrg.types, dtype=np.int64) * (2 * width - 1) * self.span_y
+                       + (width - 1 - x) * self.span_y + (height - 1 - y))
+        self.x = x.tolist()
+        self.y = y.tolist()
+
+        table = np.full(size, np.inf)
+        seen = np.zeros(size, dtype=bool)
+        fanin_indptr = rrg.fanin_indptr.tolist()
+        fanin_indices = rrg.fanin_indices.tolist()
+        costs = np.asarray(node_cost, dtype=np.float64).tolist()
+        for sink in sinks.tolist():
+            dist = np.array(reverse_distances(fanin_indptr, fanin_indices, costs, sink))
+            reached = np.flatnonzero(np.isfinite(dist))
+            np.minimum.at(table, node_offset[reached] + self.target_offset(sink), dist[reached])
+            seen[node_offset + self.target_offset(sink)] = True
+        # sa svim SINK-ovima inf znaci da nijedan cvor tog tipa ne stize do SINK-a na tom pomeraju, pa se
+        # takvi cvorovi ne obilaze; sa uzorkom je to samo nagadjanje i tada vazi 0
+        if self.samples < np.count_nonzero(rrg.types == rrg.type_code("SINK")):
+            seen[:] = False
+        table[np.isinf(table) & ~seen] = 0.0
+
+        self.node_offset = node_offset.tolist()
+        self.table = table.tolist()
+
+    def target_offset(self, target: int) -> int:
+        return self.x[target] * self.span_y + self.y[target]
+
+    # procena cene od cvora i do SINK-a target (gusti indeksi)
+    def expected_cost(self, i: int, target: int) -> float:
+        return self.table[self.node_offset[i] + self.target_offset(target)]
+
+
+# pretraga po fan-out CSR-u RRG-a sa binarnim heap-om (heapq): Dijkstra, ili A* sa lookahead mapom kada
+# je cilj SINK. Nizovi cena i prethodnika su alocirani jednom za ceo graf, a posle svake pretrage se
+# vracaju samo cvorovi koje je ona dotakla. node_cost je cena ulaska u cvor (po defaultu wire_costs)
+class RRGSearch:
+    def __init__(self, rrg: RRG, node_cost: np.ndarray = None, lookahead: RouterLookahead = None):
+        rrg = rrg.arrays()
+        self.rrg = rrg
+        n = len(rrg.node_ids)
+
+        # CSR kao Python liste: pretraga cita pojedinacne elemente, a to je za listu vise puta brze
+        # nego za NumPy skalar
+        self.indptr = rrg.fanout_indptr.tolist()
+        self.indices = rrg.fanout_indices.tolist()
+        self.edge_switch = rrg.edge_switch[rrg.fanout_edges].tolist()
+        self.node_ids = rrg.node_ids.tolist()
+        self.is_sink = (rrg.types == rrg.type_code("SINK")).tolist()
+        self.node_cost = (wire_costs(rrg) if node_cost is None else np.asarray(node_cost)).tolist()
+        self.lookahead = lookahead
+
+        self.path_cost = [math.inf] * n
+        self.prev_node = [-1] * n
+        self.prev_switch = [-1] * n
+        # bez lookahead-a procena je uvek table[0] = 0
+        self.zero_offset = [0] * n
+        # broj cvorova skinutih sa heap-a (mera rada pretrage)
+        self.expanded = 0
+
+    # najjeftiniji put od bilo kog cvora stabla (cena 0) do target-a; vraca [(cvor, switch ulaska)]
+    # od cvora stabla do target-a ili None ako target nije dostizan. Lookahead ne precenjuje, ali ne mora
+    # da bude konzistentan, pa se cvor ponovo obradjuje kad mu se nadje jeftiniji put
+    def search(self, tree, target: int):
+        indptr, indices, edge_switch = self.indptr, self.indices, self.edge_switch
+        node_cost, is_sink = self.node_cost, self.is_sink
+        path_cost, prev_node, prev_switch = self.path_cost, self.prev_node, self.prev_switch
+        heappush, heappop = heapq.heappush, heapq.heappop
+        if self.lookahead is not None and is_sink[target]:
+            table, node_offset = self.lookahead.table, self.lookahead.node_offset
+            target_offset = self.lookahead.target_offset(target)
+        else:
+            table, node_offset, target_offset = [0.0], self.zero_offset, 0
+
+        touched = list(tree)
+        # kod jednakih procena prvo ide cvor sa vecom predjenom cenom (blizi cilju), pa je u heap-u -g
+        heap = [(table[node_offset[i] + target_offset], -0.0, i) for i in tree]
+        heapq.heapify(heap)
+        for i in tree:
+            path_cost[i] = 0.0
+        found = False
+        expanded = 0
+        while heap:
+            _, cost, i = heappop(heap)
+            cost = -cost
+            if cost > path_cost[i]:
+                continue
+            expanded += 1
+            if i == target:
+                found = True
+                break
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                # tudji SINK je slepa ulica
+                if is_sink[j] and j != target:
+                    continue
+                new_cost = cost + node_cost[j]
+                if new_cost < path_cost[j]:
+                    if path_cost[j] == math.inf:
+                        touched.append(j)
+                    path_cost[j] = new_cost
+                    prev_node[j] = i
+                    prev_switch[j] = edge_switch[k]
+                    estimate = new_cost + table[node_offset[j] + target_offset]
+                    # inf: iz j se ne stize do cilja (lookahead od svih SINK-ova)
+                    if estimate < math.inf:
+                        heappush(heap, (estimate, -new_cost, j))
+        self.expanded += expanded
+
+        path = None
+        if found:
+            path = []
+            i = target
+            while prev_node[i] >= 0:
+                path.append((i, prev_switch[i]))
+                i = prev_node[i]
+            path.append((i, -1))
+            path.reverse()
+
+        for i in touched:
+            path_cost[i] = math.inf
+            prev_node[i] = -1
+        return path
+
+    # id-jevi cvorova najkraceg puta src -> sink (id-jevi iz rrg.xml), None ako put ne postoji
+    def shortest_path(self, src: int, sink: int):
+        i, target = self.rrg.index_of(src), self.rrg.index_of(sink)
+        if i < 0 or target < 0:
+            raise KeyError(src if i < 0 else sink)
+        path = self.search([i], target)
+        return None if path is None else [self.node_ids[j] for j, _ in path]
+
+    # duzina najkraceg puta src -> sink po node_cost (zbir cena cvorova posle src), math.inf ako ne postoji
+    def shortest_path_length(self, src: int, sink: int) -> float:
+        i, target = self.rrg.index_of(src), self.rrg.index_of(sink)
+        if i < 0 or target < 0:
+            raise KeyError(src if i < 0 else sink)
+        path = self.search([i], target)
+        if path is None:
+            return math.inf
+        return float(sum(self.node_cost[j] for j, _ in path[1:]))
+
+
+# PathFinder (negotiated congestion): svaki signal se u svakoj iteraciji rutira ponovo, a cena cvora
+# je base * history * present, gde present raste sa trenutnim prepunjenjem (pres_fac se mnozi svake
+# iteracije), a history pamti prepunjenje iz proslih iteracija. Staje kad nijedan cvor nije prepunjen.
+# Konekcije se traze sa A* (RRGSearch) i lookahead mapom napravljenom nad osnovnim cenama; history i
+# present su >= 1, pa mapa ni tada ne precenjuje
+class PathFinderRouter(RRGSearch):
+    def __init__(self, rrg: RRG, first_pres_fac=0.0, initial_pres_fac=0.5, pres_fac_mult=1.3,
+                 hist_fac=1.0, max_iterations=50, lookahead=True, lookahead_samples=None):
+        super().__init__(rrg)
+        rrg = self.rrg
+        self.first_pres_fac = first_pres_fac
+        self.initial_pres_fac = initial_pres_fac
+        self.pres_fac_mult = pres_fac_mult
+        self.hist_fac = hist_fac
+        self.max_iterations = max_iterations
+        n = len(rrg.node_ids)
+
+        self.capacity = np.asarray(rrg.capacity, dtype=np.int64)
+        self.base_cost = np.ones(n)
+        for node_type, cost in BASE_COSTS.items():
+            self.base_cost[rrg.types == rrg.type_code(node_type)] = cost
+        if lookahead:
+            self.lookahead = RouterLookahead(rrg, self.base_cost, samples=lookahead_samples)
+
+        # stanje PathFinder-a
+        self.occupancy = np.zeros(n, dtype=np.int64)
+        # zauzetost i kapacitet kao liste za azuriranje cvor po cvor unutar iteracije
+        self.occupancy_list = self.occupancy.tolist()
+        self.capacity_list = self.capacity.tolist()
+        self.history = np.ones(n)
+        self.pres_fac = first_pres_fac
+        # base * history po cvoru za tekucu iteraciju; node_cost je cena ulaska u cvor (sa present clanom)
+        self.base_history = []
+        # gusti indeksi cvorova koje signal zauzima (SINK onoliko puta koliko se do njega stize)
+        self.net_nodes = {}
+        # indeks cvora u stablu signala koji se trenutno rutira, -1 ako cvor nije u stablu
+        self.tree_index = [-1] * n
+
+    # cene svih cvorova za pocetak iteracije
+    def update_costs(self) -> None:
+        overuse = np.maximum(self.occupancy + 1 - self.capacity, 0)
+        base_history = self.base_cost * self.history
+        self.base_history = base_history.tolist()
+        self.node_cost = (base_history * (1 + self.pres_fac * overuse)).tolist()
+        self.occupancy_list = self.occupancy.tolist()
+
+    # promena zauzetosti cvorova tokom iteracije (rip-up ili novo stablo)
+    def occupy(self, nodes, delta: int) -> None:
+        occupancy = self.occupancy_list
+        capacity = self.capacity_list
+        for i in nodes:
+            occupancy[i] += delta
+            overuse = occupancy[i] + 1 - capacity[i]
+            self.node_cost[i] = self.base_history[i] * (1 + self.pres_fac * overuse if overuse > 0 else 1)
+
+    # stablo jednog signala: SINK-ovi redom, svaki od najblizeg cvora vec izgradjenog stabla
+    def route_net(self, name: str, source: int, sinks) -> Tuple[Net, List[int]]:
+        node_ids, is_sink, tree_index = self.node_ids, self.is_sink, self.tree_index
+        net = Net(name)
+        tree_index[source] = net.add_node(node_ids[source], -1, -1)
+        tree = [source]
+        used = [source]
+
+        for sink, pin in sinks:
+            path = self.search(tree, sink)
+            if path is None:
+                for i in tree:
+                    tree_index[i] = -1
+                raise ValueError(f"Signal {name}: SINK {node_ids[sink]} nije dostizan iz stabla")
+            parent = tree_index[path[0][0]]
+            for i, switch in path[1:]:
+                parent = net.add_node(node_ids[i], parent, switch, pin if i == sink else -1)
+                used.append(i)
+                if not is_sink[i]:
+                    tree_index[i] = parent
+                    tree.append(i)
+
+        for i in tree:
+            tree_index[i] = -1
+        return net, used
+
+    # generator iteracija: posle svake vraca (broj iteracije, Route, statistika). terminals je lista
+    # iz net_terminals (id-jevi cvorova)
+    def iterate(self, terminals):
+        index_of = self.rrg.index_of
+        nets = [(net_number, name, index_of(source), [(index_of(sink), pin) for sink, pin in sinks])
+                for net_number, name, source, sinks in terminals]
+        for net_number, name, source, sinks in terminals:
+            for node_id in [source] + [sink for sink, _ in sinks]:
+                if index_of(node_id) < 0:
+                    raise ValueError(f"Signal {name}: cvor {node_id} ne postoji u RRG-u")
+
+        for iteration in range(1, self.max_iterations + 1):
+            start = time.perf_counter()
+            expanded = self.expanded
+            if iteration == 2:
+                self.pres_fac = self.initial_pres_fac
+            elif iteration > 2:
+                self.pres_fac *= self.pres_fac_mult
+            self.update_costs()
+
+            route = Route()
+            for net_number, name, source, sinks in nets:
+                if net_number in self.net_nodes:
+                    self.occupy(self.net_nodes[net_number], -1)
+                net, used = self.route_net(name, source, sinks)
+                self.occupy(used, 1)
+                self.net_nodes[net_number] = used
+                route.nets[net_number] = net
+
+            self.occupancy = np.array(self.occupancy_list, dtype=np.int64)
+            overuse = np.maximum(self.occupancy - self.capacity, 0)
+            stats = {
+                "time": time.perf_counter() - start,
+                "overused": int(np.count_nonzero(overuse)),
+                "expanded": self.expanded - expanded,
+            }
+            yield iteration, route, stats
+
+            if stats["overused"] == 0:
+                return
+            self.history += self.hist_fac * overuse
+
+    # rutira do legalnog resenja (ili max_iterations) i vraca poslednju rutu
+    def route(self, terminals) -> Route:
+        route = None
+        for iteration, route, stats in self.iterate(terminals):
+            print(f"Iteracija {iteration}: {stats['time']:.3f} s, preopterecenih cvorova: {stats['overused']}")
+        return route
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .models import ArrayRRG, Switch
+from .parser_rrg import RRGParser
+
+
+class RRGCache:
+    # verzija formata, povecati kad se promeni raspored kolona
+    VERSION = 3
+
+    COLUMNS = ("ids", "types", "sides", "ptc", "xlow", "xhigh", "ylow", "yhigh", "capacity",
+               "edge_src", "edge_sink", "edge_switch",
+               "fanout_indptr", "fanout_indices", "fanout_edges",
+               "fanin_indptr", "fanin_indices", "fanin_edges")
+
+    ADJACENCY = ("fanout_indptr", "fanout_indices", "fanout_edges",
+                 "fanin_indptr", "fanin_indices", "fanin_edges")
+
+    # kes se po defaultu cuva pored rrg.xml kao <rrg.xml>.cache/ (jedan .npy po koloni + meta.json)
+    def __init__(self, cache_dir: str = None):
+        self.cache_dir = cache_dir
+
+    def cache_path(self, rrg_file: str) -> str:
+        directory = self.cache_dir or os.path.dirname(os.path.abspath(rrg_file))
+        return os.path.join(directory, os.path.basename(rrg_file) + ".cache")
+
+    # ucitava RRG iz kesa ako postoji i odgovara fajlu, inace parsira XML i upisuje kes
+    def load_or_parse(self, rrg_file: str) -> ArrayRRG:
+        rrg = self.load(rrg_file)
+        if rrg is not None:
+            return rrg
+
+        parser = RRGParser(compact=True)
+        parser.parse(rrg_file)
+        rrg = parser.get_rrg()
+        self.save(rrg_file, rrg)
+        return rrg
+
+    # vraca None ako kes ne postoji ili je zastareo
+    def load(self, rrg_file: str):
+        path = self.cache_path(rrg_file)
+        meta_file = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_file):
+            return None
+
+        try:
+            with open(meta_file, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("version") != self.VERSION or not self.is_fresh(rrg_file, meta):
+            return None
+
+        # nizovi se mapiraju iz fajla (mmap), nista se ne cita dok ne zatreba
+        columns = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+                   for name in self.COLUMNS}
+        switches = {s[0]: Switch(s[0], s[1], s[2], s[3]) for s in meta["switches"]}
+
+        return ArrayRRG.from_arrays(
+            columns["ids"], columns["types"], meta["type_names"], columns["ptc"],
+            columns["xlow"], columns["xhigh"], columns["ylow"], columns["yhigh"],
+            columns["sides"], meta["side_names"],
+            columns["edge_src"], columns["edge_sink"], columns["edge_switch"],
+            switches=switches,
+            adjacency={name: columns[name] for name in self.ADJACENCY},
+            chan_width_max=meta["chan_width_max"],
+            block_types={block_type_id: name for block_type_id, name in meta["block_types"]},
+            grid={(x, y): block_type_id for x, y, block_type_id in meta["grid"]},
+            capacity=columns["capacity"])
+
+    # kes se pise u privremeni direktorijum pored konacnog i tek gotov se premesta na njegovo mesto (os.replace),
+    # pa citalac nikad ne vidi poluupisan kes; svaki upis ima svoj privremeni direktorijum
+    def save(self, rrg_file: str, rrg: ArrayRRG) -> None:
+        rrg = rrg.arrays()
+        path = self.cache_path(rrg_file)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path))
+
+        for name in self.COLUMNS:
+            np.save(os.path.join(tmp_path, name + ".npy"), np.ascontiguousarray(getattr(rrg, name)))
+
+        stat = os.stat(rrg_file)
+        meta = {
+            "version": self.VERSION,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": self.file_sha256(rrg_file),
+            "type_names": rrg.type_names,
+            "side_names": rrg.side_names,
+            "switches": [[s.id, s.name, s.type, s.tdel] for s in rrg.switches.values()],
+            "chan_width_max": rrg.chan_width_max,
+            "block_types": [[block_type_id, name] for block_type_id, name in rrg.block_types.items()],
+            "grid": [[x, y, block_type_id] for (x, y), block_type_id in rrg.grid.items()],
+        }
+        self.write_meta(tmp_path, meta)
+
+        # os.replace ne moze preko nepraznog direktorijuma, pa se stari kes prvo skloni
+        old_path = None
+        if os.path.exists(path):
+            old_path = tmp_path + ".old"
+            os.replace(path, old_path)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # drugi proces je u medjuvremenu upisao kes za isti fajl; njegov ostaje
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        if old_path is not None:
+            shutil.rmtree(old_path, ignore_errors=True)
+
+    # meta.json se upisuje u privremeni fajl u istom direktorijumu pa se os.replace-om zameni ceo, tako da
+    # pad procesa ili istovremeni citalac nikad ne vide skracen fajl
+    @staticmethod
+    def write_meta(path: str, meta: dict) -> None:
+        fd, tmp_file = tempfile.mkstemp(prefix="meta.", suffix=".json.tmp", dir=path)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_file, os.path.join(path, "meta.json"))
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+
+    # velicina + mtime su dovoljni u normalnom slucaju; ako se mtime promenio
+    # (npr. posle git checkout) proverava se SHA-256 sadrzaja
+    def is_fresh(self, rrg_file: str, meta: dict) -> bool:
+        try:
+            stat = os.stat(rrg_file)
+        except OSError:
+            return False
+
+        if stat.st_size != meta.get("size"):
+            return False
+        if stat.st_mtime_ns == meta.get("mtime_ns"):
+            return True
+        if self.file_sha256(rrg_file) != meta.get("sha256"):
+            return False
+
+        # isti sadrzaj, samo osvezimo mtime da sledeci put ne racunamo hash
+        meta["mtime_ns"] = stat.st_mtime_ns
+        try:
+            self.write_meta(self.cache_path(rrg_file), meta)
+        except OSError:
+            pass
+        return True
+
+    @staticmethod
+    def file_sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -0,0 +1,129 @@
+from typing import List
+
+import numpy as np
+
+from .models import RRG, as_packed
+from .ranking import top_k_indices
+
+# kasnjenja se cuvaju u sekundama (Tdel iz rrg.xml), a ispisuju u pikosekundama
+PS = 1e12
+
+
+# Tdel po id-ju prekidaca (<switches> iz rrg.xml); 0 za prekidace bez <timing Tdel>
+def switch_delays(rrg: RRG) -> np.ndarray:
+    size = max(rrg.switches) + 1 if rrg.switches else 0
+    delays = np.zeros(size)
+    for switch_id, switch in rrg.switches.items():
+        delays[switch_id] = switch.tdel
+    return delays
+
+
+# vreme dolaska signala u svaki cvor rute: zbir Tdel prekidaca od SOURCE-a kroz stablo (Net.switch je
+# prekidac kojim se iz roditelja ulazi u cvor). Cvorovi svih signala se sortiraju po dubini (PackedRoute.depths),
+# pa je obilazak jedan prolaz po nivoima: ceo nivo se racuna odjednom iz vec izracunatog nivoa iznad
+def arrival_times(rrg: RRG, route) -> np.ndarray:
+    route = as_packed(route)
+    delays = switch_delays(rrg)
+    switch = route.switch.astype(np.int64)
+    known = (switch >= 0) & (switch < len(delays))
+    edge_delay = np.where(known, delays[np.where(known, switch, 0)], 0.0)
+
+    parent = route.global_parent()
+    depth = route.depths()
+    # dubine su male, pa stabilno sortiranje uskog tipa ide radix sortom umesto mergesort-a nad int64
+    order = np.argsort(depth.astype(np.min_scalar_type(depth.max() if len(depth) else 0)), kind="stable")
+    bounds = np.searchsorted(depth[order], np.arange(depth.max() + 2 if len(depth) else 1))
+
+    arrival = np.zeros(len(depth))
+    for level in range(1, len(bounds) - 1):
+        nodes = order[bounds[level]:bounds[level + 1]]
+        arrival[nodes] = arrival[parent[nodes]] + edge_delay[nodes]
+    return arrival
+
+
+# kasnjenje svake konekcije (signal, SINK) jedne rute; kriticne konekcije su one sa najvecim kasnjenjem.
+# Uz izvestaj prethodne iteracije (previous) i diff_routes(prethodna ruta, route) racunaju se samo
+# promenjeni i novi signali, a kasnjenja ostalih se preuzimaju
+class TimingReport:
+    def __init__(self, rrg: RRG, route, previous: "TimingReport" = None, diff=None):
+        route = as_packed(route)
+        sinks = np.flatnonzero(route.sink_mask(rrg))
+        net_index = route.net_of_node()[sinks]
+
+        self.net_numbers = route.net_numbers[net_index]
+        # ime signala za svaki red
+        self.net_names: List[str] = [route.net_names[k] for k in net_index.tolist()]
+        self.sink_ids = route.node_ids[sinks]
+        self.net_pin_index = route.net_pin_index[sinks]
+        if previous is None or diff is None:
+            self.delay = arrival_times(rrg, route)[sinks]
+        else:
+            self.delay = self.reuse_delays(rrg, route, net_index, previous, diff)
+
+    def reuse_delays(self, rrg: RRG, route, net_index, previous: "TimingReport", diff) -> np.ndarray:
+        delay = np.empty(len(net_index))
+        recompute = np.isin(route.net_numbers, diff.changed + diff.added)
+        fresh = recompute[net_index]
+        if fresh.any():
+            subset = route.select(np.flatnonzero(recompute))
+            delay[fresh] = arrival_times(rrg, subset)[subset.sink_mask(rrg)]
+
+        # nepromenjeni signali imaju ista stabla, pa su im SINK-ovi istim redom; redovi se poravnavaju
+        # stabilnim sortiranjem po rednom broju signala u obe rute
+        kept = np.flatnonzero(~fresh)
+        source = np.flatnonzero(np.isin(previous.net_numbers, self.net_numbers[kept]))
+        delay[kept[np.argsort(self.net_numbers[kept], kind="stable")]] = \
+            previous.delay[source[np.argsort(previous.net_numbers[source], kind="stable")]]
+        return delay
+
+    def __len__(self):
+        return len(self.delay)
+
+    # kasnjenje kriticne konekcije (cele rute), 0 ako ruta nema konekcija
+    def critical_delay(self) -> float:
+        return float(self.delay.max()) if len(self.delay) else 0.0
+
+    def mean_delay(self) -> float:
+        return float(self.delay.mean()) if len(self.delay) else 0.0
+
+    # indeksi n konekcija sa najvecim kasnjenjem, od najsporije
+    def critical(self, n: int) -> np.ndarray:
+        return top_k_indices(self.delay, n)
+
+    def row(self, k: int) -> str:
+        return (f"Net {self.net_numbers[k]} ({self.net_names[k]}) SINK {self.sink_ids[k]} "
+                f"pin {self.net_pin_index[k]}: kasnjenje={self.delay[k] * PS:.2f} ps")
+
+    def save(self, filename: str, n: int = 10) -> None:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("STATICKA ANALIZA KASNJENJA (ZBIR Tdel PREKIDACA)\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(f"Ukupan broj konekcija: {len(self)}\n")
+            f.write(f"Kriticno kasnjenje: {self.critical_delay() * PS:.2f} ps\n")
+            f.write(f"Prosečno kasnjenje konekcije: {self.mean_delay() * PS:.2f} ps\n")
+            f.write("-" * 80 + "\n\n")
+
+            f.write(f"TOP {n} KRITICNIH KONEKCIJA:\n\n")
+            for i, k in enumerate(self.critical(n).tolist()):
+                f.write(f"{i + 1:2d}. {self.row(k)}\n")
+
+            f.write("\n" + "=" * 80 + "\n")
+            f.write("\nSVE KONEKCIJE:\n")
+            f.write("-" * 80 + "\n")
+            for k in range(len(self)):
+                f.write(self.row(k) + "\n")
+        print(f"Analiza kasnjenja je sačuvana u fajl: {filename}")
+
+
+# kriticno i prosecno kasnjenje kroz iteracije rutiranja: {broj iteracije: TimingReport} -> txt tabela
+def save_timing_evolution(reports, filename: str) -> None:
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("KASNJENJE KROZ ITERACIJE RUTIRANJA\n")
+        f.write("=" * 80 + "\n\n")
+        f.write(f"{'Iteracija':>10} {'Kriticno (ps)':>15} {'Prosečno (ps)':>15} {'Konekcija':>10}\n")
+        f.write("-" * 80 + "\n")
+        for iteration, report in reports.items():
+            label = "finalna" if iteration == 0 else str(iteration)
+            f.write(f"{label:>10} {report.critical_delay() * PS:15.2f} {report.mean_delay() * PS:15.2f} "
+                    f"{len(report):10d}\n")
+    print(f"Kasnjenje kroz iteracije je sačuvano u fajl: {filename}")
@@ -1,10 +1,12 @@
-from fpga_project.parser_rrg import RRGParser
+import sys
+
+from fpga_project.rrg_cache import RRGCache
 from fpga_project.parser_route import RouteParser
 from fpga_project.fpga_matrix import FPGAMatrix
 from fpga_project.fpga_routing import FPGARouting
 from fpga_project.fpga_wires import FPGAWires
 from fpga_project.fpga_bounding_box import FPGABoundingBox
-from fpga_project.fpga_analysis import FPGARoutingAnalysis
+from fpga_project.fpga_metrics import FPGAMetrics
 
 
 def main():
@@ -38,7 +40,7 @@ def main():
     elif choice == "2":
         net_id = int(input("Unesi net_id za prikaz rute: "))
         net = route_data.nets[net_id]
-        routing_path = [node.id for node in net.nodes]
+        routing_path = net.path()
         show_routing(rrg, routing_path, net_id)
     elif choice == "3":
         branching = int(input("Unesi faktor grananja: "))
@@ -50,12 +52,12 @@ def main():
     elif choice == "6":
         net_id = int(input("Unesi net_id za bounding box: "))
         net = route_data.nets[net_id]
-        routing_path = [node.id for node in net.nodes]
+        routing_path = net.path()
         show_bounding_boxes(rrg, routing_path, net_id)
     elif choice == "7":
         net_id = int(input("Unesi net_id za terminal bounding box: "))
         net = route_data.nets[net_id]
-        routing_path = [node.id for node in net.nodes]
+        routing_path = net.path()
         show_terminal_bounding_boxes(rrg, routing_path, net_id)
     elif choice == "8":
         number = int(input("Unesi broj signala za prikaz: "))
@@ -100,9 +102,8 @@ def parse_route(file_path: str):
 
 
 def parse_rrg():
-    rrpParser = RRGParser()
-    rrpParser.parse("b9/rrg.xml")
-    rrg = rrpParser.get_rrg()
+    # prvi put parsira rrg.xml i upisuje binarni kes pored njega, posle samo mapira kes
+    rrg = RRGCache().load_or_parse("b9/rrg.xml")
     return rrg
 
 
@@ -183,10 +184,10 @@ def show_largest_terminal_bounding_boxes(rrg, route_data, n):
     visualizer.show()
 
 def show_hpwl(rrg, route_data):
-    visualizer = FPGARoutingAnalysis()
+    visualizer = FPGAMetrics()
     visualizer.map_rrg_to_grid(rrg)
-    results = visualizer.hpwl_all_signals(rrg, route_data)
-    visualizer.save_hpwl(results)
+    net_numbers, hpwl, hpwl_grid = visualizer.calculate_hpwl(rrg, route_data)
+    visualizer.save_hpwl(visualizer.hpwl_results(net_numbers, hpwl), grid_results=visualizer.hpwl_results(net_numbers, hpwl_grid))
 
 def show_first_n_signals(rrg, route_data, number):
     visualizer = FPGARouting()
@@ -195,7 +196,7 @@ def show_first_n_signals(rrg, route_data, number):
 
     routing_paths = []
     for net_id, net in route_data.nets.items():
-        routing_paths.append([node.id for node in net.nodes])
+        routing_paths.append(net.path())
 
     visualizer.visualize_first_n_routings(rrg, routing_paths, number)
 
@@ -207,7 +208,7 @@ def show_deviation_analysis(rrg, route_data):
     print("=" * 50)
 
     # Kreiraj analizator
-    analyzer = FPGARoutingAnalysis()
+    analyzer = FPGAMetrics()
     analyzer.map_rrg_to_grid(rrg)
 
     n = int(input("Unesite broj top signala za analizu (n): "))
@@ -241,4 +242,9 @@ def show_segment_terminal_bounding_boxes(rrg, routing_path):
     visualizer.show()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # sa argumentima radi neinteraktivno (vidi python parse_all.py --help), bez njih meni kao ranije
+    if len(sys.argv) > 1:
+        from fpga_project.cli import main as batch_main
+        batch_main(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+# CSR fan-out/fan-in (RRG.build_adjacency) mora da da iste susede kao pretraga svih grana, i za b9 i za
+# graf sa retkim id-jevima i granama ka nepostojecim cvorovima.
+#
+#   python -m pytest tests/test_adjacency.py
+import os
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from fpga_project.models import RRG, Edge, Node
+from fpga_project.parser_rrg import RRGParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# susedi kakvi su bili pre CSR-a: prolaz kroz sve grane (pozicije grana, redom kao u rrg.edges)
+def neighbours_loop(rrg):
+    fanout, fanin = defaultdict(list), defaultdict(list)
+    for position, edge in enumerate(rrg.edges):
+        if edge.src in rrg.nodes and edge.sink in rrg.nodes:
+            fanout[edge.src].append((edge.sink, position))
+            fanin[edge.sink].append((edge.src, position))
+    return fanout, fanin
+
+
+def check_adjacency(rrg):
+    rrg.build_adjacency()
+    fanout, fanin = neighbours_loop(rrg)
+    for node_id in rrg.nodes:
+        i = rrg.index_of(node_id)
+        assert rrg.node_ids[i] == node_id
+        part = slice(rrg.fanout_indptr[i], rrg.fanout_indptr[i + 1])
+        found = list(zip(rrg.node_ids[rrg.fanout_indices[part]].tolist(), rrg.fanout_edges[part].tolist()))
+        assert sorted(found) == sorted(fanout[node_id])
+        assert sorted(rrg.successors(node_id).tolist()) == sorted(sink for sink, _ in fanout[node_id])
+
+        part = slice(rrg.fanin_indptr[i], rrg.fanin_indptr[i + 1])
+        found = list(zip(rrg.node_ids[rrg.fanin_indices[part]].tolist(), rrg.fanin_edges[part].tolist()))
+        assert sorted(found) == sorted(fanin[node_id])
+        assert sorted(rrg.predecessors(node_id).tolist()) == sorted(src for src, _ in fanin[node_id])
+
+
+@pytest.mark.parametrize("compact", [True, False])
+def test_csr_matches_edge_scan_on_b9(compact):
+    parser = RRGParser(compact=compact)
+    parser.parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    check_adjacency(parser.get_rrg())
+
+
+def test_csr_with_sparse_ids_and_dangling_edges():
+    rng = np.random.default_rng(5)
+    rrg = RRG()
+    node_ids = sorted(rng.choice(10000, 300, replace=False).tolist())
+    for node_id in node_ids:
+        rrg.add_node(Node(node_id, "CHANX", 0, 1, 1, 1, 1))
+    for _ in range(2000):
+        src, sink = rng.choice(node_ids, 2).tolist()
+        rrg.add_edge(Edge(sink, src, 0))
+    # grane ka cvorovima kojih nema u grafu se preskacu
+    rrg.add_edge(Edge(10001, node_ids[0], 0))
+    rrg.add_edge(Edge(node_ids[1], 10002, 0))
+
+    check_adjacency(rrg)
+    assert rrg.index_of(10001) == -1
+    assert len(rrg.successors(10002)) == 0
+    assert not rrg.dense_ids
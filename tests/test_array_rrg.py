@@ -0,0 +1,74 @@
+# ArrayRRG (kolone NumPy nizova) mora da se ponasa isto kao RRG sa Node/Edge objektima: isti cvorovi i grane
+# kroz nodes/edges poglede, iste kolone kao RRG.arrays() i isti rezultat posle dodavanja cvorova posle citanja.
+#
+#   python -m pytest tests/test_array_rrg.py
+import os
+
+import numpy as np
+import pytest
+
+from fpga_project.models import ArrayRRG, Edge, Node
+from fpga_project.parser_rrg import RRGParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLUMNS = ("ids", "types", "sides", "ptc", "xlow", "xhigh", "ylow", "yhigh", "capacity",
+           "edge_src", "edge_sink", "edge_switch")
+
+
+def node_tuple(node):
+    return (node.id, node.type, node.ptc, node.xhigh, node.xlow, node.yhigh, node.ylow, node.side, node.capacity)
+
+
+@pytest.fixture(scope="module")
+def graphs():
+    compact, objects = RRGParser(), RRGParser(compact=False)
+    compact.parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    objects.parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    return compact.get_rrg(), objects.get_rrg()
+
+
+def test_views_match_object_graph(graphs):
+    compact, objects = graphs
+    assert isinstance(compact, ArrayRRG)
+    assert len(compact.nodes) == len(objects.nodes)
+    assert list(compact.nodes) == sorted(objects.nodes)
+    for node_id, node in objects.nodes.items():
+        assert node_id in compact.nodes
+        assert node_tuple(compact.nodes[node_id]) == node_tuple(node)
+    assert [(e.src, e.sink, e.switch) for e in compact.edges] == [(e.src, e.sink, e.switch) for e in objects.edges]
+    assert [(e.src, e.sink) for e in compact.edges[-3:]] == [(e.src, e.sink) for e in objects.edges[-3:]]
+
+    missing = max(objects.nodes) + 1
+    assert missing not in compact.nodes
+    assert compact.nodes.get(missing) is None
+    with pytest.raises(KeyError):
+        compact.nodes[missing]
+
+
+# RRG.arrays() objektnog grafa daje iste kolone kao parser koji odmah pravi ArrayRRG
+def test_object_graph_arrays_match_columns(graphs):
+    compact, objects = graphs
+    arrays = objects.arrays()
+    for name in COLUMNS:
+        assert np.array_equal(getattr(arrays, name), getattr(compact, name)), name
+    for node_type in ("SOURCE", "SINK", "CHANX", "CHANY", "IPIN", "OPIN"):
+        assert np.array_equal(arrays.types == arrays.type_code(node_type),
+                              compact.types == compact.type_code(node_type)), node_type
+
+
+# cvorovi i grane dodati posle prvog citanja kolona (pending nizovi) ulaze u iste kolone
+def test_add_after_read():
+    rrg = ArrayRRG()
+    rrg.add_node(Node(2, "CHANX", 3, 4, 1, 2, 2))
+    rrg.add_node(Node(0, "IPIN", 1, 1, 1, 1, 1, side="TOP"))
+    assert list(rrg.nodes) == [0, 2]
+    rrg.add_node(Node(1, "SINK", 0, 1, 1, 1, 1, capacity=4))
+    rrg.add_edge(Edge(0, 2, 5))
+    rrg.add_edge(Edge(1, 0))
+
+    assert list(rrg.nodes) == [0, 1, 2]
+    assert node_tuple(rrg.nodes[1]) == (1, "SINK", 0, 1, 1, 1, 1, None, 4)
+    assert node_tuple(rrg.nodes[0]) == (0, "IPIN", 1, 1, 1, 1, 1, "TOP", 1)
+    assert [(e.src, e.sink, e.switch) for e in rrg.edges] == [(2, 0, 5), (0, 1, None)]
+    assert rrg.successors(2).tolist() == [0]
+    assert rrg.predecessors(1).tolist() == [0]
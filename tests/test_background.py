@@ -0,0 +1,91 @@
+# BackgroundCache (pozadina renderovana jednom + sloj po slici) u poredjenju sa ponovnim crtanjem cele figure.
+#
+#   python -m pytest tests/test_background.py
+import io
+import os
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.image
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from fpga_project.background import BackgroundCache, fit_to_tight_bbox
+from fpga_project.fpga_wires import FPGAWires
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DPI = 100
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+
+
+# sloj iznad svih artista pozadine (zorder 10), pa i celo crtanje daje isti redosled
+def draw_overlay(ax, number):
+    ax.plot([2, 8 + number], [3, 9 - number], color="red", linewidth=3, zorder=10)
+    ax.text(5, 5 + number, f"iteracija {number}", zorder=10)
+    ax.set_title(f"Iteracija {number}")
+
+
+# ranije: nova figura iste velicine, crta se cela (matrica, legenda i sloj)
+def full_redraw(rrg, number):
+    visualizer = FPGAWires()
+    visualizer.visualize_matrix(rrg)
+    canvas = FigureCanvasAgg(visualizer.fig)
+    visualizer.fig.set_dpi(DPI)
+    fit_to_tight_bbox(visualizer.fig, visualizer.ax)
+    draw_overlay(visualizer.ax, number)
+    canvas.draw()
+    image = np.asarray(canvas.buffer_rgba()).copy()
+    plt.close(visualizer.fig)
+    return image
+
+
+def test_cached_frames_match_full_redraw(rrg):
+    visualizer = FPGAWires()
+    visualizer.visualize_matrix(rrg)
+    background = BackgroundCache(visualizer, dpi=DPI)
+    try:
+        # vise slika redom: clear() mora da ukloni prethodni sloj i vrati naslov
+        for number in (1, 2):
+            draw_overlay(visualizer.ax, number)
+            image = background.render().copy()
+            background.clear()
+            assert np.array_equal(image, full_redraw(rrg, number))
+    finally:
+        plt.close(visualizer.fig)
+
+
+# mapa zagusenja kao u CLI-ju: sloj se crta preko cele pozadine (i natpisa blokova), pa se slika razlikuje
+# od savefig(bbox_inches='tight') samo na malom delu piksela; slike se porede poravnate po donjoj ivici
+def test_congestion_map_close_to_savefig(rrg, tmp_path):
+    route = parse_route_packed(os.path.join(ROOT, "b9", "iteration_005.route")).to_route()
+
+    visualizer = FPGAWires()
+    visualizer.visualize_matrix(rrg)
+    visualizer.visualize_wire_congestion(rrg, route, 5)
+    buffer = io.BytesIO()
+    visualizer.fig.savefig(buffer, dpi=DPI, bbox_inches="tight", format="png")
+    plt.close(visualizer.fig)
+    buffer.seek(0)
+    old = matplotlib.image.imread(buffer)
+
+    visualizer = FPGAWires()
+    visualizer.visualize_matrix(rrg)
+    background = BackgroundCache(visualizer, dpi=DPI)
+    visualizer.visualize_wire_congestion(rrg, route, 5)
+    background.save(str(tmp_path / "cached.png"))
+    plt.close(visualizer.fig)
+    new = matplotlib.image.imread(str(tmp_path / "cached.png"))
+
+    # kesirana slika ima velicinu tight okvira pozadine (sa naslovom matrice), pa visina moze malo da odstupa
+    assert old.shape[1] == new.shape[1] and abs(len(old) - len(new)) < 0.01 * len(old)
+    rows, cols = min(len(old), len(new)), min(old.shape[1], new.shape[1])
+    differing = np.abs(old[-rows:, :cols, :3] - new[-rows:, :cols, :3]).max(axis=2) > 1 / 255
+    assert 0 < differing.mean() < 0.01
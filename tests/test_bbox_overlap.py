@@ -0,0 +1,108 @@
+# segment_bbox_overlap (2D difference array) mora da da iste brojeve kao stara provera svakog segmenta sa
+# svakim bbox-om, i za bbox-ove uz ivicu matrice i za granice koje padaju tacno na koordinatu segmenta.
+#
+#   python -m pytest tests/test_bbox_overlap.py
+import os
+
+import numpy as np
+import pytest
+
+from fpga_project.fpga_metrics import FPGAMetrics
+from fpga_project.models import ArrayRRG, PackedRoute
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TYPE_NAMES = ["SOURCE", "SINK", "CHANX", "CHANY"]
+
+
+# brojanje kakvo je bilo pre prefiksnih suma, za poredjenje
+def overlap_loop(segment_x, segment_y, boxes, padding):
+    result = []
+    for x, y in zip(segment_x, segment_y):
+        count = 0
+        for min_x, max_x, min_y, max_y in boxes:
+            if (min_x - padding <= x <= max_x + padding) and (min_y - padding <= y <= max_y + padding):
+                count += 1
+        result.append(count)
+    return result
+
+
+# SOURCE i SINK u svakom CLB polju i po jedna CHANX/CHANY zica na svakoj poziciji kanala
+def small_rrg(size):
+    xs, ys = np.meshgrid(np.arange(size + 2), np.arange(size + 2), indexing="ij")
+    xs, ys = xs.ravel(), ys.ravel()
+    clb = (xs >= 1) & (xs <= size) & (ys >= 1) & (ys <= size)
+    chanx = (xs >= 1) & (xs <= size) & (ys <= size)
+    chany = (ys >= 1) & (ys <= size) & (xs <= size)
+
+    types = np.concatenate([np.full(clb.sum(), 0), np.full(clb.sum(), 1),
+                            np.full(chanx.sum(), 2), np.full(chany.sum(), 3)]).astype(np.uint8)
+    xlow = np.concatenate([xs[clb], xs[clb], xs[chanx], xs[chany]]).astype(np.int32)
+    ylow = np.concatenate([ys[clb], ys[clb], ys[chanx], ys[chany]]).astype(np.int32)
+    n = len(types)
+    zeros = np.zeros(n, dtype=np.int32)
+    empty = np.empty(0, dtype=np.int32)
+    rrg = ArrayRRG.from_arrays(np.arange(n, dtype=np.int64), types, TYPE_NAMES, zeros, xlow, xlow, ylow, ylow,
+                               np.zeros(n, dtype=np.uint8), [None], empty, empty, np.empty(0, dtype=np.int16),
+                               grid={(x, y): 0 for x, y in ((0, 0), (size + 1, size + 1))})
+    return rrg, int(clb.sum())
+
+
+# signali sa jednim SOURCE i 1..5 SINK-ova u slucajnim CLB poljima; prva dva signala pokrivaju uglove
+# matrice (bbox do ivice i preko cele matrice)
+def random_route(num_clb, num_nets, rng):
+    terminals = [[0, num_clb - 1], [num_clb - 1, 0, num_clb - 1]]
+    terminals += [rng.integers(0, num_clb, rng.integers(2, 7)).tolist() for _ in range(num_nets - 2)]
+    offsets = np.zeros(num_nets + 1, dtype=np.int64)
+    np.cumsum([len(nodes) for nodes in terminals], out=offsets[1:])
+    is_source = np.zeros(offsets[-1], dtype=bool)
+    is_source[offsets[:-1]] = True
+    node_ids = np.concatenate(terminals)
+    node_ids = np.where(is_source, node_ids, node_ids + num_clb).astype(np.int32)
+    parent = np.where(is_source, -1, 0).astype(np.int32)
+    minus_one = np.full(offsets[-1], -1, dtype=np.int16)
+    return PackedRoute(np.arange(num_nets, dtype=np.int32), [str(k) for k in range(num_nets)], offsets,
+                       node_ids, parent, minus_one, minus_one)
+
+
+def check_overlap(metrics, rrg, route, padding):
+    segment_x, segment_y = metrics.segment_coords(rrg)[:2]
+    _, min_x, max_x, min_y, max_y = metrics.terminal_bounding_boxes(rrg, route)
+    valid = ~np.isnan(min_x)
+    boxes = list(zip(min_x[valid].tolist(), max_x[valid].tolist(), min_y[valid].tolist(), max_y[valid].tolist()))
+    expected = overlap_loop(segment_x.tolist(), segment_y.tolist(), boxes, padding)
+    assert metrics.segment_bbox_overlap(rrg, route, padding=padding).tolist() == expected
+    return expected
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_overlap_matches_loop_on_random_layout(seed):
+    rng = np.random.default_rng(seed)
+    size = int(rng.integers(3, 8))
+    rrg, num_clb = small_rrg(size)
+    route = random_route(num_clb, 40, rng)
+    metrics = FPGAMetrics()
+    metrics.map_rrg_to_grid(rrg)
+
+    segment_x, segment_y = metrics.segment_coords(rrg)[:2]
+    node_x = metrics.node_x[:num_clb]
+    # padding 0, podrazumevani, veci od matrice i razmaci centar CLB - segment, kada granica bbox-a pada
+    # tacno na koordinatu segmenta
+    paddings = [0.0, 0.4] + np.unique(np.abs(segment_x[:, None] - node_x[None, :5])).tolist()[:6]
+    for padding in paddings:
+        check_overlap(metrics, rrg, route, padding)
+    # padding veci od matrice: svaki segment je u svim bbox-ovima
+    assert check_overlap(metrics, rrg, route, 100.0) == [40] * len(segment_x)
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+
+
+@pytest.mark.parametrize("padding", [0.0, 0.4])
+def test_overlap_matches_loop_on_b9(rrg, padding):
+    metrics = FPGAMetrics()
+    metrics.map_rrg_to_grid(rrg)
+    check_overlap(metrics, rrg, parse_route_packed(os.path.join(ROOT, "b9", "b9.route")), padding)
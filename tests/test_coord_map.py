@@ -0,0 +1,97 @@
+# Vektorizovani map_rrg_to_grid mora da da iste koordinate kao stara petlja po cvorovima
+# (calculate_node_position + fallback), i za velicinu iz rrg.xml i za zadatu matricu manju od grafa.
+#
+#   python -m pytest tests/test_coord_map.py
+import os
+
+import numpy as np
+import pytest
+
+from fpga_project.fpga_layout import FPGALayout
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# map_rrg_to_grid kakav je bio pre vektorizacije (petlja po rrg.nodes), za poredjenje
+def map_rrg_to_grid_loop(layout, rrg):
+    coord_map = {}
+    start_clb_x = layout.io_size + layout.io_clb_gap
+    start_clb_y = layout.io_size + layout.io_clb_gap
+    cell_w = layout.clb_size + layout.clb_channel_gap
+    cell_h = layout.clb_size + layout.clb_channel_gap
+    channel_x_inner_offset = (layout.clb_channel_gap / 2) - (layout.channel_width / 2)
+    channel_y_inner_offset = (layout.clb_channel_gap / 2) - (layout.channel_width / 2)
+
+    for node in rrg.nodes.values():
+        try:
+            vx, vy = layout.calculate_node_position(node, start_clb_x, start_clb_y)
+        except Exception:
+            vx = vy = None
+
+        if vx is not None and vy is not None:
+            coord_map[node.id] = (vx, vy)
+            continue
+
+        if node.type not in ['CHANX', 'CHANY']:
+            visual_x = start_clb_x + (node.xlow - 1) * cell_w + layout.clb_size / 2
+            visual_y = start_clb_y + (node.ylow - 1) * cell_h + layout.clb_size / 2
+        elif node.type == 'CHANX':
+            if node.ylow == 0 or node.ylow == layout.num_rows:
+                coord = layout.calculate_io_clb_channel_position(node, start_clb_x, start_clb_y)
+                if coord is not None:
+                    coord_map[node.id] = coord
+                continue
+            x_base = start_clb_x + (node.xlow - 1) * cell_w
+            y_channel = start_clb_y + (node.ylow - 1) * cell_h + layout.clb_size + channel_y_inner_offset
+            visual_x = x_base + layout.clb_size / 2
+            visual_y = y_channel + node.ptc * layout.channel_spacing
+        else:
+            if node.xlow == 0 or node.xlow == layout.num_cols:
+                coord = layout.calculate_io_clb_channel_position(node, start_clb_x, start_clb_y)
+                if coord is not None:
+                    coord_map[node.id] = coord
+                continue
+            x_channel = start_clb_x + (node.xlow - 1) * cell_w + layout.clb_size + channel_x_inner_offset
+            y_base = start_clb_y + (node.ylow - 1) * cell_h
+            visual_x = x_channel + node.ptc * layout.channel_spacing
+            visual_y = y_base + layout.clb_size / 2
+
+        coord_map[node.id] = (visual_x, visual_y)
+    return coord_map
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+
+
+# None = velicina iz <grid> u rrg.xml; ostalo su matrice manje od b9 (8x8 CLB), pa deo cvorova ide u fallback
+@pytest.mark.parametrize("grid", [None, (6, 6), (4, 3)])
+def test_map_rrg_to_grid_matches_node_loop(rrg, grid):
+    layout = FPGALayout()
+    num_rows, num_cols = grid or (None, None)
+    layout.map_rrg_to_grid(rrg, num_rows, num_cols)
+
+    expected = map_rrg_to_grid_loop(layout, rrg)
+    expected_x = np.full(len(layout.node_x), np.nan)
+    expected_y = np.full(len(layout.node_y), np.nan)
+    for node_id, (x, y) in expected.items():
+        expected_x[node_id] = x
+        expected_y[node_id] = y
+
+    assert np.array_equal(layout.node_x, expected_x, equal_nan=True)
+    assert np.array_equal(layout.node_y, expected_y, equal_nan=True)
+    assert dict(layout.coord_map) == expected
+
+
+def test_small_grid_uses_fallback(rrg):
+    layout = FPGALayout()
+    layout.map_rrg_to_grid(rrg, 4, 3)
+    start_clb_x = layout.io_size + layout.io_clb_gap
+    start_clb_y = layout.io_size + layout.io_clb_gap
+    # cvorovi za koje calculate_node_position nema poziciju (van 4x3 matrice) a ipak su mapirani
+    fallback = [node.id for node in rrg.nodes.values()
+                if None in layout.calculate_node_position(node, start_clb_x, start_clb_y)
+                and node.id in layout.coord_map]
+    assert len(fallback) > 100
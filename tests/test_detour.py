@@ -0,0 +1,61 @@
+# detour_table (jedan BFS po SOURCE-u, serijski i u procesima) u poredjenju sa Dijkstrom po konekciji
+# (RRGSearch sa cenom 1 po cvoru) i sa dubinom SINK-a u stablu rute.
+#
+#   python -m pytest tests/test_detour.py
+import math
+import os
+
+import numpy as np
+import pytest
+
+from fpga_project.detour import detour_table
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.router import RRGSearch
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+
+
+# broj grana od korena do cvora, penjanjem po parent nizu
+def tree_depth(route, position):
+    k = int(route.net_of_node()[position])
+    start = int(route.offsets[k])
+    hops = 0
+    index = int(route.parent[position])
+    while index >= 0:
+        hops += 1
+        index = int(route.parent[start + index])
+    return hops
+
+
+@pytest.mark.parametrize("name", ["iteration_003.route", "b9.route"])
+def test_min_hops_match_dijkstra(rrg, name):
+    route = parse_route_packed(os.path.join(ROOT, "b9", name))
+    table = detour_table(rrg, route, workers=1)
+
+    sinks = np.flatnonzero(route.sink_mask(rrg))
+    assert len(table) == len(sinks) > 50
+    assert table.routed_hops.tolist() == [tree_depth(route, position) for position in sinks.tolist()]
+
+    search = RRGSearch(rrg, node_cost=np.ones(len(rrg.ids)))
+    expected = [search.shortest_path_length(src, sink)
+                for src, sink in zip(table.source_ids.tolist(), table.sink_ids.tolist())]
+    assert table.min_hops.tolist() == [-1 if math.isinf(length) else int(length) for length in expected]
+    assert (table.min_hops <= table.routed_hops).all()
+
+
+# procesi sa CSR-om u deljenoj memoriji daju istu tabelu kao serijski BFS, i sa vise SOURCE-ova po poslu
+@pytest.mark.parametrize("chunksize", [1, None])
+def test_workers_match_serial(rrg, chunksize):
+    route = parse_route_packed(os.path.join(ROOT, "b9", "b9.route"))
+    serial = detour_table(rrg, route, workers=1)
+    parallel = detour_table(rrg, route, workers=2, chunksize=chunksize)
+    for name in ("net_numbers", "source_ids", "sink_ids", "net_pin_index", "routed_hops", "min_hops"):
+        assert np.array_equal(getattr(parallel, name), getattr(serial, name))
+    assert parallel.net_names == serial.net_names
+    assert np.array_equal(parallel.detour, serial.detour, equal_nan=True)
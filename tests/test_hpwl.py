@@ -0,0 +1,82 @@
+# calculate_hpwl (reduceat nad PackedRoute) mora da da isti HPWL kao ranija petlja po signalima i cvorovima,
+# u koordinatama crteza i u RR jedinicama.
+#
+#   python -m pytest tests/test_hpwl.py
+import os
+
+import numpy as np
+import pytest
+
+from fpga_project.fpga_metrics import FPGAMetrics
+from fpga_project.models import PackedRoute
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# hpwl_all_signals kakav je bio pre vektorizacije (kao u benchmarks/bench_hpwl.py), i isto za RR jedinice
+# preko xlow..xhigh / ylow..yhigh cvorova; signal bez koordinata ima HPWL 0
+def hpwl_loop(coord_map, rrg, route):
+    hpwl_results, grid_results = {}, {}
+    for net_id, net in route.nets.items():
+        x_coords, y_coords = [], []
+        grid_x, grid_y = [], []
+        for node_id in net.node_ids:
+            if node_id in coord_map:
+                x, y = coord_map[node_id]
+                x_coords.append(x)
+                y_coords.append(y)
+            node = rrg.nodes.get(node_id)
+            if node is not None:
+                grid_x += [node.xlow, node.xhigh]
+                grid_y += [node.ylow, node.yhigh]
+        if x_coords and y_coords:
+            hpwl_results[net_id] = (max(x_coords) - min(x_coords)) + (max(y_coords) - min(y_coords))
+        else:
+            hpwl_results[net_id] = 0
+        grid_results[net_id] = (max(grid_x) - min(grid_x)) + (max(grid_y) - min(grid_y)) if grid_x else 0
+    return hpwl_results, grid_results
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+
+
+@pytest.mark.parametrize("name", ["iteration_001.route", "iteration_030.route", "b9.route"])
+@pytest.mark.parametrize("grid", [None, (4, 3)])
+def test_hpwl_matches_net_loop(rrg, name, grid):
+    route = parse_route_packed(os.path.join(ROOT, "b9", name))
+    metrics = FPGAMetrics()
+    metrics.map_rrg_to_grid(rrg, *(grid or (None, None)))
+
+    expected, expected_grid = hpwl_loop(dict(metrics.coord_map), rrg, route.to_route())
+    assert metrics.hpwl_all_signals(rrg, route) == expected
+    assert metrics.hpwl_grid_all_signals(rrg, route) == expected_grid
+
+
+# prazan signal i signal samo od id-jeva kojih nema u grafu dobijaju NaN (0 u hpwl_all_signals, kao petlja)
+def test_hpwl_nets_without_coordinates(rrg):
+    route = parse_route_packed(os.path.join(ROOT, "b9", "b9.route"))
+    size = len(route.net_numbers)
+    unknown = np.array([10 ** 6, 10 ** 6 + 1], dtype=route.node_ids.dtype)
+
+    def extend(column, values):
+        return np.concatenate([column, np.asarray(values, dtype=column.dtype)])
+
+    extended = PackedRoute(
+        extend(route.net_numbers, [size, size + 1]), route.net_names + ["prazan", "nepoznat"],
+        extend(route.offsets, [route.offsets[-1], route.offsets[-1] + 2]),
+        extend(route.node_ids, unknown), extend(route.parent, [-1, 0]), extend(route.switch, [-1, 0]),
+        extend(route.net_pin_index, [-1, -1]))
+
+    metrics = FPGAMetrics()
+    metrics.map_rrg_to_grid(rrg)
+    net_numbers, hpwl, hpwl_grid = metrics.calculate_hpwl(rrg, extended)
+    assert np.isnan(hpwl[-2:]).all() and np.isnan(hpwl_grid[-2:]).all()
+    assert not np.isnan(hpwl[:-2]).any()
+
+    expected, expected_grid = hpwl_loop(dict(metrics.coord_map), rrg, extended.to_route())
+    assert metrics.hpwl_results(net_numbers, hpwl) == expected
+    assert metrics.hpwl_results(net_numbers, hpwl_grid) == expected_grid
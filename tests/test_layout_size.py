@@ -0,0 +1,67 @@
+# velicina matrice i broj staza iz <grid>/<channels> u rrg.xml, u poredjenju sa ranijim fiksnim 6x6 i 8 staza.
+#
+#   python -m pytest tests/test_layout_size.py
+import os
+
+import numpy as np
+import pytest
+
+from fpga_project.fpga_layout import FPGALayout
+from fpga_project.parser_rrg import RRGParser
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RRG_FILE = os.path.join(ROOT, "b9", "rrg.xml")
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(RRG_FILE)
+
+
+# raniji raspored: map_rrg_to_grid(rrg, 6, 6) sa podrazumevanih 8 staza, bez citanja velicine iz grafa
+def fixed_layout(rrg):
+    layout = FPGALayout()
+    layout.size_from_rrg = lambda rrg: None
+    layout.map_rrg_to_grid(rrg, 6, 6)
+    return layout
+
+
+def test_b9_size_matches_fixed_layout(rrg):
+    layout = FPGALayout()
+    layout.map_rrg_to_grid(rrg)
+    expected = fixed_layout(rrg)
+
+    assert rrg.grid_size() == (8, 8) and rrg.chan_width_max == 8
+    for name in ("num_rows", "num_cols", "num_channels", "channel_spacing", "channel_width"):
+        assert getattr(layout, name) == getattr(expected, name)
+    assert np.array_equal(layout.node_x, expected.node_x, equal_nan=True)
+    assert np.array_equal(layout.node_y, expected.node_y, equal_nan=True)
+
+
+# rrg.xml sa vecom matricom (12x10 sa IO prstenom) i 20 staza: 10x8 CLB, a kanal ostaje iste sirine
+@pytest.mark.parametrize("streaming", [True, False])
+def test_size_from_edited_graph(tmp_path, streaming):
+    with open(RRG_FILE, "r") as f:
+        text = f.read()
+    text = text.replace('chan_width_max="8"', 'chan_width_max="20"', 1)
+    text = text.replace("<grid>", '<grid>\n<grid_loc block_type_id="0" height_offset="0" layer="0" '
+                                  'width_offset="0" x="11" y="9"/>', 1)
+    rrg_file = tmp_path / "rrg.xml"
+    rrg_file.write_text(text)
+
+    parser = RRGParser()
+    parser.parse(str(rrg_file), streaming=streaming)
+    layout = FPGALayout()
+    layout.size_from_rrg(parser.get_rrg())
+
+    assert (layout.num_cols, layout.num_rows, layout.num_channels) == (10, 8, 20)
+    assert layout.channel_width == pytest.approx(FPGALayout().channel_width)
+    assert layout.channel_spacing == pytest.approx(FPGALayout().channel_width / 20)
+
+
+# graf bez <grid> i <channels> (napravljen rucno) zadrzava ranije vrednosti
+def test_size_without_grid_keeps_defaults():
+    layout = FPGALayout()
+    layout.size_from_rrg(RRGParser(compact=False).get_rrg())
+    assert (layout.num_rows, layout.num_cols, layout.num_channels) == (6, 6, 8)
@@ -0,0 +1,56 @@
+# FPGAMatrix.draw_fpga_grid (jedna PatchCollection za blokove, jedna LineCollection za zice) mora da da isti
+# crtez kao raniji Rectangle/Line2D artist po bloku i zici (OldMatrix iz benchmarks/bench_matrix_render.py).
+# Slike se porede na dpi=300 kao u FPGAMatrix.save.
+#
+#   python -m pytest tests/test_matrix_render.py
+import io
+import os
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_matrix_render import OldMatrix
+from fpga_project.fpga_matrix import FPGAMatrix
+
+
+def render(matrix, size, channels):
+    matrix.num_channels = channels
+    matrix.channel_spacing = matrix.channel_width / channels
+    matrix.draw_fpga_grid(size, size)
+    buffer = io.BytesIO()
+    matrix.fig.savefig(buffer, format="rgba", dpi=300)
+    texts = len(matrix.ax.texts)
+    plt.close(matrix.fig)
+    return np.frombuffer(buffer.getvalue(), dtype=np.uint8), texts
+
+
+# mala matrica: natpisi staju, pa se crtaju kao ranije
+@pytest.mark.parametrize("size, channels", [(3, 8), (6, 8)])
+def test_grid_matches_artist_per_block(size, channels):
+    image, texts = render(FPGAMatrix(), size, channels)
+    expected, expected_texts = render(OldMatrix(), size, channels)
+    assert texts == expected_texts > 0
+    assert np.array_equal(image, expected)
+
+
+# velika matrica: natpisi ne staju izmedju blokova i izostavljaju se, ostatak crteza je isti
+def test_large_grid_drops_labels():
+    image, texts = render(FPGAMatrix(), 40, 2)
+    expected, _ = render(OldMatrix(labels=False), 40, 2)
+    assert texts == 0
+    assert np.array_equal(image, expected)
+
+
+@pytest.mark.parametrize("size, fits", [(6, True), (30, True), (40, False)])
+def test_block_labels_fit(size, fits):
+    matrix = FPGAMatrix()
+    matrix.draw_fpga_grid(size, size)
+    assert matrix.block_labels_fit() == fits
+    plt.close(matrix.fig)
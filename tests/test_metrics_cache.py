@@ -0,0 +1,53 @@
+# kes metrika po ruti (route_metric): kljuc je ruta pa RRG preko slabih referenci, pa kes nestaje sa
+# grafom i ne deli se izmedju dva RRG-a; forget_route_metrics brise kes rute izmenjene na mestu.
+#
+#   python -m pytest tests/test_metrics_cache.py
+import gc
+import os
+
+import pytest
+
+from fpga_project.fpga_metrics import ROUTE_METRICS, FPGAMetrics, forget_route_metrics
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+
+
+@pytest.fixture()
+def route():
+    return parse_route_packed(os.path.join(ROOT, "b9", "b9.route"))
+
+
+def test_route_metric_is_cached_per_rrg(rrg, route):
+    metrics = FPGAMetrics()
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+
+    assert metrics.route_metric(rrg, route, "test", compute) == 1
+    assert metrics.route_metric(rrg, route, "test", compute) == 1
+
+    other = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    assert metrics.route_metric(other, route, "test", compute) == 2
+    assert len(ROUTE_METRICS[route]) == 2
+
+    # kes drugog grafa nestaje sa njim, pa novi objekat sa istim id-jem ne moze da dobije stari rezultat
+    del other
+    gc.collect()
+    assert len(ROUTE_METRICS[route]) == 1
+
+
+def test_forget_route_metrics(rrg, route):
+    metrics = FPGAMetrics()
+    metrics.map_rrg_to_grid(rrg)
+    table = metrics.bounding_box_table(rrg, route)
+    assert metrics.bounding_box_table(rrg, route) is table
+
+    forget_route_metrics(route)
+    assert route not in ROUTE_METRICS
+    assert metrics.bounding_box_table(rrg, route) is not table
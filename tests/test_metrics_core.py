@@ -0,0 +1,66 @@
+# FPGAMetrics (bez crtanja) mora da da iste metrike kao klase koje crtaju (FPGARoutingAnalysis), bez
+# pravljenja figure i bez ucitavanja matplotlib-a.
+#
+#   python -m pytest tests/test_metrics_core.py
+import os
+import subprocess
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from fpga_project.fpga_analysis import FPGARoutingAnalysis
+from fpga_project.fpga_metrics import FPGAMetrics
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RRG_FILE = os.path.join(ROOT, "b9", "rrg.xml")
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(RRG_FILE)
+
+
+def test_metrics_match_rendering_class(rrg):
+    route = parse_route_packed(os.path.join(ROOT, "b9", "b9.route"))
+    metrics, analysis = FPGAMetrics(), FPGARoutingAnalysis()
+    for layout in (metrics, analysis):
+        layout.map_rrg_to_grid(rrg)
+
+    for found, expected in zip(metrics.calculate_hpwl(rrg, route), analysis.calculate_hpwl(rrg, route)):
+        assert np.array_equal(found, expected, equal_nan=True)
+    assert metrics.compute_deviation_metrics(rrg, route) == analysis.compute_deviation_metrics(rrg, route)
+    for terminal in (False, True):
+        found = metrics.compute_bounding_box_table(rrg, route, terminal, 0.4)
+        expected = analysis.compute_bounding_box_table(rrg, route, terminal, 0.4)
+        assert found.keys() == expected.keys()
+        for name in found:
+            assert np.array_equal(found[name], expected[name], equal_nan=True)
+
+    # metrike ne crtaju, pa figura ne postoji dok je nesto ne zatrazi
+    assert analysis._fig is None and analysis._ax is None
+    assert analysis.ax is analysis.fig.axes[0]
+    plt.close(analysis.fig)
+
+
+# kao `python -m fpga_project hpwl`: ucitavanje grafa i rute i HPWL bez ijednog matplotlib modula
+def test_metrics_do_not_import_matplotlib():
+    script = (
+        "import os, sys\n"
+        "from fpga_project.fpga_metrics import FPGAMetrics\n"
+        "from fpga_project.parser_route import parse_route_packed\n"
+        "from fpga_project.rrg_cache import RRGCache\n"
+        f"rrg = RRGCache().load_or_parse({RRG_FILE!r})\n"
+        f"route = parse_route_packed({os.path.join(ROOT, 'b9', 'b9.route')!r})\n"
+        "metrics = FPGAMetrics()\n"
+        "metrics.map_rrg_to_grid(rrg)\n"
+        "metrics.calculate_deviation_metrics(rrg, route)\n"
+        "print(sorted(name for name in sys.modules if name.split('.')[0] == 'matplotlib'))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
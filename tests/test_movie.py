@@ -0,0 +1,35 @@
+# PalettePillowWriter: svi frejmovi GIF-a dele paletu prvog frejma, pa se nepromenjeni pikseli ne menjaju.
+#
+#   python -m pytest tests/test_movie.py
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image, ImageSequence
+
+from fpga_project.movie import PalettePillowWriter
+
+
+def test_frames_share_palette(tmp_path):
+    fig, ax = plt.subplots(figsize=(3, 2))
+    ax.imshow(np.linspace(0, 1, 256).reshape(16, 16), cmap="viridis", extent=(0, 1, 0, 1))
+    points = ax.scatter([1.5, 2.0], [0.5, 0.5], c=[0.0, 0.0], cmap="Blues", vmin=0, vmax=1, s=200)
+    ax.set_xlim(0, 2.5)
+
+    filename = tmp_path / "movie.gif"
+    writer = PalettePillowWriter(fps=5)
+    with writer.saving(fig, str(filename), dpi=50):
+        for value in (0.2, 0.6, 1.0):
+            points.set_array(np.array([value, 1 - value]))
+            writer.grab_frame()
+    plt.close(fig)
+
+    frames = [np.array(frame.convert("RGB")) for frame in ImageSequence.Iterator(Image.open(filename))]
+    assert len(frames) == 3
+    assert Image.open(filename).info["duration"] == 200
+    # gradijent levo od tacaka je isti u svim frejmovima, a tacke se menjaju
+    width = frames[0].shape[1]
+    for frame in frames[1:]:
+        assert np.array_equal(frame[:, :width // 3], frames[0][:, :width // 3])
+        assert not np.array_equal(frame, frames[0])
+    assert writer.frames[0].getpalette() == writer.frames[-1].getpalette()
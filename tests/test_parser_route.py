@@ -0,0 +1,96 @@
+# parser_route: pronalazenje iteracija u direktorijumu rutiranja i poredjenje split parsera sa ranijim regex parserom.
+#
+#   python -m pytest tests/test_parser_route.py
+import os
+import re
+
+import pytest
+
+from fpga_project.parser_route import RouteParser, find_iteration_files
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_dir(tmp_path, name, files):
+    directory = tmp_path / name
+    directory.mkdir()
+    for file_name in files:
+        (directory / file_name).write_text("")
+    return str(directory)
+
+
+def test_iterations_sorted_with_final_last(tmp_path):
+    directory = make_dir(tmp_path, "b9", ["iteration_010.route", "b9.route", "iteration_002.route", "b9.place"])
+    files = find_iteration_files(directory)
+    assert list(files) == [2, 10, 0]
+    assert files[0] == os.path.join(directory, "b9.route")
+
+
+# vise finalnih ruta: bira se ona sa imenom direktorijuma, bez obzira na redosled os.listdir
+@pytest.mark.parametrize("listing", [["a.route", "b9.route", "z.route"], ["z.route", "b9.route", "a.route"]])
+def test_final_route_named_after_directory(tmp_path, monkeypatch, listing):
+    directory = make_dir(tmp_path, "b9", listing + ["iteration_001.route"])
+    monkeypatch.setattr(os, "listdir", lambda path: list(listing) + ["iteration_001.route"])
+    assert find_iteration_files(directory)[0] == os.path.join(directory, "b9.route")
+
+
+def test_single_final_route_with_other_name(tmp_path):
+    directory = make_dir(tmp_path, "out", ["b9.route", "iteration_001.route"])
+    assert find_iteration_files(directory)[0] == os.path.join(directory, "b9.route")
+
+
+def test_ambiguous_final_routes(tmp_path):
+    directory = make_dir(tmp_path, "out", ["a.route", "b.route"])
+    with pytest.raises(ValueError):
+        find_iteration_files(directory)
+
+
+def test_b9_directory():
+    files = find_iteration_files(os.path.join(ROOT, "b9"))
+    assert files[0] == os.path.join(ROOT, "b9", "b9.route")
+    assert list(files)[-1] == 0
+    assert list(files)[:-1] == sorted(list(files)[:-1])
+
+
+# raniji parser (re.match po liniji, kao u benchmarks/bench_route_parser.py): id, tip i (x, y) cvorova
+# svakog signala redom kao u fajlu, ukljucujuci ponovljene tacke grananja
+def parse_with_regex(route_file):
+    nets = {}
+    current_net = None
+    with open(route_file, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("Net"):
+                match = re.match(r"Net\s+(\d+)\s+\((.+)\)", line)
+                if match:
+                    current_net = int(match.group(1))
+                    nets[current_net] = (match.group(2), [])
+                continue
+            if line.startswith("Node") and current_net is not None:
+                match = re.match(r"Node:\s*(\d+)\s+(\w+)\s+\((\d+),(\d+),\d+\)", line)
+                if match:
+                    nets[current_net][1].append((int(match.group(1)), match.group(2),
+                                                 int(match.group(3)), int(match.group(4))))
+    return nets
+
+
+# split parser daje iste signale i, obilaskom stabla (Net.path), iste cvorove redom kao u fajlu
+@pytest.mark.parametrize("name", ["iteration_001.route", "iteration_025.route", "b9.route"])
+def test_split_parser_matches_regex(name):
+    route_file = os.path.join(ROOT, "b9", name)
+    expected = parse_with_regex(route_file)
+    parser = RouteParser()
+    parser.parse(route_file)
+    nets = parser.get_route().nets
+
+    assert list(nets) == list(expected)
+    assert len(nets) > 10
+    for net_number, net in nets.items():
+        net_id, nodes = expected[net_number]
+        assert net.id == net_id
+        assert net.path() == [node[0] for node in nodes]
+        # Net_pin_index postoji samo na SINK linijama
+        sinks = {node[0] for node in nodes if node[1] == "SINK"}
+        assert {node_id for node_id, pin in zip(net.node_ids, net.net_pin_index) if pin >= 0} <= sinks
@@ -0,0 +1,45 @@
+# top_k_indices i top_k moraju da daju isto sto i sorted(..., reverse=True)[:k], i za jednake
+# vrednosti i za NaN (rangira se kao -inf, iza svih brojeva).
+#
+#   python -m pytest tests/test_ranking.py
+import math
+
+import numpy as np
+import pytest
+
+from fpga_project.ranking import top_k, top_k_indices
+
+
+def expected_indices(values, k):
+    key = [-math.inf if math.isnan(value) else value for value in values]
+    return sorted(range(len(values)), key=lambda i: key[i], reverse=True)[:k]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [0, 1, 5, 17, 100, 150])
+def test_top_k_indices_matches_sorted(seed, k):
+    rng = np.random.default_rng(seed)
+    # malo razlicitih vrednosti, pa ima mnogo jednakih; deo vrednosti je NaN ili -inf
+    values = rng.integers(0, 10, 100).astype(np.float64)
+    values[rng.random(100) < 0.2] = np.nan
+    values[rng.random(100) < 0.05] = -np.inf
+
+    found = top_k_indices(values, k).tolist()
+    assert found == expected_indices(values.tolist(), k)
+    assert len(found) == min(k, len(values))
+
+
+def test_top_k_indices_all_nan():
+    values = np.full(8, np.nan)
+    assert top_k_indices(values, 3).tolist() == [0, 1, 2]
+
+
+@pytest.mark.parametrize("dtype", [np.int64, np.uint32])
+def test_top_k_indices_integer_ties(dtype):
+    values = np.array([3, 1, 3, 0, 2, 3, 1], dtype=dtype)
+    assert top_k_indices(values, 4).tolist() == expected_indices(values.tolist(), 4)
+
+
+def test_top_k_matches_sorted():
+    items = [("a", 2), ("b", 5), ("c", 2), ("d", 5), ("e", 1)]
+    assert top_k(items, 3, key=lambda item: item[1]) == sorted(items, key=lambda item: item[1], reverse=True)[:3]
@@ -0,0 +1,100 @@
+# Inkrementalne metrike kroz iteracije (walk_iterations) moraju da daju isto sto i racunanje od nule za
+# svaku b9 iteraciju, a da racunaju samo promenjene signale.
+#
+#   python -m pytest tests/test_route_diff.py
+import os
+
+import numpy as np
+import pytest
+
+from fpga_project.fpga_metrics import FPGAMetrics
+from fpga_project.models import PackedRoute
+from fpga_project.occupancy import WireOccupancy
+from fpga_project.parser_route import load_all_iterations
+from fpga_project.route_diff import diff_routes, walk_iterations
+from fpga_project.rrg_cache import RRGCache
+from fpga_project.timing import TimingReport
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def b9():
+    rrg = RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+    routes = load_all_iterations(os.path.join(ROOT, "b9"), max_workers=1)
+    analyzer = FPGAMetrics()
+    analyzer.map_rrg_to_grid(rrg)
+    return rrg, routes, analyzer
+
+
+def test_incremental_metrics_match_full_recompute(b9):
+    rrg, routes, analyzer = b9
+    assert len(routes) == 64
+    for number, diff, metrics in walk_iterations(rrg, routes, analyzer.coord_map):
+        route = routes[number]
+        assert np.array_equal(metrics.wire_load, WireOccupancy(rrg, route).occupancy), number
+
+        net_numbers, hpwl, hpwl_grid = metrics.hpwl_table()
+        expected_numbers, expected_hpwl, expected_grid = analyzer.calculate_hpwl(rrg, route)
+        assert np.array_equal(net_numbers, expected_numbers)
+        assert np.array_equal(hpwl, expected_hpwl, equal_nan=True), number
+        assert np.array_equal(hpwl_grid, expected_grid, equal_nan=True), number
+
+        assert metrics.deviation_metrics() == analyzer.compute_deviation_metrics(rrg, route), number
+
+
+def test_walk_recomputes_only_changed_nets(b9):
+    rrg, routes, analyzer = b9
+    changes = 0
+    for number, diff, metrics in walk_iterations(rrg, routes, analyzer.coord_map):
+        changes += len(diff.changed) + len(diff.added)
+    # prva ruta je cela "added", posle nje samo promene
+    assert metrics.recomputed == changes
+    assert changes < sum(len(route) for route in routes.values()) / 2
+
+
+def test_timing_reuse_matches_full_recompute(b9):
+    rrg, routes, _ = b9
+    previous, previous_route = None, None
+    for number, route in routes.items():
+        diff = diff_routes(previous_route, route) if previous_route is not None else None
+        report = TimingReport(rrg, route, previous, diff)
+        full = TimingReport(rrg, route)
+        assert np.array_equal(report.sink_ids, full.sink_ids)
+        assert np.array_equal(report.delay, full.delay), number
+        previous, previous_route = report, route
+
+
+def test_select_keeps_requested_nets(b9):
+    _, routes, _ = b9
+    route = routes[0]
+    subset = route.select([5, 2])
+    assert subset.net_numbers.tolist() == [route.net_numbers[5], route.net_numbers[2]]
+    for i, k in enumerate((5, 2)):
+        assert np.array_equal(subset.node_ids[subset.net_slice(i)], route.node_ids[route.net_slice(k)])
+        assert np.array_equal(subset.parent[subset.net_slice(i)], route.parent[route.net_slice(k)])
+
+
+# promena samo prekidaca (isti cvorovi i stablo) menja kasnjenje, pa signal mora biti "changed" i
+# TimingReport ne sme da zadrzi staro kasnjenje
+def test_switch_change_marks_net_changed(b9):
+    rrg, routes, _ = b9
+    route = routes[0]
+    part = route.net_slice(3)
+    switches = np.unique(rrg.arrays().edge_switch)
+    assert len(switches) > 1
+
+    edited = PackedRoute(route.net_numbers, route.net_names, route.offsets, route.node_ids, route.parent,
+                         route.switch.copy(), route.net_pin_index)
+    with_parent = np.flatnonzero(route.parent[part] >= 0) + part.start
+    old = route.switch[with_parent[0]]
+    edited.switch[with_parent[0]] = switches[switches != old][0]
+
+    diff = diff_routes(route, edited)
+    assert diff.changed == [int(route.net_numbers[3])]
+
+    previous = TimingReport(rrg, route)
+    report = TimingReport(rrg, edited, previous, diff)
+    full = TimingReport(rrg, edited)
+    assert not np.array_equal(full.delay, previous.delay)
+    assert np.array_equal(report.delay, full.delay)
@@ -0,0 +1,89 @@
+# Net kao stablo nad id-jevima RR cvorova (node_ids, parent, switch, net_pin_index) u poredjenju sa ranijom
+# ravnom listom cvorova iz .route fajla.
+#
+#   python -m pytest tests/test_route_tree.py
+import os
+
+import pytest
+
+from fpga_project.models import PackedRoute
+from fpga_project.parser_route import RouteParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ravna lista kao ranije (id, tip, Switch, Net_pin_index po liniji, redom kao u fajlu) po signalu
+def flat_nets(route_file):
+    nets = {}
+    current = None
+    with open(route_file, "r") as f:
+        for line in f:
+            parts = line.split()
+            if parts[:1] == ["Net"]:
+                current = nets.setdefault(int(parts[1]), [])
+            elif parts[:1] == ["Node:"] and current is not None:
+                switch = int(parts[parts.index("Switch:") + 1])
+                pin = int(parts[parts.index("Net_pin_index:") + 1]) if "Net_pin_index:" in parts else -1
+                current.append((int(parts[1]), parts[2], switch, pin))
+    return nets
+
+
+# stablo iz ravne liste: cvor koji nije SINK i vec je vidjen je tacka grananja (ponavlja se pre svake nove
+# grane), ostali su novi cvorovi ciji je roditelj prethodna linija, a prekidac Switch sa prethodne linije
+def tree_from_flat(nodes):
+    node_ids, parent, switch, pins = [], [], [], []
+    seen = {}
+    prev, prev_switch = -1, -1
+    for node_id, node_type, line_switch, pin in nodes:
+        if node_type != "SINK" and node_id in seen:
+            prev = seen[node_id]
+        else:
+            node_ids.append(node_id)
+            parent.append(prev)
+            switch.append(prev_switch)
+            pins.append(pin)
+            prev = len(node_ids) - 1
+            if node_type != "SINK":
+                seen[node_id] = prev
+        prev_switch = line_switch
+    return node_ids, parent, switch, pins
+
+
+@pytest.mark.parametrize("name", ["iteration_001.route", "iteration_040.route", "b9.route"])
+def test_tree_matches_flat_list(name):
+    route_file = os.path.join(ROOT, "b9", name)
+    expected = flat_nets(route_file)
+    parser = RouteParser()
+    parser.parse(route_file)
+    nets = parser.get_route().nets
+
+    assert list(nets) == list(expected)
+    branching = 0
+    for net_number, net in nets.items():
+        flat = expected[net_number]
+        columns = (net.node_ids, net.parent, net.switch, net.net_pin_index)
+        assert tuple(list(column) for column in columns) == tree_from_flat(flat)
+        # path() vraca ravnu listu, a svaki cvor stabla osim SINK-a je u node_ids tacno jednom
+        assert net.path() == [node[0] for node in flat]
+        non_sinks = [node_id for node_id, node in zip(net.node_ids, flat) if node[1] != "SINK"]
+        assert len(set(non_sinks)) == len(non_sinks)
+        branching += len(flat) - len(net.node_ids)
+    # ruta ima grananja, pa je stablo zaista manje od ravne liste
+    assert branching > 0
+
+
+# PackedRoute cuva isto stablo, sa indeksima roditelja u okviru signala
+def test_packed_route_matches_nets():
+    parser = RouteParser()
+    parser.parse(os.path.join(ROOT, "b9", "b9.route"))
+    route = parser.get_route()
+    packed = PackedRoute.from_route(route)
+
+    assert packed.net_numbers.tolist() == list(route.nets)
+    for k, net in enumerate(route.nets.values()):
+        piece = packed.net_slice(k)
+        assert packed.net_names[k] == net.id
+        assert packed.node_ids[piece].tolist() == list(net.node_ids)
+        assert packed.parent[piece].tolist() == list(net.parent)
+        assert packed.switch[piece].tolist() == list(net.switch)
+        assert packed.net_pin_index[piece].tolist() == list(net.net_pin_index)
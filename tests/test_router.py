@@ -0,0 +1,127 @@
+# RRGSearch/RouterLookahead: A* sa lookahead mapom od svih SINK-ova mora da nadje iste duzine kao obicna
+# Dijkstra (mapa ne precenjuje). PathFinderRouter mora da da legalnu rutu koju RouteParser cita nazad
+# iz write_route bez izmena.
+#
+#   python -m pytest tests/test_router.py
+import math
+import os
+
+import numpy as np
+import pytest
+
+from fpga_project.models import PackedRoute
+from fpga_project.parser_route import RouteParser, parse_route_packed, route_header, write_route
+from fpga_project.router import (PathFinderRouter, RouterLookahead, RRGSearch, net_terminals, reverse_distances,
+                                 wire_costs)
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml")).arrays()
+
+
+# cena = broj zica (wire_costs) i slucajne pozitivne cene cvorova
+@pytest.fixture(scope="module", params=["wires", "random"])
+def node_cost(request, rrg):
+    if request.param == "wires":
+        return wire_costs(rrg)
+    return np.random.default_rng(7).uniform(0.1, 3.0, len(rrg.node_ids))
+
+
+# slucajni parovi (bilo koji cvor, SINK), pa ima i nedostiznih (math.inf)
+def random_pairs(rrg, count, seed):
+    rng = np.random.default_rng(seed)
+    sinks = rrg.node_ids[rrg.types == rrg.type_code("SINK")]
+    return list(zip(rng.choice(rrg.node_ids, count).tolist(), rng.choice(sinks, count).tolist()))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_lookahead_lengths_match_dijkstra(rrg, node_cost, seed):
+    pairs = random_pairs(rrg, 300, seed)
+    dijkstra = RRGSearch(rrg, node_cost=node_cost)
+    astar = RRGSearch(rrg, node_cost=node_cost, lookahead=RouterLookahead(rrg, node_cost))
+
+    expected = [dijkstra.shortest_path_length(src, sink) for src, sink in pairs]
+    found = [astar.shortest_path_length(src, sink) for src, sink in pairs]
+    assert found == pytest.approx(expected)
+    assert any(math.isinf(length) for length in expected)
+    assert any(math.isfinite(length) for length in expected)
+
+
+# procena iz mape nikad nije veca od stvarne cene do SINK-a (Dijkstra unazad), za svaki cvor grafa
+def test_lookahead_never_overestimates(rrg, node_cost):
+    lookahead = RouterLookahead(rrg, node_cost)
+    fanin_indptr, fanin_indices = rrg.fanin_indptr.tolist(), rrg.fanin_indices.tolist()
+    sinks = np.flatnonzero(rrg.types == rrg.type_code("SINK"))
+    for target in np.random.default_rng(3).choice(sinks, 25, replace=False).tolist():
+        dist = reverse_distances(fanin_indptr, fanin_indices, node_cost.tolist(), target)
+        for i, true_cost in enumerate(dist):
+            estimate = lookahead.expected_cost(i, target)
+            assert estimate <= true_cost + 1e-9
+
+
+@pytest.fixture(scope="module")
+def routed(rrg, tmp_path_factory):
+    terminals = net_terminals(parse_route_packed(os.path.join(ROOT, "b9", "b9.route")), rrg)
+    route = PathFinderRouter(rrg).route(terminals)
+    route_file = str(tmp_path_factory.mktemp("pathfinder") / "b9.route")
+    write_route(route, rrg, route_file, route_header(os.path.join(ROOT, "b9", "b9.route")))
+    return terminals, route, route_file
+
+
+# PathFinder na b9 zavrsava legalno: stabla idu po granama RRG-a, svaki signal stize do svojih SINK-ova,
+# a nijedan cvor nema vise signala nego sto mu je kapacitet
+def test_pathfinder_route_is_legal(rrg, routed):
+    terminals, route, _ = routed
+    packed = PackedRoute.from_route(route)
+    assert packed.net_numbers.tolist() == [net_number for net_number, _, _, _ in terminals]
+
+    edges = set(zip(rrg.edge_src.tolist(), rrg.edge_sink.tolist()))
+    parents = packed.global_parent()
+    has_parent = np.flatnonzero(packed.parent >= 0)
+    assert all((src, sink) in edges for src, sink in
+               zip(packed.node_ids[parents[has_parent]].tolist(), packed.node_ids[has_parent].tolist()))
+
+    for k, (_, _, source, sinks) in enumerate(terminals):
+        node_ids = packed.node_ids[packed.net_slice(k)].tolist()
+        assert node_ids[0] == source
+        assert sorted(sink for sink, _ in sinks) == sorted(set(node_ids) & {sink for sink, _ in sinks})
+
+    occupancy = np.bincount(rrg.index_of(packed.node_ids), minlength=len(rrg.node_ids))
+    assert (occupancy <= rrg.capacity).all()
+
+
+# grane stabla signala k kao (roditelj, cvor, switch, Net_pin_index), nezavisno od redosleda cvorova
+def tree_edges(packed, k):
+    part = packed.net_slice(k)
+    node_ids = packed.node_ids[part].tolist()
+    return sorted((node_ids[parent] if parent >= 0 else -1, node_id, switch, pin) for node_id, parent, switch, pin
+                  in zip(node_ids, packed.parent[part].tolist(), packed.switch[part].tolist(),
+                         packed.net_pin_index[part].tolist()))
+
+
+# write_route -> RouteParser vraca isto stablo (ulaz za ostale komande posle pathfinder-a). Router dodaje
+# cvorove redom kojim ih pretraga nadje, a .route ih zapisuje u dubinu, pa se prvi put porede grane stabla;
+# drugi krug (write_route procitane rute) mora da vrati iste nizove
+def test_write_route_round_trip(rrg, routed, tmp_path):
+    _, route, route_file = routed
+    expected = PackedRoute.from_route(route)
+    found = parse_route_packed(route_file)
+    assert found.net_numbers.tolist() == expected.net_numbers.tolist()
+    assert found.net_names == expected.net_names
+    assert np.array_equal(found.offsets, expected.offsets)
+    for k in range(len(expected.net_numbers)):
+        assert tree_edges(found, k) == tree_edges(expected, k)
+
+    parser = RouteParser()
+    parser.parse(route_file)
+    second_file = str(tmp_path / "b9.route")
+    write_route(parser.get_route(), rrg, second_file, route_header(route_file))
+    second = parse_route_packed(second_file)
+    for column in ("offsets", "node_ids", "parent", "switch", "net_pin_index"):
+        assert np.array_equal(getattr(second, column), getattr(found, column)), column
+    with open(route_file) as f, open(second_file) as g:
+        assert f.read() == g.read()
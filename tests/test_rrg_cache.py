@@ -0,0 +1,85 @@
+# RRGCache: RRG iz kesa je isti kao parsiran iz XML-a, a meta.json se menja samo atomski (os.replace).
+#
+#   python -m pytest tests/test_rrg_cache.py
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from fpga_project.parser_rrg import RRGParser
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture()
+def rrg_file(tmp_path):
+    path = tmp_path / "rrg.xml"
+    shutil.copy(os.path.join(ROOT, "b9", "rrg.xml"), path)
+    return str(path)
+
+
+def test_cached_rrg_matches_parsed(rrg_file):
+    parser = RRGParser()
+    parser.parse(rrg_file)
+    expected = parser.get_rrg()
+
+    cache = RRGCache()
+    cache.load_or_parse(rrg_file)
+    loaded = cache.load(rrg_file)
+    assert loaded is not None
+    for name in RRGCache.COLUMNS:
+        assert np.array_equal(getattr(loaded, name), getattr(expected, name)), name
+    assert loaded.type_names == expected.type_names
+    assert loaded.side_names == expected.side_names
+    assert loaded.grid == expected.grid
+    assert loaded.block_types == expected.block_types
+    assert {k: (s.name, s.tdel) for k, s in loaded.switches.items()} == \
+           {k: (s.name, s.tdel) for k, s in expected.switches.items()}
+    # samo konacni direktorijum kesa, bez privremenih
+    assert sorted(os.listdir(os.path.dirname(rrg_file))) == ["rrg.xml", "rrg.xml.cache"]
+
+
+# promenjen mtime, isti sadrzaj: kes vazi (SHA-256), a meta.json se osvezava bez ostataka privremenih fajlova
+def test_sha_fallback_rewrites_meta(rrg_file):
+    cache = RRGCache()
+    cache.load_or_parse(rrg_file)
+    stat = os.stat(rrg_file)
+    os.utime(rrg_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert cache.load(rrg_file) is not None
+    cache_dir = cache.cache_path(rrg_file)
+    with open(os.path.join(cache_dir, "meta.json"), encoding="utf-8") as f:
+        assert json.load(f)["mtime_ns"] == os.stat(rrg_file).st_mtime_ns
+    assert not [name for name in os.listdir(cache_dir) if name.endswith(".tmp")]
+
+
+# pad usred upisa meta.json: stari fajl ostaje ceo, a privremeni se brise
+def test_failed_meta_write_keeps_old_file(rrg_file, monkeypatch):
+    cache = RRGCache()
+    cache.load_or_parse(rrg_file)
+    cache_dir = cache.cache_path(rrg_file)
+    meta_file = os.path.join(cache_dir, "meta.json")
+    with open(meta_file, encoding="utf-8") as f:
+        before = f.read()
+
+    def broken_dump(meta, f):
+        f.write('{"version": ')
+        raise OSError("disk je pun")
+
+    monkeypatch.setattr(json, "dump", broken_dump)
+    with pytest.raises(OSError):
+        RRGCache.write_meta(cache_dir, {"version": 0})
+    with open(meta_file, encoding="utf-8") as f:
+        assert f.read() == before
+    assert not [name for name in os.listdir(cache_dir) if name.endswith(".tmp")]
+
+
+def test_save_replaces_existing_cache(rrg_file):
+    cache = RRGCache()
+    rrg = cache.load_or_parse(rrg_file)
+    cache.save(rrg_file, rrg)
+    assert cache.load(rrg_file) is not None
+    assert sorted(os.listdir(os.path.dirname(rrg_file))) == ["rrg.xml", "rrg.xml.cache"]
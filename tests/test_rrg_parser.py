@@ -0,0 +1,50 @@
+# RRGParser: iterparse i ET.parse, kao i kompaktni (ArrayRRG) i objektni (RRG) graf, moraju da daju isti graf
+# i iste odgovore.
+#
+#   python -m pytest tests/test_rrg_parser.py
+import os
+
+import pytest
+
+from fpga_project.parser_rrg import RRGParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RRG_FILE = os.path.join(ROOT, "b9", "rrg.xml")
+
+
+@pytest.fixture(scope="module")
+def parsers():
+    compact, objects = RRGParser(), RRGParser(compact=False)
+    compact.parse(RRG_FILE)
+    objects.parse(RRG_FILE)
+    return compact, objects
+
+
+# vektorizovani indeks strana zica (ArrayRRG) i petlja po Edge objektima, ukljucujuci redosled recnika
+def test_wire_sides_match_object_graph(parsers):
+    compact, objects = parsers
+    expected = objects.get_all_wire_sides()
+    found = compact.get_all_wire_sides()
+    assert list(found.items()) == list(expected.items())
+    assert len(found) > 100
+    for wire_id in list(objects.rrg.nodes)[:500]:
+        assert compact.get_wire_side(wire_id) == objects.get_wire_side(wire_id)
+
+
+def rrg_summary(rrg):
+    nodes = [(node.id, node.type, node.ptc, node.xlow, node.xhigh, node.ylow, node.yhigh, node.side, node.capacity)
+             for node in rrg.nodes.values()]
+    edges = [(edge.src, edge.sink, edge.switch) for edge in rrg.edges]
+    switches = [(s.id, s.name, s.type, s.tdel) for s in rrg.switches.values()]
+    return nodes, edges, switches, rrg.chan_width_max, rrg.block_types, rrg.grid
+
+
+# iterparse (podrazumevano) i ET.parse ceo DOM daju isti graf, za oba modela grafa
+@pytest.mark.parametrize("compact", [True, False])
+def test_streaming_parse_matches_tree_parse(compact):
+    streaming, tree = RRGParser(compact=compact), RRGParser(compact=compact)
+    streaming.parse(RRG_FILE)
+    tree.parse(RRG_FILE, streaming=False)
+    expected = rrg_summary(tree.get_rrg())
+    assert rrg_summary(streaming.get_rrg()) == expected
+    assert len(expected[0]) > 1000 and len(expected[1]) > 1000
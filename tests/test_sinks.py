@@ -0,0 +1,57 @@
+# SINK-ovi rute bez Net_pin_index anotacije (starije verzije VPR-a) se prepoznaju po tipu cvora u RRG-u,
+# pa net_terminals, TimingReport i detour_table daju iste SINK cvorove kao za anotiranu b9 rutu.
+#
+#   python -m pytest tests/test_sinks.py
+import os
+import re
+
+import numpy as np
+import pytest
+
+from fpga_project.detour import detour_table
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.router import net_terminals
+from fpga_project.rrg_cache import RRGCache
+from fpga_project.timing import TimingReport
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+
+
+@pytest.fixture(scope="module")
+def routes(tmp_path_factory):
+    route_file = os.path.join(ROOT, "b9", "b9.route")
+    with open(route_file) as f:
+        text = re.sub(r" Net_pin_index: -?\d+", "", f.read())
+    plain_file = tmp_path_factory.mktemp("route") / "b9.route"
+    plain_file.write_text(text)
+    return parse_route_packed(route_file), parse_route_packed(str(plain_file))
+
+
+def test_plain_route_has_no_pin_index(routes):
+    _, plain = routes
+    assert (plain.net_pin_index < 0).all()
+
+
+def test_net_terminals_without_pin_index(rrg, routes):
+    annotated, plain = routes
+    expected = [(net, name, source, [sink for sink, _ in sinks])
+                for net, name, source, sinks in net_terminals(annotated, rrg)]
+    found = [(net, name, source, [sink for sink, _ in sinks]) for net, name, source, sinks in net_terminals(plain, rrg)]
+    assert found == expected
+    assert all(sinks for _, _, _, sinks in expected)
+
+
+def test_timing_and_detour_without_pin_index(rrg, routes):
+    annotated, plain = routes
+    expected, found = TimingReport(rrg, annotated), TimingReport(rrg, plain)
+    assert np.array_equal(found.sink_ids, expected.sink_ids)
+    assert np.array_equal(found.delay, expected.delay)
+
+    expected, found = detour_table(rrg, annotated, workers=1), detour_table(rrg, plain, workers=1)
+    assert np.array_equal(found.sink_ids, expected.sink_ids)
+    assert np.array_equal(found.routed_hops, expected.routed_hops)
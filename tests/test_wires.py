@@ -0,0 +1,40 @@
+# visualize_wire_congestion: svi markeri su jedan scatter, a broj signala se ispisuje samo uz koriscene zice.
+#
+#   python -m pytest tests/test_wires.py
+import os
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from fpga_project.fpga_wires import FPGAWires
+from fpga_project.parser_route import parse_route_packed
+from fpga_project.rrg_cache import RRGCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def rrg():
+    return RRGCache().load_or_parse(os.path.join(ROOT, "b9", "rrg.xml"))
+
+
+def test_congestion_is_one_scatter_with_used_labels(rrg):
+    wires = FPGAWires()
+    wires.visualize_matrix(rrg)
+    texts_before = len(wires.ax.texts)
+    collections_before = len(wires.ax.collections)
+
+    occupancy = wires.visualize_wire_congestion(rrg, parse_route_packed(os.path.join(ROOT, "b9", "b9.route")), 0)
+    layout = wires.wire_label_layout(rrg, occupancy.wires())
+    loads = occupancy.occupancy[[item[0] for item in layout]]
+
+    assert len(wires.ax.collections) == collections_before + 1
+    markers = wires.ax.collections[-1]
+    assert np.array_equal(markers.get_offsets(), [(item[1], item[2]) for item in layout])
+    labels = [text.get_text() for text in wires.ax.texts[texts_before:]]
+    assert labels == [str(load) for load in loads.tolist() if load > 0]
+    assert occupancy.nets_indptr is None
+    plt.close("all")